@@ -4,16 +4,27 @@
 from __future__ import annotations
 
 import datetime as dt
+import functools
+import hashlib
+import importlib
+import math
 import os
+import re
 import subprocess
+import sys
 import threading
+import time
 import uuid
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, Response
 from pydantic import BaseModel, Field
 
+from .catalog import RunCatalog
+
 app = FastAPI(title="fourier-cycles-api", version="0.1.0")
 
 OUTPUT_DIR = Path(os.getenv("FOURIER_OUTPUT_DIR", "/data/output"))
@@ -21,6 +32,12 @@ LOG_DIR = OUTPUT_DIR / "_trigger_logs"
 MAX_RUNTIME_SECONDS = int(os.getenv("FOURIER_TRIGGER_MAX_RUNTIME_SECONDS", "5400"))
 PIPELINE_PATH = os.getenv("FOURIER_TRIGGER_PIPELINE_PATH", "/app/src/fourier_cycles_pipeline.py")
 PYTHON_BIN = os.getenv("FOURIER_TRIGGER_PYTHON", "python")
+_PATH_PART_RE = re.compile(r"^[A-Za-z0-9_][A-Za-z0-9_.-]*$")
+CATALOG_DB = Path(os.getenv("FOURIER_CATALOG_DB", "").strip() or OUTPUT_DIR / "_catalog" / "catalog.sqlite3")
+# Runs written by the scheduled pipeline container (not triggered here) are picked up by this periodic rescan.
+CATALOG_RESCAN_SECONDS = float(os.getenv("FOURIER_CATALOG_RESCAN_SECONDS", "30"))
+_catalog_lock = threading.Lock()
+_catalog_synced_at: float | None = None
 
 _state_lock = threading.Lock()
 _run_state: dict[str, Any] = {
@@ -87,6 +104,45 @@ def _resolve_latest_output() -> str | None:
         return str(latest_link)
 
 
+@functools.lru_cache(maxsize=1)
+def _pipeline_module() -> Any:
+    # Charts are rendered by the pipeline's own plot code, so on-demand PNGs match eager runs byte for byte.
+    pipeline_path = Path(PIPELINE_PATH)
+    sys.path.insert(0, str(pipeline_path.parent))
+    return importlib.import_module(pipeline_path.stem)
+
+
+@functools.lru_cache(maxsize=1)
+def _catalog() -> RunCatalog:
+    return RunCatalog(
+        db_path=CATALOG_DB,
+        output_dir=OUTPUT_DIR,
+        load_table=lambda series_dir, table: _pipeline_module().load_artifact_columns(series_dir, table),
+    )
+
+
+def _sync_catalog(*, force: bool = False) -> RunCatalog:
+    global _catalog_synced_at
+    catalog = _catalog()
+    with _catalog_lock:
+        now = time.monotonic()
+        if force or _catalog_synced_at is None or now - _catalog_synced_at >= CATALOG_RESCAN_SECONDS:
+            catalog.sync()
+            _catalog_synced_at = now
+    return catalog
+
+
+def _catalog_response(request: Request, build: Callable[[RunCatalog], Any]) -> Response:
+    """JSON with an ETag derived from the catalog version and the query; matching If-None-Match -> 304."""
+    catalog = _sync_catalog()
+    key = f"{catalog.updated_at()}|{request.url.path}?{request.url.query}"
+    etag = '"' + hashlib.sha256(key.encode()).hexdigest()[:24] + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in (request.headers.get("if-none-match") or ""):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(build(catalog), headers=headers)
+
+
 def _execute_pipeline(run_id: str, log_path: Path) -> None:
     _update_state(state="running")
 
@@ -119,6 +175,13 @@ def _execute_pipeline(run_id: str, log_path: Path) -> None:
                 log_file.write(f"\n[{dt.datetime.now(dt.timezone.utc).isoformat()}] timed out after {MAX_RUNTIME_SECONDS}s\n")
                 log_file.flush()
 
+            # index the new run before the status flips, so the UI's next catalog request already sees it
+            try:
+                _sync_catalog(force=True)
+            except Exception as exc:  # noqa: BLE001
+                log_file.write(f"\n[{dt.datetime.now(dt.timezone.utc).isoformat()}] catalog sync failed: {exc}\n")
+                log_file.flush()
+
             if timed_out:
                 _update_state(
                     state="failed",
@@ -197,3 +260,138 @@ def trigger_run(request: TriggerRequest) -> RunStatus:
     worker = threading.Thread(target=_execute_pipeline, args=(run_id, log_path), daemon=True)
     worker.start()
     return _snapshot_status()
+
+
+@app.get("/api/charts/{run}/{series}/{chart}.png")
+def chart_png(run: str, series: str, chart: str) -> FileResponse:
+    """Serve a series chart; with FOURIER_RENDER_MODE=on-demand it is rendered (and cached) on first request."""
+    if not _PATH_PART_RE.match(run) or not _PATH_PART_RE.match(series):
+        raise HTTPException(status_code=404, detail="unknown run or series")
+    pipeline = _pipeline_module()
+    if chart not in pipeline.CHART_FILES:
+        raise HTTPException(status_code=404, detail=f"unknown chart '{chart}'")
+    series_dir = OUTPUT_DIR / run / series
+    if not series_dir.is_dir():
+        raise HTTPException(status_code=404, detail="unknown run or series")
+    try:
+        path = pipeline.render_chart(series_dir, chart, OUTPUT_DIR / pipeline.RENDER_CACHE_DIRNAME)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return FileResponse(path, media_type="image/png")
+
+
+def _json_column(values: Any) -> list[Any]:
+    if values.dtype.kind == "M":
+        return [str(value) for value in values.astype("datetime64[D]")]
+    if values.dtype.kind == "f":
+        return [value if math.isfinite(value) else None for value in values.tolist()]
+    return values.tolist()
+
+
+@app.get("/api/artifacts/{run}/{series}/{table}")
+def artifact_columns(
+    run: str,
+    series: str,
+    table: str,
+    columns: str | None = Query(default=None, description="Comma list of columns (default: all)"),
+    start: int = Query(default=0, ge=0),
+    limit: int | None = Query(default=None, ge=1),
+) -> dict[str, Any]:
+    """Column slice of a series table (npz preferred, parquet/csv fallback) as {column: [values]}."""
+    if not all(_PATH_PART_RE.match(part) for part in (run, series, table)):
+        raise HTTPException(status_code=404, detail="unknown run, series or table")
+    series_dir = OUTPUT_DIR / run / series
+    if not series_dir.is_dir():
+        raise HTTPException(status_code=404, detail="unknown run or series")
+    wanted = [column.strip() for column in columns.split(",") if column.strip()] if columns else None
+    stop = start + limit if limit is not None else None
+    try:
+        data = _pipeline_module().load_artifact_columns(series_dir, table, wanted, start, stop)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"table": table, "start": start, "columns": {name: _json_column(values) for name, values in data.items()}}
+
+
+@app.get("/api/catalog")
+def catalog_overview(request: Request, runs: int = Query(default=20, ge=1, le=500)) -> Response:
+    """Everything the UI needs on load: recent runs plus the latest run's series and selected cycles."""
+
+    def build(catalog: RunCatalog) -> dict[str, Any]:
+        latest_run = catalog.resolve_run("latest")
+        latest: dict[str, Any] | None = None
+        if latest_run is not None:
+            series = catalog.series(run_id=latest_run, source=None)
+            selected = catalog.cycles(run_id=latest_run, selected=True, order_by="series_key", limit=10_000)["items"]
+            for item in series:
+                item["selected_cycles"] = [c for c in selected if c["series_key"] == item["series_key"]]
+            latest = {"run_id": latest_run, "series": series}
+        return {"updated_at_utc": catalog.updated_at(), "runs": catalog.runs(limit=runs, offset=0), "latest": latest}
+
+    return _catalog_response(request, build)
+
+
+@app.get("/api/catalog/runs")
+def catalog_runs(
+    request: Request,
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+) -> Response:
+    return _catalog_response(request, lambda catalog: catalog.runs(limit=limit, offset=offset))
+
+
+@app.get("/api/catalog/runs/{run_id}/series")
+def catalog_series(request: Request, run_id: str, source: str | None = None) -> Response:
+    def build(catalog: RunCatalog) -> dict[str, Any]:
+        resolved = catalog.resolve_run(run_id)
+        if resolved is None:
+            raise HTTPException(status_code=404, detail="no runs indexed" if run_id == "latest" else "unknown run")
+        return {"run_id": resolved, "items": catalog.series(run_id=resolved, source=source)}
+
+    return _catalog_response(request, build)
+
+
+@app.get("/api/catalog/cycles")
+def catalog_cycles(
+    request: Request,
+    run_id: str | None = Query(default=None, description="Run id or 'latest' (default: all runs)"),
+    source: str | None = None,
+    series: str | None = None,
+    stable: bool | None = None,
+    selected: bool | None = None,
+    min_period: float | None = Query(default=None, ge=0),
+    max_period: float | None = Query(default=None, ge=0),
+    min_presence: float | None = None,
+    max_p_value: float | None = None,
+    order_by: str = "period_days",
+    desc: bool = False,
+    limit: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+) -> Response:
+    """Filterable, paginated cycles across runs, e.g. `?stable=true&min_period=30&max_period=90`."""
+
+    def build(catalog: RunCatalog) -> dict[str, Any]:
+        resolved = catalog.resolve_run(run_id) if run_id else None
+        if run_id and resolved is None:
+            return {"total": 0, "limit": limit, "offset": offset, "items": []}
+        try:
+            return catalog.cycles(
+                run_id=resolved,
+                source=source,
+                series=series,
+                stable=stable,
+                selected=selected,
+                min_period=min_period,
+                max_period=max_period,
+                min_presence=min_presence,
+                max_p_value=max_p_value,
+                order_by=order_by,
+                descending=desc,
+                limit=limit,
+                offset=offset,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return _catalog_response(request, build)
@@ -0,0 +1,340 @@
+"""SQLite catalog of fourier-cycles runs, series and cycles for the web app.
+
+Built incrementally from the run directories (`run_*/summary.json` plus each series' cycles table): only runs
+that are new or whose summary changed are (re)indexed, runs deleted from disk are dropped.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import sqlite3
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# (series_dir, table) -> {column: values}; the pipeline's load_artifact_columns (npz/parquet/csv).
+TableLoader = Callable[[Path, str], dict[str, Any]]
+
+_SCHEMA_SQL = """
+PRAGMA journal_mode=WAL;
+
+CREATE TABLE IF NOT EXISTS meta (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS runs (
+  run_id TEXT PRIMARY KEY,
+  generated_at_utc TEXT,
+  start_date TEXT,
+  end_date TEXT,
+  success_count INTEGER NOT NULL,
+  failure_count INTEGER NOT NULL,
+  failures_json TEXT NOT NULL,
+  summary_mtime REAL NOT NULL,
+  indexed_at_utc TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS series (
+  run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+  series_key TEXT NOT NULL,
+  source TEXT NOT NULL,
+  series TEXT NOT NULL,
+  transform TEXT,
+  step_days REAL,
+  points INTEGER,
+  signal_points INTEGER,
+  stable_cycle_count INTEGER,
+  selected_cycle_count INTEGER,
+  PRIMARY KEY (run_id, series_key)
+);
+
+CREATE TABLE IF NOT EXISTS cycles (
+  run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+  series_key TEXT NOT NULL,
+  period_days REAL NOT NULL,
+  freq_per_day REAL,
+  norm_power REAL,
+  amp_median REAL,
+  snr_median REAL,
+  presence_ratio REAL,
+  phase_locking_r REAL,
+  p_value_bandmax REAL,
+  rank_score_norm REAL,
+  stability_score_norm REAL,
+  stable INTEGER NOT NULL,
+  selected INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_cycles_run_series ON cycles(run_id, series_key);
+CREATE INDEX IF NOT EXISTS idx_cycles_period ON cycles(period_days);
+"""
+
+CYCLE_FIELDS = (
+    "period_days",
+    "freq_per_day",
+    "norm_power",
+    "amp_median",
+    "snr_median",
+    "presence_ratio",
+    "phase_locking_r",
+    "p_value_bandmax",
+    "rank_score_norm",
+    "stability_score_norm",
+)
+CYCLE_ORDER_FIELDS = frozenset(CYCLE_FIELDS) | {"run_id", "series_key"}
+SERIES_FIELDS = (
+    "series_key",
+    "source",
+    "series",
+    "transform",
+    "step_days",
+    "points",
+    "signal_points",
+    "stable_cycle_count",
+    "selected_cycle_count",
+)
+
+
+def _now_utc_iso() -> str:
+    return dt.datetime.now(dt.timezone.utc).isoformat()
+
+
+def _float_or_none(value: Any) -> float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number == number and abs(number) != float("inf") else None
+
+
+class RunCatalog:
+    def __init__(self, *, db_path: Path, output_dir: Path, load_table: TableLoader) -> None:
+        self.db_path = Path(db_path)
+        self.output_dir = Path(output_dir)
+        self._load_table = load_table
+        self._sync_lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA_SQL)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    # --- indexing ---------------------------------------------------------------------------------------
+
+    def sync(self) -> int:
+        """Index new/changed runs and drop deleted ones; returns the number of runs touched."""
+        with self._sync_lock:
+            on_disk: dict[str, float] = {}
+            if self.output_dir.is_dir():
+                for run_dir in self.output_dir.iterdir():
+                    summary_path = run_dir / "summary.json"
+                    if run_dir.name.startswith("run_") and not run_dir.is_symlink() and summary_path.is_file():
+                        on_disk[run_dir.name] = summary_path.stat().st_mtime
+            conn = self._connect()
+            try:
+                known = {str(r["run_id"]): float(r["summary_mtime"]) for r in conn.execute("SELECT run_id, summary_mtime FROM runs")}
+                changed = sorted(run_id for run_id, mtime in on_disk.items() if known.get(run_id) != mtime)
+                removed = sorted(set(known) - set(on_disk))
+                for run_id in changed:
+                    self._index_run(conn, run_id, on_disk[run_id])
+                for run_id in removed:
+                    with conn:
+                        conn.execute("DELETE FROM cycles WHERE run_id = ?", (run_id,))
+                        conn.execute("DELETE FROM series WHERE run_id = ?", (run_id,))
+                        conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+                if changed or removed:
+                    with conn:
+                        conn.execute(
+                            "INSERT INTO meta(key, value) VALUES ('updated_at_utc', ?) "
+                            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                            (_now_utc_iso(),),
+                        )
+            finally:
+                conn.close()
+            return len(changed) + len(removed)
+
+    def _index_run(self, conn: sqlite3.Connection, run_id: str, summary_mtime: float) -> None:
+        run_dir = self.output_dir / run_id
+        try:
+            summary = json.loads((run_dir / "summary.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return  # partially written; picked up by the next sync once its mtime changes
+        series_rows: list[tuple[Any, ...]] = []
+        cycle_rows: list[tuple[Any, ...]] = []
+        for item in summary.get("successes") or []:
+            series_key = f"{item['source']}-{_series_slug(str(item['series']))}"
+            series_rows.append(
+                (
+                    run_id,
+                    series_key,
+                    item["source"],
+                    item["series"],
+                    item.get("transform"),
+                    _float_or_none(item.get("step_days")),
+                    item.get("points"),
+                    item.get("signal_points"),
+                    item.get("stable_cycle_count"),
+                    item.get("selected_cycle_count"),
+                )
+            )
+            selected_periods = {round(float(c["period_days"]), 9) for c in item.get("selected_cycles") or []}
+            try:
+                table = self._load_table(run_dir / series_key, "cycles")
+            except (OSError, ValueError):
+                table = {}
+            rows = len(table.get("period_days", []))
+            for idx in range(rows):
+                values = [_float_or_none(table[field][idx]) if field in table else None for field in CYCLE_FIELDS]
+                stable = bool(table["stable"][idx]) if "stable" in table else True
+                selected = round(float(table["period_days"][idx]), 9) in selected_periods
+                cycle_rows.append((run_id, series_key, *values, int(stable), int(selected)))
+        marks = ",".join("?" for _ in CYCLE_FIELDS)
+        with conn:
+            conn.execute("DELETE FROM cycles WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM series WHERE run_id = ?", (run_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO runs(run_id, generated_at_utc, start_date, end_date, success_count, failure_count, "
+                "failures_json, summary_mtime, indexed_at_utc) VALUES (?,?,?,?,?,?,?,?,?)",
+                (
+                    run_id,
+                    summary.get("generated_at_utc"),
+                    summary.get("start_date"),
+                    summary.get("end_date"),
+                    int(summary.get("success_count") or 0),
+                    int(summary.get("failure_count") or 0),
+                    json.dumps(summary.get("failures") or []),
+                    summary_mtime,
+                    _now_utc_iso(),
+                ),
+            )
+            conn.executemany(f"INSERT INTO series({','.join(('run_id', *SERIES_FIELDS))}) VALUES (?,?,?,?,?,?,?,?,?,?)", series_rows)
+            conn.executemany(
+                f"INSERT INTO cycles(run_id, series_key, {','.join(CYCLE_FIELDS)}, stable, selected) VALUES (?,?,{marks},?,?)",
+                cycle_rows,
+            )
+
+    # --- queries ----------------------------------------------------------------------------------------
+
+    def updated_at(self) -> str:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'updated_at_utc'").fetchone()
+        finally:
+            conn.close()
+        return str(row["value"]) if row else ""
+
+    def resolve_run(self, run_id: str) -> str | None:
+        """`latest` -> newest run with at least one successful series; other ids must be indexed."""
+        conn = self._connect()
+        try:
+            if run_id != "latest":
+                row = conn.execute("SELECT run_id FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            else:
+                row = conn.execute("SELECT run_id FROM runs WHERE success_count > 0 ORDER BY run_id DESC LIMIT 1").fetchone()
+        finally:
+            conn.close()
+        return str(row["run_id"]) if row else None
+
+    def runs(self, *, limit: int, offset: int) -> dict[str, Any]:
+        conn = self._connect()
+        try:
+            total = int(conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0])
+            rows = conn.execute(
+                "SELECT run_id, generated_at_utc, start_date, end_date, success_count, failure_count, failures_json "
+                "FROM runs ORDER BY run_id DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        finally:
+            conn.close()
+        items = []
+        for r in rows:
+            item = {key: r[key] for key in r.keys() if key != "failures_json"}
+            item["failures"] = json.loads(r["failures_json"])
+            items.append(item)
+        return {"total": total, "limit": limit, "offset": offset, "items": items}
+
+    def series(self, *, run_id: str, source: str | None) -> list[dict[str, Any]]:
+        sql = f"SELECT {','.join(SERIES_FIELDS)} FROM series WHERE run_id = ?"
+        params: list[Any] = [run_id]
+        if source:
+            sql += " AND source = ?"
+            params.append(source)
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql + " ORDER BY series_key", params).fetchall()
+        finally:
+            conn.close()
+        return [dict(r) for r in rows]
+
+    def cycles(
+        self,
+        *,
+        run_id: str | None = None,
+        source: str | None = None,
+        series: str | None = None,
+        stable: bool | None = None,
+        selected: bool | None = None,
+        min_period: float | None = None,
+        max_period: float | None = None,
+        min_presence: float | None = None,
+        max_p_value: float | None = None,
+        order_by: str = "period_days",
+        descending: bool = False,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> dict[str, Any]:
+        if order_by not in CYCLE_ORDER_FIELDS:
+            raise ValueError(f"order_by must be one of {sorted(CYCLE_ORDER_FIELDS)}")
+        where: list[str] = []
+        params: list[Any] = []
+        for clause, value in (
+            ("c.run_id = ?", run_id),
+            ("s.source = ?", source),
+            ("s.series = ?", series),
+            ("c.stable = ?", None if stable is None else int(stable)),
+            ("c.selected = ?", None if selected is None else int(selected)),
+            ("c.period_days >= ?", min_period),
+            ("c.period_days <= ?", max_period),
+            ("c.presence_ratio >= ?", min_presence),
+            ("c.p_value_bandmax <= ?", max_p_value),
+        ):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        base = "FROM cycles c JOIN series s ON s.run_id = c.run_id AND s.series_key = c.series_key"
+        if where:
+            base += " WHERE " + " AND ".join(where)
+        direction = "DESC" if descending else "ASC"
+        conn = self._connect()
+        try:
+            total = int(conn.execute(f"SELECT COUNT(*) {base}", params).fetchone()[0])
+            rows = conn.execute(
+                f"SELECT c.run_id, c.series_key, s.source, s.series, {','.join('c.' + f for f in CYCLE_FIELDS)}, "
+                f"c.stable, c.selected {base} ORDER BY c.{order_by} {direction}, c.run_id DESC, c.series_key, c.period_days "
+                "LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        finally:
+            conn.close()
+        items = []
+        for r in rows:
+            item = dict(r)
+            item["stable"] = bool(item["stable"])
+            item["selected"] = bool(item["selected"])
+            items.append(item)
+        return {"total": total, "limit": limit, "offset": offset, "items": items}
+
+
+def _series_slug(value: str) -> str:
+    # Same as the pipeline's _slug (series directory names).
+    return "".join(ch.lower() if ch.isalnum() else "-" for ch in value).strip("-") or "series"
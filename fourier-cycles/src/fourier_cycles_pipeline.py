@@ -6,11 +6,19 @@ from __future__ import annotations
 import argparse
 import csv
 import datetime as dt
+import functools
+import hashlib
+import importlib.util
 import json
 import math
+import multiprocessing
 import os
 import shutil
 import sys
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
@@ -19,6 +27,9 @@ import matplotlib
 import numpy as np
 import pandas as pd
 import requests
+from numpy.lib.stride_tricks import sliding_window_view
+
+from market_data_store import MarketDataStore
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt  # noqa: E402
@@ -63,11 +74,21 @@ class AnalysisConfig:
     rank_weight_presence: float
     rank_weight_phase: float
     export_windows_csv: bool
+    artifact_formats: list[str]
     enable_wavelet_view: bool
     wavelet_period_count: int
+    wavelet_dtype: str
+    wavelet_max_points: int
+    render_mode: str
     projection_days: int
     min_points: int
     timeout_seconds: int
+    workers: int
+    incremental: bool
+    market_data_db: Path | None
+    market_data_offline: bool
+    market_data_refresh_days: int
+    market_data_full_refresh: bool
     end_date: dt.date
 
 
@@ -126,7 +147,7 @@ def parse_iso_date(value: str) -> dt.date:
         raise argparse.ArgumentTypeError(f"invalid date '{value}', expected YYYY-MM-DD") from exc
 
 
-def parse_args() -> AnalysisConfig:
+def parse_args(argv: list[str] | None = None) -> AnalysisConfig:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--output-dir", default=_env_str("FOURIER_OUTPUT_DIR", "/data/output"))
     parser.add_argument("--timeframe-days", type=int, default=_env_int("FOURIER_TIMEFRAME_DAYS", 1095))
@@ -286,6 +307,11 @@ def parse_args() -> AnalysisConfig:
         default=1 if _env_bool("FOURIER_EXPORT_WINDOWS_CSV", False) else 0,
         help="1=write optional windows.csv with per-window cycle metrics, 0=disable",
     )
+    parser.add_argument(
+        "--artifact-formats",
+        default=_env_str("FOURIER_ARTIFACT_FORMATS", "csv"),
+        help="Comma list of table formats: csv (UI compatibility), npz (columnar NumPy), parquet (needs pyarrow)",
+    )
     parser.add_argument(
         "--enable-wavelet-view",
         type=int,
@@ -298,6 +324,24 @@ def parse_args() -> AnalysisConfig:
         default=_env_int("FOURIER_WAVELET_PERIOD_COUNT", 48),
         help="Number of logarithmic periods used for optional wavelet view.",
     )
+    parser.add_argument(
+        "--wavelet-dtype",
+        choices=("float64", "float32"),
+        default=_env_str("FOURIER_WAVELET_DTYPE", "float64"),
+        help="Floating point precision of the wavelet transform (float32 halves memory).",
+    )
+    parser.add_argument(
+        "--wavelet-max-points",
+        type=int,
+        default=_env_int("FOURIER_WAVELET_MAX_POINTS", 2000),
+        help="Max time columns drawn in wavelet.png (block-averaged above this, 0=all).",
+    )
+    parser.add_argument(
+        "--render-mode",
+        choices=RENDER_MODES,
+        default=_env_str("FOURIER_RENDER_MODE", "eager"),
+        help="eager=render all PNGs, on-demand=store chart inputs (charts.npz) for the API to render on first request, none=no charts",
+    )
     parser.add_argument(
         "--projection-days",
         type=int,
@@ -306,8 +350,49 @@ def parse_args() -> AnalysisConfig:
     )
     parser.add_argument("--min-points", type=int, default=_env_int("FOURIER_MIN_POINTS", 180))
     parser.add_argument("--timeout-seconds", type=int, default=_env_int("FOURIER_TIMEOUT_SECONDS", 30))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=_env_int("FOURIER_WORKERS", 0),
+        help="Processes for per-series analysis/rendering (0=CPU count, 1=sequential in-process).",
+    )
+    parser.add_argument(
+        "--incremental",
+        type=int,
+        default=1 if _env_bool("FOURIER_INCREMENTAL", False) else 0,
+        help="1=reuse cached window metrics/surrogate distributions per series when signal and stage config are unchanged",
+    )
+    parser.add_argument(
+        "--market-data-cache",
+        type=int,
+        default=1 if _env_bool("FOURIER_MARKET_DATA_CACHE", True) else 0,
+        help="1=keep fetched observations in a local SQLite store and only fetch missing ranges, 0=always full fetch",
+    )
+    parser.add_argument(
+        "--market-data-db",
+        default=_env_str("FOURIER_MARKET_DATA_DB", ""),
+        help="SQLite store path (default: <output-dir>/_market_data/market_data.sqlite3)",
+    )
+    parser.add_argument(
+        "--market-data-offline",
+        type=int,
+        default=1 if _env_bool("FOURIER_MARKET_DATA_OFFLINE", False) else 0,
+        help="1=never fetch, analyse stored observations only (tests/replay), 0=fetch missing ranges",
+    )
+    parser.add_argument(
+        "--market-data-refresh-days",
+        type=int,
+        default=_env_int("FOURIER_MARKET_DATA_REFRESH_DAYS", 7),
+        help="Newest stored days that are re-fetched on every run (late/revised bars).",
+    )
+    parser.add_argument(
+        "--market-data-full-refresh",
+        type=int,
+        default=1 if _env_bool("FOURIER_MARKET_DATA_FULL_REFRESH", False) else 0,
+        help="1=re-fetch the full range and replace the stored history (e.g. after a split/revision), 0=missing ranges only",
+    )
     parser.add_argument("--end-date", type=parse_iso_date, default=dt.date.today())
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     min_period_days = max(1.0, args.min_period_days)
     max_period_days = max(min_period_days, args.max_period_days)
@@ -322,6 +407,15 @@ def parse_args() -> AnalysisConfig:
         rolling_windows_days = [360, 720, 1260]
     signal_mode_yahoo = (args.signal_mode_yahoo or "log_returns").strip().lower()
     signal_mode_fred = (args.signal_mode_fred or "pct_change").strip().lower()
+    artifact_formats = [value.lower() for value in _split_csv(args.artifact_formats)] or ["csv"]
+    unknown_formats = sorted(set(artifact_formats) - set(ARTIFACT_FORMATS))
+    if unknown_formats:
+        parser.error(f"--artifact-formats: unknown format(s) {unknown_formats}, expected {list(ARTIFACT_FORMATS)}")
+    if "parquet" in artifact_formats and importlib.util.find_spec("pyarrow") is None:
+        parser.error("--artifact-formats parquet requires pyarrow (pip install pyarrow)")
+    market_data_db: Path | None = None
+    if args.market_data_cache or args.market_data_offline:
+        market_data_db = Path(args.market_data_db or Path(args.output_dir) / "_market_data" / "market_data.sqlite3")
 
     return AnalysisConfig(
         output_dir=Path(args.output_dir),
@@ -367,20 +461,35 @@ def parse_args() -> AnalysisConfig:
         rank_weight_presence=max(0.0, args.rank_weight_presence),
         rank_weight_phase=max(0.0, args.rank_weight_phase),
         export_windows_csv=bool(args.export_windows_csv),
+        artifact_formats=artifact_formats,
         enable_wavelet_view=bool(args.enable_wavelet_view),
         wavelet_period_count=max(8, int(args.wavelet_period_count)),
+        wavelet_dtype=args.wavelet_dtype,
+        wavelet_max_points=max(0, int(args.wavelet_max_points)),
+        render_mode=args.render_mode,
         projection_days=max(0, int(args.projection_days)),
         min_points=max(32, args.min_points),
         timeout_seconds=max(5, args.timeout_seconds),
+        workers=args.workers if args.workers > 0 else (os.cpu_count() or 1),
+        incremental=bool(args.incremental),
+        market_data_db=market_data_db,
+        market_data_offline=bool(args.market_data_offline),
+        market_data_refresh_days=max(0, args.market_data_refresh_days),
+        market_data_full_refresh=bool(args.market_data_full_refresh),
         end_date=args.end_date,
     )
 
 
+def _empty_series(name: str) -> pd.Series:
+    return pd.Series([], index=pd.DatetimeIndex([], name="date"), name=name, dtype=np.float64)
+
+
 def fetch_yahoo_series(
     symbol: str,
     start_date: dt.date,
     end_date: dt.date,
     timeout_seconds: int,
+    allow_empty: bool = False,
 ) -> tuple[pd.Series, str]:
     period1 = int(dt.datetime.combine(start_date, dt.time.min, tzinfo=dt.timezone.utc).timestamp())
     period2 = int(
@@ -412,6 +521,8 @@ def fetch_yahoo_series(
     quote = (((first.get("indicators") or {}).get("quote")) or [{}])[0]
     closes = quote.get("close") or []
     if not timestamps or not closes:
+        if allow_empty:
+            return _empty_series(symbol), response.url
         raise RuntimeError(f"Yahoo response is missing timestamp/close for {symbol}")
 
     rows: list[tuple[dt.datetime, float]] = []
@@ -428,6 +539,8 @@ def fetch_yahoo_series(
         rows.append((date_value, numeric))
 
     if not rows:
+        if allow_empty:
+            return _empty_series(symbol), response.url
         raise RuntimeError(f"Yahoo parsing produced no points for {symbol}")
 
     index = pd.DatetimeIndex([row[0] for row in rows], name="date")
@@ -440,6 +553,7 @@ def fetch_fred_series(
     start_date: dt.date,
     end_date: dt.date,
     timeout_seconds: int,
+    allow_empty: bool = False,
 ) -> tuple[pd.Series, str]:
     url = "https://fred.stlouisfed.org/graph/fredgraph.csv"
     params = {
@@ -477,6 +591,8 @@ def fetch_fred_series(
         rows.append((date_value, numeric))
 
     if not rows:
+        if allow_empty:
+            return _empty_series(series_id), response.url
         raise RuntimeError(f"FRED parsing produced no points for {series_id}")
 
     index = pd.DatetimeIndex([row[0] for row in rows], name="date")
@@ -709,6 +825,109 @@ def discover_candidate_spectrum(spectrum: pd.DataFrame, cfg: AnalysisConfig) ->
     return pd.DataFrame(selected_rows)
 
 
+# --- incremental state -----------------------------------------------------------------------------------
+# With --incremental the expensive per-series stages (rolling-window metrics, surrogate max-SNR distribution)
+# are stored under <output>/_state/<source>-<series>/<stage>.npz, keyed by a hash of the signal and of the
+# config fields that stage depends on. A series whose signal did not change (weekend/holiday runs, weekly or
+# monthly FRED releases, re-runs) skips both stages; changing an unrelated setting keeps the cached stages.
+
+STATE_DIRNAME = "_state"
+# Bump when a cached stage's computation changes.
+_STATE_VERSION = 1
+_WINDOW_STAGE_FIELDS = (
+    "rolling_windows_days",
+    "rolling_step_days",
+    "min_period_days",
+    "max_period_days",
+    "snr_peak_bandwidth_ratio",
+    "snr_background_bandwidth_ratio",
+    "snr_background_exclusion_ratio",
+    "harmonic_include_trend",
+)
+_SURROGATE_STAGE_FIELDS = (
+    "surrogate_count",
+    "surrogate_seed",
+    "min_period_days",
+    "max_period_days",
+    "snr_peak_bandwidth_ratio",
+    "snr_background_bandwidth_ratio",
+    "snr_background_exclusion_ratio",
+    "top_k",
+    "selection_top_k",
+)
+
+
+def _stage_config(cfg: AnalysisConfig, fields: tuple[str, ...]) -> str:
+    return json.dumps({field: getattr(cfg, field) for field in fields}, sort_keys=True)
+
+
+def _state_key(*parts: Any) -> str:
+    digest = hashlib.sha256(f"v{_STATE_VERSION}".encode())
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            values = np.ascontiguousarray(part)
+            digest.update(f"{values.dtype.str}:{values.shape}".encode())
+            digest.update(values.tobytes())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+class SeriesStateCache:
+    """Last computed result per stage for one series; reused when the stage key matches."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.reused: list[str] = []
+
+    def get_or_compute(
+        self, stage: str, key: str, compute: Callable[[], dict[str, np.ndarray]]
+    ) -> dict[str, np.ndarray]:
+        path = self.directory / f"{stage}.npz"
+        if path.exists():
+            try:
+                with np.load(path, allow_pickle=False) as data:
+                    if str(data["_key"]) == key:
+                        self.reused.append(stage)
+                        return {name: data[name] for name in data.files if name != "_key"}
+            except (OSError, ValueError, KeyError):
+                pass  # unreadable/old entry: recompute and overwrite
+        values = compute()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{stage}.{os.getpid()}.npz")
+        np.savez(tmp, _key=np.asarray(key), **values)
+        os.replace(tmp, path)
+        return values
+
+
+class StageMemo:
+    """In-memory counterpart of SeriesStateCache keeping every key (parameter sweeps over one signal)."""
+
+    def __init__(self) -> None:
+        self._values: dict[tuple[str, str], dict[str, np.ndarray]] = {}
+        self.reused: list[str] = []
+
+    def get_or_compute(
+        self, stage: str, key: str, compute: Callable[[], dict[str, np.ndarray]]
+    ) -> dict[str, np.ndarray]:
+        values = self._values.get((stage, key))
+        if values is not None:
+            self.reused.append(stage)
+            return values
+        values = compute()
+        self._values[(stage, key)] = values
+        return values
+
+
+# (window start, window points) -> rfft power of that window; only valid for one signal/step.
+WindowSpectra = dict[tuple[int, int], np.ndarray]
+
+
+def _window_power(segments: np.ndarray, window_points: int) -> np.ndarray:
+    coeff = np.fft.rfft(segments, axis=1)
+    return (np.abs(coeff) ** 2) / (window_points * window_points)
+
+
 def _window_bounds_by_days(
     signal_len: int,
     step_days: float,
@@ -740,16 +959,15 @@ def _window_bounds_by_days(
     return sorted(bounds)
 
 
-def _harmonic_fit(
-    segment: np.ndarray,
+@functools.lru_cache(maxsize=1024)
+def _harmonic_design(
+    window_points: int,
     period_days: float,
     step_days: float,
     include_trend: bool,
-) -> tuple[float, float, float, float]:
-    if len(segment) < 8:
-        return 0.0, 0.0, 0.0, 0.0
-
-    t = np.arange(len(segment), dtype=np.float64) * step_days
+) -> tuple[np.ndarray, np.ndarray]:
+    """Design matrix of the harmonic regression and its pseudo-inverse; both only depend on the arguments."""
+    t = np.arange(window_points, dtype=np.float64) * step_days
     omega = (2.0 * np.pi) / max(period_days, 1e-6)
     features = [np.ones_like(t)]
     if include_trend:
@@ -757,23 +975,42 @@ def _harmonic_fit(
         features.append(t_centered)
     features.extend([np.cos(omega * t), np.sin(omega * t)])
     X = np.column_stack(features)
+    X_pinv = np.linalg.pinv(X)
+    X.setflags(write=False)
+    X_pinv.setflags(write=False)
+    return X, X_pinv
 
-    beta, *_ = np.linalg.lstsq(X, segment, rcond=None)
-    fitted = X @ beta
 
-    a = float(beta[-2])
-    b = float(beta[-1])
-    amplitude = float(np.sqrt(a * a + b * b))
-    phase = float(np.arctan2(-b, a))
+def _harmonic_fit_windows(
+    segments: np.ndarray,
+    period_days: float,
+    step_days: float,
+    include_trend: bool,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Least-squares harmonic fit of every row of `segments` (equal-length windows).
+
+    Returns per-window `(amplitude, phase, best_lag_days, r2)`.
+    """
+    window_count, window_points = segments.shape
+    if window_points < 8:
+        zeros = np.zeros(window_count, dtype=np.float64)
+        return zeros, zeros.copy(), zeros.copy(), zeros.copy()
+
+    X, X_pinv = _harmonic_design(window_points, float(period_days), float(step_days), bool(include_trend))
+    beta = segments @ X_pinv.T
+    fitted = beta @ X.T
+
+    a = beta[:, -2]
+    b = beta[:, -1]
+    amplitude = np.sqrt(a * a + b * b)
+    phase = np.arctan2(-b, a)
     best_lag_days = (phase / (2.0 * np.pi)) * period_days
 
-    residual = segment - fitted
-    sst = float(np.sum((segment - np.mean(segment)) ** 2))
-    sse = float(np.sum(residual**2))
-    if sst <= 0:
-        r2 = 0.0
-    else:
-        r2 = max(0.0, min(1.0, 1.0 - (sse / sst)))
+    residual = segments - fitted
+    sst = np.sum((segments - np.mean(segments, axis=1, keepdims=True)) ** 2, axis=1)
+    sse = np.sum(residual**2, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.where(sst > 0, np.clip(1.0 - (sse / sst), 0.0, 1.0), 0.0)
     return amplitude, phase, best_lag_days, r2
 
 
@@ -791,38 +1028,138 @@ def _quantile(values: list[float], q: float) -> float:
     return float(np.quantile(arr, q, method="linear"))
 
 
-def _window_max_snr(signal: np.ndarray, step_days: float, cfg: AnalysisConfig) -> float:
-    try:
-        spectrum, freqs, power, _ = compute_spectrum(
-            signal=signal,
-            step_days=step_days,
-            min_period_days=cfg.min_period_days,
-            max_period_days=cfg.max_period_days,
-        )
-    except Exception:
-        return 0.0
-    candidates = discover_candidate_spectrum(spectrum, cfg=cfg)
-    if candidates.empty:
-        return 0.0
-    max_snr = 0.0
-    for row in candidates.itertuples(index=False):
-        _, snr = _compute_band_metrics(freqs=freqs, power=power, freq0=float(row.freq_per_day), cfg=cfg)
-        if snr > max_snr:
-            max_snr = snr
-    return float(max_snr)
+_SURROGATE_BATCH_SIZE = 256
 
 
-def _phase_randomized_surrogate(signal: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+def _phase_randomized_surrogates(signal: np.ndarray, rng: np.random.Generator, count: int) -> np.ndarray:
     coeff = np.fft.rfft(signal)
     if len(coeff) <= 2:
-        return signal.copy()
-    randomized = coeff.copy()
-    random_phases = rng.uniform(0.0, 2.0 * np.pi, len(coeff) - 2)
-    randomized[1:-1] = np.abs(randomized[1:-1]) * np.exp(1j * random_phases)
-    randomized[-1] = randomized[-1].real + 0j
-    surrogate = np.fft.irfft(randomized, n=len(signal)).real
-    surrogate = surrogate - np.mean(surrogate)
-    return surrogate
+        return np.tile(signal, (count, 1))
+    # One (count, bins) draw consumes the generator exactly like `count` consecutive per-surrogate draws,
+    # so p-values do not depend on the batch size.
+    random_phases = rng.uniform(0.0, 2.0 * np.pi, (count, len(coeff) - 2))
+    randomized = np.tile(coeff, (count, 1))
+    randomized[:, 1:-1] = np.abs(coeff[1:-1]) * np.exp(1j * random_phases)
+    randomized[:, -1] = coeff[-1].real + 0j
+    surrogates = np.fft.irfft(randomized, n=len(signal), axis=1).real
+    return surrogates - np.mean(surrogates, axis=1, keepdims=True)
+
+
+def _batch_band_metrics(
+    freqs: np.ndarray,
+    power: np.ndarray,
+    freq0s: np.ndarray,
+    cfg: AnalysisConfig,
+) -> tuple[np.ndarray, np.ndarray]:
+    """`_compute_band_metrics` for every row of `power` (spectra on the shared grid `freqs`) and every `freq0s`.
+
+    Returns `(band_power_ratio, snr)`, each shaped `(rows, len(freq0s))`.
+    """
+    band_ratio = np.zeros((power.shape[0], len(freq0s)), dtype=np.float64)
+    snr = np.zeros_like(band_ratio)
+    if len(freqs) == 0:
+        return band_ratio, snr
+    power = np.ascontiguousarray(power)
+    total_power = np.sum(power, axis=1)
+    valid = total_power > 0
+    grid_step = float(np.median(np.diff(freqs))) if len(freqs) > 1 else None
+    fallback_background: np.ndarray | None = None
+    for col, freq0 in enumerate(float(value) for value in freq0s):
+        local_step = grid_step if grid_step is not None else max(freq0 * 0.05, 1e-6)
+        local_step = max(local_step, 1e-12)
+
+        peak_half_width = max(local_step * 1.5, freq0 * cfg.snr_peak_bandwidth_ratio)
+        background_half_width = max(peak_half_width * 2.0, freq0 * cfg.snr_background_bandwidth_ratio)
+        exclusion_half_width = max(peak_half_width * 1.2, freq0 * cfg.snr_background_exclusion_ratio)
+
+        distance = np.abs(freqs - freq0)
+        band_mask = distance <= peak_half_width
+        ring_mask = (distance <= background_half_width) & (distance > exclusion_half_width)
+        if not np.any(band_mask):
+            continue
+
+        # Boolean column indexing yields an F-ordered array; sum C-ordered rows so each row uses the same
+        # pairwise summation as the 1-D path (keeps results bit-identical to `_compute_band_metrics`).
+        band_power = np.sum(np.ascontiguousarray(power[:, band_mask]), axis=1)
+        n_band = int(np.sum(band_mask))
+        if np.any(ring_mask):
+            background_density = np.median(power[:, ring_mask], axis=1)
+        else:
+            if fallback_background is None:
+                fallback_background = np.median(power, axis=1)
+            background_density = fallback_background
+        expected_background = np.maximum(background_density * n_band, 1e-18)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            band_ratio[:, col] = np.where(valid, band_power / total_power, 0.0)
+        snr[:, col] = np.where(valid, band_power / expected_background, 0.0)
+    return band_ratio, snr
+
+
+def _batch_max_snr(signals: np.ndarray, step_days: float, cfg: AnalysisConfig) -> np.ndarray:
+    """Max band SNR over the discovered candidates of each row of `signals`.
+
+    Row-wise equivalent of `compute_spectrum` -> `discover_candidate_spectrum` -> `_compute_band_metrics`.
+    All rows share one frequency grid, so band/ring masks and the period-distance conflicts between bins are
+    built once; peak picking and the greedy 10% de-duplication run across all rows at once.
+    """
+    count, n = signals.shape
+    max_snr = np.zeros(count, dtype=np.float64)
+    if count == 0 or n < 2:
+        return max_snr
+
+    coeff = np.fft.rfft(signals, axis=1)
+    freqs = np.fft.rfftfreq(n, d=step_days)
+    power = (np.abs(coeff) ** 2) / (n * n)
+    with np.errstate(divide="ignore"):
+        periods = np.where(freqs > 0, 1.0 / freqs, np.inf)
+    mask = (freqs > 0) & (periods >= cfg.min_period_days) & (periods <= cfg.max_period_days)
+    # Candidate bins in ascending period order, like `discover_candidate_spectrum`.
+    bins = np.flatnonzero(mask)[::-1]
+    if len(bins) == 0:
+        return max_snr
+
+    bin_power = power[:, bins]
+    bin_periods = periods[bins]
+    rows = np.arange(count)
+    if len(bins) <= 2:
+        is_peak = np.ones_like(bin_power, dtype=bool)
+    else:
+        is_peak = np.zeros_like(bin_power, dtype=bool)
+        is_peak[:, 1:-1] = (bin_power[:, 1:-1] > bin_power[:, :-2]) & (bin_power[:, 1:-1] >= bin_power[:, 2:])
+        no_peak = ~is_peak.any(axis=1)
+        is_peak[no_peak, np.argmax(bin_power[no_peak], axis=1)] = True
+
+    pair_a = bin_periods[:, np.newaxis]
+    pair_b = bin_periods[np.newaxis, :]
+    too_close = (np.abs(pair_a - pair_b) / np.maximum(pair_a, pair_b)) < 0.10
+    limit = max(cfg.top_k * 6, cfg.selection_top_k * 12)
+
+    order = np.argsort(-bin_power, axis=1, kind="stable")
+    selected = np.zeros_like(is_peak)
+    blocked = np.zeros_like(is_peak)
+    taken = np.zeros(count, dtype=np.int64)
+    for rank in range(len(bins)):
+        col = order[:, rank]
+        take = is_peak[rows, col] & ~blocked[rows, col] & (taken < limit)
+        if np.any(take):
+            selected[rows[take], col[take]] = True
+            blocked[take] |= too_close[col[take]]
+            taken += take
+        if np.all(taken >= limit):
+            break
+
+    _, snr = _batch_band_metrics(freqs=freqs, power=power, freq0s=freqs[bins], cfg=cfg)
+    return np.max(np.where(selected, snr, 0.0), axis=1, initial=0.0)
+
+
+def _surrogate_max_snr(signal: np.ndarray, step_days: float, cfg: AnalysisConfig) -> np.ndarray:
+    rng = np.random.default_rng(cfg.surrogate_seed)
+    surrogate_arr = np.zeros(cfg.surrogate_count, dtype=np.float64)
+    for start in range(0, cfg.surrogate_count, _SURROGATE_BATCH_SIZE):
+        count = min(_SURROGATE_BATCH_SIZE, cfg.surrogate_count - start)
+        surrogates = _phase_randomized_surrogates(signal, rng, count)
+        surrogate_arr[start : start + count] = _batch_max_snr(surrogates, step_days=step_days, cfg=cfg)
+    return surrogate_arr
 
 
 def estimate_bandmax_p_values(
@@ -830,6 +1167,7 @@ def estimate_bandmax_p_values(
     step_days: float,
     cycles: list[dict[str, Any]],
     cfg: AnalysisConfig,
+    state: SeriesStateCache | StageMemo | None = None,
 ) -> list[dict[str, Any]]:
     if not cycles:
         return cycles
@@ -838,13 +1176,14 @@ def estimate_bandmax_p_values(
             cycle["p_value_bandmax"] = 1.0
         return cycles
 
-    rng = np.random.default_rng(cfg.surrogate_seed)
-    surrogate_max_scores: list[float] = []
-    for _ in range(cfg.surrogate_count):
-        surrogate = _phase_randomized_surrogate(signal, rng)
-        surrogate_max_scores.append(_window_max_snr(surrogate, step_days=step_days, cfg=cfg))
+    if state is None:
+        surrogate_arr = _surrogate_max_snr(signal, step_days, cfg)
+    else:
+        key = _state_key(signal, step_days, _stage_config(cfg, _SURROGATE_STAGE_FIELDS))
+        surrogate_arr = state.get_or_compute(
+            "surrogates", key, lambda: {"max_snr": _surrogate_max_snr(signal, step_days, cfg)}
+        )["max_snr"]
 
-    surrogate_arr = np.array(surrogate_max_scores, dtype=np.float64)
     for cycle in cycles:
         score = float(cycle.get("snr_global", 0.0))
         if len(surrogate_arr) == 0:
@@ -892,6 +1231,77 @@ def _add_rank_scores(cycles: list[dict[str, Any]], cfg: AnalysisConfig) -> None:
             cycle["rank_score_norm"] = 0.0
 
 
+def _window_metrics(
+    signal: np.ndarray,
+    step_days: float,
+    bounds: list[tuple[int, int]],
+    candidate_freqs: np.ndarray,
+    candidate_periods: np.ndarray,
+    cfg: AnalysisConfig,
+    window_spectra: WindowSpectra | None = None,
+) -> dict[str, np.ndarray]:
+    """(candidates, windows) matrices of band ratio, SNR and harmonic fit results for every rolling window.
+
+    `window_spectra` shares window FFTs between calls on the same signal (e.g. sweeps over rolling steps).
+    """
+    metric_shape = (len(candidate_freqs), len(bounds))
+    window_band_ratio = np.zeros(metric_shape, dtype=np.float64)
+    window_snr = np.zeros(metric_shape, dtype=np.float64)
+    window_amplitude = np.zeros(metric_shape, dtype=np.float64)
+    window_phase = np.zeros(metric_shape, dtype=np.float64)
+    window_lag = np.zeros(metric_shape, dtype=np.float64)
+    window_fit = np.zeros(metric_shape, dtype=np.float64)
+
+    # Windows of equal length share the frequency grid and the harmonic design matrix: evaluate each length as
+    # one (windows, points) block.
+    windows_by_length: dict[int, list[int]] = {}
+    for window_idx, (_, window_points) in enumerate(bounds):
+        windows_by_length.setdefault(window_points, []).append(window_idx)
+    for window_points, window_idxs in windows_by_length.items():
+        starts = [bounds[window_idx][0] for window_idx in window_idxs]
+        segments = sliding_window_view(signal, window_points)[starts]
+        if window_spectra is None:
+            power = _window_power(segments, window_points)
+        else:
+            missing = [idx for idx, start in enumerate(starts) if (start, window_points) not in window_spectra]
+            if missing:
+                for idx, row in zip(missing, _window_power(segments[missing], window_points)):
+                    window_spectra[(starts[idx], window_points)] = row
+            power = np.stack([window_spectra[(start, window_points)] for start in starts])
+        freqs = np.fft.rfftfreq(window_points, d=step_days)
+        mask = freqs > 0
+        with np.errstate(divide="ignore"):
+            periods = np.where(freqs > 0, 1.0 / freqs, np.inf)
+        mask &= periods >= cfg.min_period_days
+        mask &= periods <= cfg.max_period_days
+
+        band_ratio, snr = _batch_band_metrics(
+            freqs=freqs[mask], power=power[:, mask], freq0s=candidate_freqs, cfg=cfg
+        )
+        window_band_ratio[:, window_idxs] = band_ratio.T
+        window_snr[:, window_idxs] = snr.T
+        for candidate_idx, period_days in enumerate(candidate_periods):
+            amplitude, phase, best_lag, fit_score = _harmonic_fit_windows(
+                segments=segments,
+                period_days=float(period_days),
+                step_days=step_days,
+                include_trend=cfg.harmonic_include_trend,
+            )
+            window_amplitude[candidate_idx, window_idxs] = amplitude
+            window_phase[candidate_idx, window_idxs] = phase
+            window_lag[candidate_idx, window_idxs] = best_lag
+            window_fit[candidate_idx, window_idxs] = fit_score
+
+    return {
+        "band_ratio": window_band_ratio,
+        "snr": window_snr,
+        "amplitude": window_amplitude,
+        "phase": window_phase,
+        "lag": window_lag,
+        "fit": window_fit,
+    }
+
+
 def evaluate_stability(
     signal: np.ndarray,
     signal_dates: pd.DatetimeIndex,
@@ -900,6 +1310,8 @@ def evaluate_stability(
     full_freqs: np.ndarray,
     full_power: np.ndarray,
     cfg: AnalysisConfig,
+    state: SeriesStateCache | StageMemo | None = None,
+    window_spectra: WindowSpectra | None = None,
 ) -> tuple[list[dict[str, Any]], list[str], list[dict[str, Any]]]:
     if candidate_spectrum.empty:
         return [], [], []
@@ -911,62 +1323,56 @@ def evaluate_stability(
         rolling_step_days=cfg.rolling_step_days,
     )
 
+    candidate_freqs = candidate_spectrum["freq_per_day"].to_numpy(dtype=np.float64)
+    candidate_periods = candidate_spectrum["period_days"].to_numpy(dtype=np.float64)
+    if state is None:
+        metrics = _window_metrics(signal, step_days, bounds, candidate_freqs, candidate_periods, cfg, window_spectra)
+    else:
+        key = _state_key(
+            signal,
+            step_days,
+            np.asarray(bounds, dtype=np.int64),
+            candidate_freqs,
+            candidate_periods,
+            _stage_config(cfg, _WINDOW_STAGE_FIELDS),
+        )
+        metrics = state.get_or_compute(
+            "windows",
+            key,
+            lambda: _window_metrics(signal, step_days, bounds, candidate_freqs, candidate_periods, cfg, window_spectra),
+        )
+    window_band_ratio = metrics["band_ratio"]
+    window_snr = metrics["snr"]
+    window_amplitude = metrics["amplitude"]
+    window_phase = metrics["phase"]
+    window_lag = metrics["lag"]
+    window_fit = metrics["fit"]
+
+    window_present = (window_snr >= cfg.snr_presence_threshold) & (window_band_ratio >= cfg.min_window_power_ratio)
     window_mid_dates: list[str] = []
-    window_segments: list[np.ndarray] = []
-    window_freqs: list[np.ndarray] = []
-    window_power: list[np.ndarray] = []
+    window_dates: list[tuple[str, str]] = []
     for start, window_points in bounds:
-        segment = signal[start : start + window_points]
-        coeff = np.fft.rfft(segment)
-        freqs = np.fft.rfftfreq(len(segment), d=step_days)
-        power = (np.abs(coeff) ** 2) / (len(segment) * len(segment))
-        mask = freqs > 0
-        with np.errstate(divide="ignore"):
-            periods = np.where(freqs > 0, 1.0 / freqs, np.inf)
-        mask &= periods >= cfg.min_period_days
-        mask &= periods <= cfg.max_period_days
-
-        window_segments.append(segment)
-        window_freqs.append(freqs[mask])
-        window_power.append(power[mask])
-
         mid_idx = min(start + (window_points // 2), len(signal_dates) - 1)
+        end_idx = min(start + window_points - 1, len(signal_dates) - 1)
         window_mid_dates.append(signal_dates[mid_idx].date().isoformat())
+        window_dates.append((signal_dates[start].date().isoformat(), signal_dates[end_idx].date().isoformat()))
 
     candidates: list[dict[str, Any]] = []
     window_rows: list[dict[str, Any]] = []
-    for row in candidate_spectrum.itertuples(index=False):
+    for candidate_idx, row in enumerate(candidate_spectrum.itertuples(index=False)):
         freq = float(row.freq_per_day)
         period_days = float(row.period_days)
 
-        band_ratios: list[float] = []
-        snr_values: list[float] = []
-        amplitudes: list[float] = []
-        phases: list[float] = []
-        lags: list[float] = []
-        fit_scores: list[float] = []
-        presence_flags: list[int] = []
-
-        for window_idx, ((start, window_points), segment, freqs, power, window_mid_date) in enumerate(
-            zip(bounds, window_segments, window_freqs, window_power, window_mid_dates)
-        ):
-            band_ratio, snr = _compute_band_metrics(freqs=freqs, power=power, freq0=freq, cfg=cfg)
-            amplitude, phase, best_lag, fit_score = _harmonic_fit(
-                segment=segment,
-                period_days=period_days,
-                step_days=step_days,
-                include_trend=cfg.harmonic_include_trend,
-            )
+        band_ratios = window_band_ratio[candidate_idx].tolist()
+        snr_values = window_snr[candidate_idx].tolist()
+        amplitudes = window_amplitude[candidate_idx].tolist()
+        phases = window_phase[candidate_idx].tolist()
+        lags = window_lag[candidate_idx].tolist()
+        fit_scores = window_fit[candidate_idx].tolist()
+        presence_flags = window_present[candidate_idx].astype(int).tolist()
 
-            band_ratios.append(band_ratio)
-            snr_values.append(snr)
-            amplitudes.append(amplitude)
-            phases.append(phase)
-            lags.append(best_lag)
-            fit_scores.append(fit_score)
-            present = int((snr >= cfg.snr_presence_threshold) and (band_ratio >= cfg.min_window_power_ratio))
-            presence_flags.append(present)
-            end_idx = min(start + window_points - 1, len(signal_dates) - 1)
+        for window_idx, (start, window_points) in enumerate(bounds):
+            window_start_date, window_end_date = window_dates[window_idx]
             window_rows.append(
                 {
                     "period_days": period_days,
@@ -974,16 +1380,16 @@ def evaluate_stability(
                     "window_idx": int(window_idx),
                     "window_start_idx": int(start),
                     "window_points": int(window_points),
-                    "window_start_date": signal_dates[start].date().isoformat(),
-                    "window_mid_date": str(window_mid_date),
-                    "window_end_date": signal_dates[end_idx].date().isoformat(),
-                    "band_power_ratio": float(band_ratio),
-                    "snr": float(snr),
-                    "amplitude": float(amplitude),
-                    "phase": float(phase),
-                    "best_lag_days": float(best_lag),
-                    "fit_score_phase_free": float(fit_score),
-                    "present": int(present),
+                    "window_start_date": window_start_date,
+                    "window_mid_date": window_mid_dates[window_idx],
+                    "window_end_date": window_end_date,
+                    "band_power_ratio": band_ratios[window_idx],
+                    "snr": snr_values[window_idx],
+                    "amplitude": amplitudes[window_idx],
+                    "phase": phases[window_idx],
+                    "best_lag_days": lags[window_idx],
+                    "fit_score_phase_free": fit_scores[window_idx],
+                    "present": presence_flags[window_idx],
                 }
             )
 
@@ -1029,7 +1435,7 @@ def evaluate_stability(
             }
         )
 
-    candidates = estimate_bandmax_p_values(signal=signal, step_days=step_days, cycles=candidates, cfg=cfg)
+    candidates = estimate_bandmax_p_values(signal=signal, step_days=step_days, cycles=candidates, cfg=cfg, state=state)
     _add_rank_scores(candidates, cfg=cfg)
 
     max_stability_score = max((cycle["stability_score"] for cycle in candidates), default=0.0)
@@ -1230,6 +1636,7 @@ def _compute_wavelet_scalogram(
     min_period_days: float,
     max_period_days: float,
     period_count: int,
+    dtype: str = "float64",
 ) -> tuple[np.ndarray, np.ndarray]:
     if len(signal) < 16:
         return np.array([], dtype=np.float64), np.zeros((0, len(signal)), dtype=np.float64)
@@ -1238,25 +1645,26 @@ def _compute_wavelet_scalogram(
     max_period = max(max_period_days, min_period * 1.01)
     periods = np.geomspace(min_period, max_period, num=max(8, int(period_count)), dtype=np.float64)
 
+    # Morlet CWT in the frequency domain: one FFT of the zero-padded signal, multiplied by the analytic Morlet
+    # spectrum of every scale, then one batched inverse FFT. Padding covers the +-6 sigma kernel support so the
+    # result matches a linear (zero-padded) convolution instead of wrapping around.
     w0 = 6.0
-    power = np.zeros((len(periods), len(signal)), dtype=np.float64)
+    n = len(signal)
+    real_dtype = np.float32 if dtype == "float32" else np.float64
     safe_step = max(step_days, 1e-6)
-    for idx, period_days in enumerate(periods):
-        scale = max((period_days * w0) / (2.0 * np.pi), 1e-6)
-        half_width = max(8, int(round((6.0 * scale) / safe_step)))
-        t = np.arange(-half_width, half_width + 1, dtype=np.float64) * safe_step
-        tau = t / scale
-        wavelet = (np.pi ** -0.25) * np.exp(1j * w0 * tau) * np.exp(-0.5 * (tau**2))
-        wavelet *= math.sqrt(safe_step / scale)
-
-        full = np.convolve(signal, np.conj(wavelet[::-1]), mode="full")
-        start = max(0, (len(full) - len(signal)) // 2)
-        coeff = full[start : start + len(signal)]
-        if len(coeff) < len(signal):
-            coeff = np.pad(coeff, (0, len(signal) - len(coeff)))
-        elif len(coeff) > len(signal):
-            coeff = coeff[: len(signal)]
-        power[idx, :] = np.abs(coeff) ** 2
+    scales = np.maximum((periods * w0) / (2.0 * np.pi), 1e-6)
+    max_half_width = max(8, int(round((6.0 * float(scales[-1])) / safe_step)))
+    n_fft = 1 << int(math.ceil(math.log2(n + max_half_width)))
+
+    signal_hat = np.fft.fft(np.asarray(signal, dtype=real_dtype), n=n_fft)
+    omega = (2.0 * np.pi * np.fft.fftfreq(n_fft, d=safe_step)).astype(real_dtype)
+    scales_col = scales.astype(real_dtype)[:, np.newaxis]
+    morlet_hat = np.exp(-0.5 * (scales_col * omega[np.newaxis, :] - real_dtype(w0)) ** 2)
+    morlet_hat *= omega[np.newaxis, :] > 0
+    # Same normalisation as the time-domain kernel pi^-1/4 * sqrt(dt/s), transformed: pi^-1/4 * sqrt(2*pi*s/dt).
+    morlet_hat *= ((np.pi**-0.25) * np.sqrt(2.0 * np.pi * scales / safe_step)).astype(real_dtype)[:, np.newaxis]
+    coeff = np.fft.ifft(signal_hat[np.newaxis, :] * morlet_hat, axis=1)[:, :n]
+    power = (np.abs(coeff) ** 2).astype(np.float64)
 
     row_scale = np.quantile(power, 0.90, axis=1, method="linear")
     row_scale = np.maximum(row_scale, 1e-12)[:, np.newaxis]
@@ -1264,27 +1672,45 @@ def _compute_wavelet_scalogram(
     return periods, normalized
 
 
+def _downsample_time_axis(
+    dates: pd.DatetimeIndex, values: np.ndarray, max_points: int
+) -> tuple[pd.DatetimeIndex, np.ndarray]:
+    """Block-average `values` columns so at most `max_points` remain (plotting only)."""
+    if max_points <= 0 or values.shape[1] <= max_points:
+        return dates, values
+    block = int(math.ceil(values.shape[1] / max_points))
+    starts = np.arange(0, values.shape[1], block)
+    pooled = np.add.reduceat(values, starts, axis=1) / np.diff(np.append(starts, values.shape[1]))
+    return dates[starts], pooled
+
+
 def save_plot_wavelet(
     path: Path,
     signal_dates: pd.DatetimeIndex,
     signal: np.ndarray,
     step_days: float,
-    cfg: AnalysisConfig,
+    min_period_days: float,
+    max_period_days: float,
+    period_count: int,
+    dtype: str,
+    max_points: int,
     title: str,
 ) -> None:
     periods, power = _compute_wavelet_scalogram(
         signal=signal,
         step_days=step_days,
-        min_period_days=cfg.min_period_days,
-        max_period_days=cfg.max_period_days,
-        period_count=cfg.wavelet_period_count,
+        min_period_days=min_period_days,
+        max_period_days=max_period_days,
+        period_count=period_count,
+        dtype=dtype,
     )
+    plot_dates, power = _downsample_time_axis(pd.DatetimeIndex(pd.to_datetime(signal_dates)), power, max_points)
     fig, ax = plt.subplots(figsize=(12, 6))
     if power.size == 0:
         ax.text(0.5, 0.5, "Wavelet view unavailable (signal too short)", ha="center", va="center")
         ax.set_axis_off()
     else:
-        x = mdates.date2num(pd.to_datetime(signal_dates))
+        x = mdates.date2num(plot_dates)
         z = np.log10(np.maximum(power, 1e-12))
         mesh = ax.pcolormesh(x, periods, z, shading="auto", cmap="viridis")
         ax.set_yscale("log")
@@ -1423,37 +1849,220 @@ def save_plot_price_cycle_overlay(
     plt.close(fig)
 
 
-def write_cycles_csv(path: Path, cycles: list[dict[str, Any]]) -> None:
-    columns = [
-        "period_days",
-        "freq_per_day",
-        "power",
-        "norm_power",
-        "amp_median",
-        "amp_p25",
-        "amp_min",
-        "fit_score_phase_free",
-        "snr_median",
-        "snr_p25",
-        "snr_global",
-        "best_lag_days_median",
-        "lag_iqr",
-        "presence_ratio",
-        "margin_median",
-        "phase_locking_r",
-        "p_value_bandmax",
-        "rank_score",
-        "rank_score_norm",
-        "median_window_power_ratio",
-        "stability_score",
-        "stability_score_norm",
-        "stable",
+# --- chart render layer ---------------------------------------------------------------------------------
+# Every chart is described by a flat dict of numpy arrays (its complete input). The PNG is rendered once per
+# input hash into <output>/_render_cache and hard-linked into the series dir, so unchanged series reuse the
+# previous run's images. In on-demand mode the inputs are written to charts.npz and the API renders on request.
+
+RENDER_MODES = ("eager", "on-demand", "none")
+RENDER_CACHE_DIRNAME = "_render_cache"
+CHART_INPUTS_FILE = "charts.npz"
+CHART_FILES = {
+    "price": "price.png",
+    "price_cycle_overlay": "price_cycle_overlay.png",
+    "cycle_components": "cycle_components.png",
+    "spectrum": "spectrum.png",
+    "stability": "stability.png",
+    "wavelet": "wavelet.png",
+    "reconstruction": "reconstruction.png",
+}
+# Bump when a save_plot_* function changes its output so cached PNGs are not reused.
+_RENDER_VERSION = 1
+# pyplot keeps global state; the API renders from request threads.
+_RENDER_LOCK = threading.Lock()
+
+ChartInputs = dict[str, np.ndarray]
+
+
+def _render_price(path: Path, d: ChartInputs) -> None:
+    save_plot_price(path, pd.Series(d["level_values"], index=pd.DatetimeIndex(d["level_dates"])), str(d["title"]))
+
+
+def _render_price_cycle_overlay(path: Path, d: ChartInputs) -> None:
+    save_plot_price_cycle_overlay(
+        path,
+        pd.Series(d["level_values"], index=pd.DatetimeIndex(d["level_dates"])),
+        pd.DatetimeIndex(d["signal_dates"]),
+        d["reconstructed"],
+        history_points=int(d["history_points"]),
+        title=str(d["title"]),
+    )
+
+
+def _render_cycle_components(path: Path, d: ChartInputs) -> None:
+    components = [(str(label), values) for label, values in zip(d["labels"], d["components"])]
+    save_plot_cycle_components(path, pd.DatetimeIndex(d["signal_dates"]), components, str(d["title"]))
+
+
+def _render_spectrum(path: Path, d: ChartInputs) -> None:
+    spectrum = pd.DataFrame({"period_days": d["period_days"], "norm_power": d["norm_power"]})
+    cycles = [
+        {"period_days": float(period), "stable": bool(stable)}
+        for period, stable in zip(d["cycle_period_days"], d["cycle_stable"])
+    ]
+    save_plot_spectrum(path, spectrum, cycles, str(d["title"]))
+
+
+def _render_stability(path: Path, d: ChartInputs) -> None:
+    cycles = [
+        {"period_days": float(period), "presence_ratio": float(presence), "window_power_ratios": ratios}
+        for period, presence, ratios in zip(d["cycle_period_days"], d["cycle_presence_ratio"], d["window_power_ratios"])
     ]
+    save_plot_stability(
+        path, [str(date) for date in d["window_mid_dates"]], cycles, float(d["threshold"]), str(d["title"])
+    )
+
+
+def _render_wavelet(path: Path, d: ChartInputs) -> None:
+    save_plot_wavelet(
+        path,
+        pd.DatetimeIndex(d["signal_dates"]),
+        d["signal"],
+        float(d["step_days"]),
+        min_period_days=float(d["min_period_days"]),
+        max_period_days=float(d["max_period_days"]),
+        period_count=int(d["period_count"]),
+        dtype=str(d["dtype"]),
+        max_points=int(d["max_points"]),
+        title=str(d["title"]),
+    )
+
+
+def _render_reconstruction(path: Path, d: ChartInputs) -> None:
+    save_plot_reconstruction(
+        path, pd.DatetimeIndex(d["signal_dates"]), d["signal"], d["reconstructed"], str(d["title"])
+    )
+
+
+_CHART_RENDERERS = {
+    "price": _render_price,
+    "price_cycle_overlay": _render_price_cycle_overlay,
+    "cycle_components": _render_cycle_components,
+    "spectrum": _render_spectrum,
+    "stability": _render_stability,
+    "wavelet": _render_wavelet,
+    "reconstruction": _render_reconstruction,
+}
+
+
+def _chart_key(chart: str, inputs: ChartInputs) -> str:
+    digest = hashlib.sha256(f"{chart}:{_RENDER_VERSION}:{matplotlib.__version__}".encode())
+    for name in sorted(inputs):
+        values = np.ascontiguousarray(inputs[name])
+        digest.update(f"{name}:{values.dtype.str}:{values.shape}".encode())
+        digest.update(values.tobytes())
+    return digest.hexdigest()[:32]
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _render_cached(chart: str, inputs: ChartInputs, cache_dir: Path, dest: Path, render: bool) -> bool:
+    """Place the PNG for `inputs` at `dest`, rendering it into the cache first if `render`; False if not available."""
+    cached = cache_dir / f"{chart}-{_chart_key(chart, inputs)}.png"
+    if not cached.exists():
+        if not render:
+            return False
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write under a unique name and rename: parallel workers / API requests may render the same chart.
+        tmp = cached.with_name(f".{cached.stem}.{os.getpid()}.{threading.get_ident()}.png")
+        with _RENDER_LOCK:
+            _CHART_RENDERERS[chart](tmp, inputs)
+        os.replace(tmp, cached)
+    _link_or_copy(cached, dest)
+    return True
+
+
+def emit_charts(series_dir: Path, charts: dict[str, ChartInputs], cfg: AnalysisConfig) -> dict[str, str]:
+    """Render (eager), defer (on-demand) or skip (none) the charts; returns chart name -> file name."""
+    if cfg.render_mode == "none":
+        return {}
+    cache_dir = cfg.output_dir / RENDER_CACHE_DIRNAME
+    for chart, inputs in charts.items():
+        # on-demand still links images that are already cached from an earlier run
+        _render_cached(chart, inputs, cache_dir, series_dir / CHART_FILES[chart], render=cfg.render_mode == "eager")
+    if cfg.render_mode == "on-demand":
+        np.savez_compressed(
+            series_dir / CHART_INPUTS_FILE,
+            **{f"{chart}__{name}": values for chart, inputs in charts.items() for name, values in inputs.items()},
+        )
+    return {chart: CHART_FILES[chart] for chart in charts}
+
+
+def render_chart(series_dir: Path, chart: str, cache_dir: Path) -> Path:
+    """Return the PNG of `chart` in `series_dir`, rendering it from charts.npz on first request."""
+    dest = series_dir / CHART_FILES[chart]
+    if dest.exists():
+        return dest
+    inputs_path = series_dir / CHART_INPUTS_FILE
+    if not inputs_path.exists():
+        raise FileNotFoundError(f"{dest.name} was not rendered and {inputs_path.name} is missing")
+    prefix = f"{chart}__"
+    with np.load(inputs_path, allow_pickle=False) as data:
+        inputs = {name[len(prefix) :]: data[name] for name in data.files if name.startswith(prefix)}
+    if not inputs:
+        raise FileNotFoundError(f"no inputs for chart '{chart}' in {inputs_path}")
+    _render_cached(chart, inputs, cache_dir, dest, render=True)
+    return dest
+
+
+CYCLE_COLUMNS = [
+    "period_days",
+    "freq_per_day",
+    "power",
+    "norm_power",
+    "amp_median",
+    "amp_p25",
+    "amp_min",
+    "fit_score_phase_free",
+    "snr_median",
+    "snr_p25",
+    "snr_global",
+    "best_lag_days_median",
+    "lag_iqr",
+    "presence_ratio",
+    "margin_median",
+    "phase_locking_r",
+    "p_value_bandmax",
+    "rank_score",
+    "rank_score_norm",
+    "median_window_power_ratio",
+    "stability_score",
+    "stability_score_norm",
+    "stable",
+]
+WINDOW_COLUMNS = [
+    "period_days",
+    "freq_per_day",
+    "window_idx",
+    "window_start_idx",
+    "window_points",
+    "window_start_date",
+    "window_mid_date",
+    "window_end_date",
+    "band_power_ratio",
+    "snr",
+    "amplitude",
+    "phase",
+    "best_lag_days",
+    "fit_score_phase_free",
+    "present",
+]
+WINDOW_DATE_COLUMNS = ("window_start_date", "window_mid_date", "window_end_date")
+
+
+def write_cycles_csv(path: Path, cycles: list[dict[str, Any]]) -> None:
     with path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=columns)
+        writer = csv.DictWriter(handle, fieldnames=CYCLE_COLUMNS)
         writer.writeheader()
         for cycle in cycles:
-            writer.writerow({key: cycle[key] for key in columns})
+            writer.writerow({key: cycle[key] for key in CYCLE_COLUMNS})
 
 
 def write_waves_csv(
@@ -1486,28 +2095,124 @@ def write_waves_csv(
 
 
 def write_windows_csv(path: Path, rows: list[dict[str, Any]]) -> None:
-    columns = [
-        "period_days",
-        "freq_per_day",
-        "window_idx",
-        "window_start_idx",
-        "window_points",
-        "window_start_date",
-        "window_mid_date",
-        "window_end_date",
-        "band_power_ratio",
-        "snr",
-        "amplitude",
-        "phase",
-        "best_lag_days",
-        "fit_score_phase_free",
-        "present",
-    ]
     with path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=columns)
+        writer = csv.DictWriter(handle, fieldnames=WINDOW_COLUMNS)
         writer.writeheader()
         for row in rows:
-            writer.writerow({key: row.get(key) for key in columns})
+            writer.writerow({key: row.get(key) for key in WINDOW_COLUMNS})
+
+
+# --- columnar artefacts ---------------------------------------------------------------------------------
+# Every table (series, signal, spectrum, cycles, waves, windows) is a dict of equally long NumPy columns with
+# the CSV's column names. npz stores one array per column (np.load reads single columns lazily), parquet is
+# written through pandas/pyarrow. artifacts.json in the run dir indexes tables, columns and files per series.
+
+ARTIFACT_FORMATS = ("csv", "npz", "parquet")
+ARTIFACT_INDEX_FILE = "artifacts.json"
+ArtifactTable = dict[str, np.ndarray]
+
+
+def _date_column(values: Any) -> np.ndarray:
+    return pd.DatetimeIndex(pd.to_datetime(values)).to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+
+
+def _records_table(records: list[dict[str, Any]], columns: list[str], date_columns: tuple[str, ...] = ()) -> ArtifactTable:
+    frame = pd.DataFrame.from_records(records, columns=columns)
+    table: ArtifactTable = {}
+    for column in columns:
+        if column in date_columns:
+            table[column] = _date_column(frame[column])
+            continue
+        values = frame[column].to_numpy()
+        if values.dtype == object:
+            # npz must load without pickle: empty tables have no dtype to infer, anything else becomes text
+            values = values.astype(str) if len(values) else np.zeros(0, dtype=np.float64)
+        table[column] = values
+    return table
+
+
+def waves_table(
+    signal_dates: pd.DatetimeIndex,
+    selected_cycles: list[dict[str, Any]],
+    components: list[tuple[str, np.ndarray]],
+    history_points: int,
+) -> ArtifactTable:
+    """Long format like waves.csv (one row per cycle x date), built with repeat/tile instead of row loops."""
+    dates = _date_column(signal_dates)
+    if not selected_cycles or not components:
+        cycle_count = 0
+        values = np.zeros((0, len(dates)), dtype=np.float64)
+    else:
+        cycle_count = min(len(selected_cycles), len(components))
+        values = np.asarray([component for _, component in components[:cycle_count]], dtype=np.float64)
+    periods = np.asarray([float(cycle["period_days"]) for cycle in selected_cycles[:cycle_count]], dtype=np.float64)
+    is_projection = (np.arange(len(dates)) >= history_points).astype(np.int8)
+    return {
+        "date": np.tile(dates, cycle_count),
+        "period_days": np.repeat(periods, len(dates)),
+        "component_value": values.reshape(-1),
+        "is_projection": np.tile(is_projection, cycle_count),
+    }
+
+
+def write_artifact_tables(series_dir: Path, tables: dict[str, ArtifactTable], formats: list[str]) -> dict[str, Any]:
+    """Write npz/parquet files for `tables` and return their index entry (csv files are written separately)."""
+    index: dict[str, Any] = {}
+    for name, columns in tables.items():
+        files: dict[str, str] = {}
+        if "csv" in formats:
+            files["csv"] = f"{name}.csv"
+        if "npz" in formats:
+            np.savez(series_dir / f"{name}.npz", **columns)
+            files["npz"] = f"{name}.npz"
+        if "parquet" in formats:
+            pd.DataFrame(columns, copy=False).to_parquet(series_dir / f"{name}.parquet", index=False)
+            files["parquet"] = f"{name}.parquet"
+        index[name] = {
+            "rows": int(len(next(iter(columns.values())))) if columns else 0,
+            "columns": {column: str(values.dtype) for column, values in columns.items()},
+            "files": files,
+        }
+    return index
+
+
+def write_artifact_index(run_dir: Path, run_id: str, successes: list[dict[str, Any]], cfg: AnalysisConfig) -> None:
+    """Compact per-run index: series dir -> tables (rows, column dtypes, files) and charts."""
+    series_index = {
+        f"{summary['source']}-{_slug(summary['series'])}": {
+            "source": summary["source"],
+            "series": summary["series"],
+            "tables": summary.get("artifacts", {}),
+            "charts": summary.get("charts", {}),
+        }
+        for summary in successes
+    }
+    index = {"run_id": run_id, "formats": cfg.artifact_formats, "series": series_index}
+    (run_dir / ARTIFACT_INDEX_FILE).write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+
+
+def load_artifact_columns(
+    series_dir: Path, table: str, columns: list[str] | None = None, start: int = 0, stop: int | None = None
+) -> ArtifactTable:
+    """Read selected columns and a row slice of one table, preferring npz, then parquet, then csv."""
+    npz_path = series_dir / f"{table}.npz"
+    if npz_path.exists():
+        with np.load(npz_path, allow_pickle=False) as data:
+            wanted = columns or list(data.files)
+            missing = sorted(set(wanted) - set(data.files))
+            if missing:
+                raise ValueError(f"unknown column(s) {missing} in {table}")
+            return {column: data[column][start:stop] for column in wanted}
+    parquet_path = series_dir / f"{table}.parquet"
+    csv_path = series_dir / f"{table}.csv"
+    if parquet_path.exists():
+        frame = pd.read_parquet(parquet_path, columns=columns)
+    elif csv_path.exists():
+        frame = pd.read_csv(csv_path, usecols=columns)
+    else:
+        raise FileNotFoundError(f"no artefact for table '{table}' in {series_dir}")
+    frame = frame.iloc[start:stop]
+    return {column: frame[column].to_numpy() for column in frame.columns}
 
 
 def process_single_series(
@@ -1546,6 +2251,9 @@ def process_single_series(
     )
 
     candidate_pool = discover_candidate_spectrum(spectrum, cfg=cfg)
+    state = (
+        SeriesStateCache(cfg.output_dir / STATE_DIRNAME / f"{source}-{_slug(series_name)}") if cfg.incremental else None
+    )
     evaluated, window_mid_dates, window_rows = evaluate_stability(
         signal=signal,
         signal_dates=signal_dates,
@@ -1554,6 +2262,7 @@ def process_single_series(
         full_freqs=full_freqs,
         full_power=full_power,
         cfg=cfg,
+        state=state,
     )
 
     stable_cycles = [cycle for cycle in evaluated if cycle["stable"]]
@@ -1599,70 +2308,95 @@ def process_single_series(
     series_dir = run_dir / f"{source}-{_slug(series_name)}"
     series_dir.mkdir(parents=True, exist_ok=False)
 
-    levels.to_frame(name="value").to_csv(series_dir / "series.csv", index_label="date")
-    pd.DataFrame({"date": signal_dates, "signal": signal}).to_csv(
-        series_dir / "signal.csv", index=False
-    )
-    spectrum.to_csv(series_dir / "spectrum.csv", index=False)
-    write_cycles_csv(series_dir / "cycles.csv", stable_cycles)
-    write_waves_csv(
-        series_dir / "waves.csv",
-        signal_dates=extended_signal_dates,
-        selected_cycles=stable_cycles,
-        components=stable_components,
-        history_points=history_points,
-    )
+    if "csv" in cfg.artifact_formats:
+        levels.to_frame(name="value").to_csv(series_dir / "series.csv", index_label="date")
+        pd.DataFrame({"date": signal_dates, "signal": signal}).to_csv(
+            series_dir / "signal.csv", index=False
+        )
+        spectrum.to_csv(series_dir / "spectrum.csv", index=False)
+        write_cycles_csv(series_dir / "cycles.csv", stable_cycles)
+        write_waves_csv(
+            series_dir / "waves.csv",
+            signal_dates=extended_signal_dates,
+            selected_cycles=stable_cycles,
+            components=stable_components,
+            history_points=history_points,
+        )
+        if cfg.export_windows_csv:
+            write_windows_csv(series_dir / "windows.csv", window_rows)
+    tables: dict[str, ArtifactTable] = {
+        "series": {"date": _date_column(levels.index), "value": levels.to_numpy(dtype=np.float64)},
+        "signal": {"date": _date_column(signal_dates), "signal": np.asarray(signal, dtype=np.float64)},
+        "spectrum": {column: spectrum[column].to_numpy() for column in spectrum.columns},
+        "cycles": _records_table(stable_cycles, CYCLE_COLUMNS),
+        "waves": waves_table(extended_signal_dates, stable_cycles, stable_components, history_points),
+    }
     if cfg.export_windows_csv:
-        write_windows_csv(series_dir / "windows.csv", window_rows)
-    save_plot_price(
-        series_dir / "price.png",
-        levels,
-        f"{source}:{series_name} price/level ({cfg.timeframe_days}d)",
-    )
-    save_plot_price_cycle_overlay(
-        series_dir / "price_cycle_overlay.png",
-        levels,
-        extended_signal_dates,
-        reconstructed,
-        history_points=history_points,
-        title=f"{source}:{series_name} price with composite cycle overlay",
-    )
-    save_plot_cycle_components(
-        series_dir / "cycle_components.png",
-        signal_dates,
-        selected_components,
-        f"{source}:{series_name} top cycle components",
-    )
-
-    save_plot_spectrum(
-        series_dir / "spectrum.png",
-        spectrum,
-        selected_cycles,
-        f"{source}:{series_name} spectrum ({cfg.timeframe_days}d)",
-    )
-    save_plot_stability(
-        series_dir / "stability.png",
-        window_mid_dates,
-        selected_cycles,
-        threshold=cfg.min_window_power_ratio,
-        title=f"{source}:{series_name} rolling stability",
-    )
+        tables["windows"] = _records_table(window_rows, WINDOW_COLUMNS, WINDOW_DATE_COLUMNS)
+    artifact_index = write_artifact_tables(series_dir, tables, cfg.artifact_formats)
+
+    level_dates = pd.DatetimeIndex(levels.index).to_numpy(dtype="datetime64[ns]")
+    level_values = levels.to_numpy(dtype=np.float64)
+    signal_date_values = pd.DatetimeIndex(signal_dates).to_numpy(dtype="datetime64[ns]")
+    charts: dict[str, ChartInputs] = {
+        "price": {
+            "level_dates": level_dates,
+            "level_values": level_values,
+            "title": np.asarray(f"{source}:{series_name} price/level ({cfg.timeframe_days}d)"),
+        },
+        "price_cycle_overlay": {
+            "level_dates": level_dates,
+            "level_values": level_values,
+            "signal_dates": pd.DatetimeIndex(extended_signal_dates).to_numpy(dtype="datetime64[ns]"),
+            "reconstructed": np.asarray(reconstructed, dtype=np.float64),
+            "history_points": np.asarray(history_points),
+            "title": np.asarray(f"{source}:{series_name} price with composite cycle overlay"),
+        },
+        "cycle_components": {
+            "signal_dates": signal_date_values,
+            "labels": np.asarray([label for label, _ in selected_components], dtype=str),
+            "components": np.asarray(
+                [component for _, component in selected_components], dtype=np.float64
+            ).reshape(len(selected_components), history_points),
+            "title": np.asarray(f"{source}:{series_name} top cycle components"),
+        },
+        "spectrum": {
+            "period_days": spectrum["period_days"].to_numpy(dtype=np.float64),
+            "norm_power": spectrum["norm_power"].to_numpy(dtype=np.float64),
+            "cycle_period_days": np.asarray([c["period_days"] for c in selected_cycles], dtype=np.float64),
+            "cycle_stable": np.asarray([bool(c["stable"]) for c in selected_cycles], dtype=bool),
+            "title": np.asarray(f"{source}:{series_name} spectrum ({cfg.timeframe_days}d)"),
+        },
+        "stability": {
+            "window_mid_dates": np.asarray(window_mid_dates, dtype=str),
+            "cycle_period_days": np.asarray([c["period_days"] for c in selected_cycles], dtype=np.float64),
+            "cycle_presence_ratio": np.asarray([c["presence_ratio"] for c in selected_cycles], dtype=np.float64),
+            "window_power_ratios": np.asarray(
+                [c["window_power_ratios"] for c in selected_cycles], dtype=np.float64
+            ).reshape(len(selected_cycles), len(window_mid_dates)),
+            "threshold": np.asarray(cfg.min_window_power_ratio, dtype=np.float64),
+            "title": np.asarray(f"{source}:{series_name} rolling stability"),
+        },
+    }
     if cfg.enable_wavelet_view:
-        save_plot_wavelet(
-            series_dir / "wavelet.png",
-            signal_dates,
-            signal,
-            step_days,
-            cfg=cfg,
-            title=f"{source}:{series_name} wavelet activity view",
-        )
-    save_plot_reconstruction(
-        series_dir / "reconstruction.png",
-        signal_dates,
-        signal,
-        reconstructed[:history_points],
-        f"{source}:{series_name} {transform_name} signal vs stable-cycle reconstruction",
-    )
+        charts["wavelet"] = {
+            "signal_dates": signal_date_values,
+            "signal": np.asarray(signal, dtype=np.float64),
+            "step_days": np.asarray(step_days, dtype=np.float64),
+            "min_period_days": np.asarray(cfg.min_period_days, dtype=np.float64),
+            "max_period_days": np.asarray(cfg.max_period_days, dtype=np.float64),
+            "period_count": np.asarray(cfg.wavelet_period_count),
+            "dtype": np.asarray(cfg.wavelet_dtype),
+            "max_points": np.asarray(cfg.wavelet_max_points),
+            "title": np.asarray(f"{source}:{series_name} wavelet activity view"),
+        }
+    charts["reconstruction"] = {
+        "signal_dates": signal_date_values,
+        "signal": np.asarray(signal, dtype=np.float64),
+        "reconstructed": np.asarray(reconstructed[:history_points], dtype=np.float64),
+        "title": np.asarray(f"{source}:{series_name} {transform_name} signal vs stable-cycle reconstruction"),
+    }
+    chart_files = emit_charts(series_dir, charts, cfg)
 
     summary = {
         "source": source,
@@ -1688,6 +2422,10 @@ def process_single_series(
         "snr_presence_threshold": cfg.snr_presence_threshold,
         "export_windows_csv": cfg.export_windows_csv,
         "enable_wavelet_view": cfg.enable_wavelet_view,
+        "render_mode": cfg.render_mode,
+        "incremental_reused_stages": state.reused if state is not None else [],
+        "charts": chart_files,
+        "artifacts": artifact_index,
         "selected_cycles": selected_cycles,
     }
     (series_dir / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
@@ -1712,6 +2450,111 @@ def _jsonable(value: Any) -> Any:
     return value
 
 
+_FETCH_THREADS = 8
+
+
+def fetch_series(
+    source: str,
+    series_name: str,
+    start_date: dt.date,
+    cfg: AnalysisConfig,
+) -> tuple[pd.Series, str]:
+    fetch = fetch_yahoo_series if source == "yahoo" else fetch_fred_series
+    if cfg.market_data_db is None:
+        return fetch(series_name, start_date, cfg.end_date, cfg.timeout_seconds)
+
+    fetch_urls: list[str] = []
+
+    def fetch_range(range_start: dt.date, range_end: dt.date) -> list[tuple[dt.date, float]]:
+        # Incremental ranges (e.g. the newest few days of a monthly FRED series) may legitimately be empty.
+        levels, fetch_url = fetch(series_name, range_start, range_end, cfg.timeout_seconds, allow_empty=True)
+        fetch_urls.append(fetch_url)
+        daily = levels[~levels.index.normalize().duplicated(keep="last")]
+        return [(ts.date(), float(value)) for ts, value in daily.items()]
+
+    store = MarketDataStore(cfg.market_data_db)
+    points, warnings = store.sync(
+        source,
+        series_name,
+        start_date,
+        cfg.end_date,
+        fetch_range,
+        offline=cfg.market_data_offline,
+        refresh_days=cfg.market_data_refresh_days,
+        full_refresh=cfg.market_data_full_refresh,
+    )
+    for warning in warnings:
+        print(f"warn source={source} series={series_name} msg={warning}", file=sys.stderr)
+    index = pd.DatetimeIndex([pd.Timestamp(date) for date, _ in points], name="date")
+    levels = pd.Series([value for _, value in points], index=index, name=series_name, dtype=np.float64)
+    return levels, fetch_urls[-1] if fetch_urls else f"cache://{source}/{series_name}"
+
+
+def run_series_jobs(
+    series_jobs: list[tuple[str, str]],
+    run_dir: Path,
+    cfg: AnalysisConfig,
+    start_date: dt.date,
+) -> list[dict[str, Any]]:
+    """Fetch (threads) and process (process pool) all series; results keep the order of `series_jobs`.
+
+    Each entry is the series summary, or `{"source", "series", "error"}` when fetching or processing failed.
+    """
+    outcomes: list[dict[str, Any] | None] = [None] * len(series_jobs)
+
+    def record(idx: int, summary: dict[str, Any] | None, exc: BaseException | None) -> None:
+        source, series_name = series_jobs[idx]
+        if exc is None and summary is not None:
+            outcomes[idx] = summary
+            print(f"ok source={source} series={series_name} stable_cycles={summary['stable_cycle_count']}")
+        else:
+            outcomes[idx] = {"source": source, "series": series_name, "error": str(exc)}
+            print(f"error source={source} series={series_name} msg={exc}", file=sys.stderr)
+
+    # spawn: worker processes must not inherit the fetch threads (fork with live threads can deadlock).
+    cpu_pool = (
+        ProcessPoolExecutor(max_workers=cfg.workers, mp_context=multiprocessing.get_context("spawn"))
+        if cfg.workers > 1 and len(series_jobs) > 1
+        else nullcontext()
+    )
+    with ThreadPoolExecutor(max_workers=max(1, min(_FETCH_THREADS, len(series_jobs)))) as fetch_pool, cpu_pool as pool:
+        fetches = {
+            fetch_pool.submit(fetch_series, source, series_name, start_date, cfg): idx
+            for idx, (source, series_name) in enumerate(series_jobs)
+        }
+        processing: dict[Future[dict[str, Any]], int] = {}
+        for fetched in as_completed(fetches):
+            idx = fetches[fetched]
+            source, series_name = series_jobs[idx]
+            try:
+                levels, fetch_url = fetched.result()
+            except Exception as exc:  # noqa: BLE001
+                record(idx, None, exc)
+                continue
+            kwargs = {
+                "source": source,
+                "series_name": series_name,
+                "levels": levels,
+                "fetch_url": fetch_url,
+                "run_dir": run_dir,
+                "cfg": cfg,
+                "start_date": start_date,
+            }
+            if pool is None:
+                try:
+                    record(idx, process_single_series(**kwargs), None)
+                except Exception as exc:  # noqa: BLE001
+                    record(idx, None, exc)
+            else:
+                processing[pool.submit(process_single_series, **kwargs)] = idx
+        for processed in as_completed(processing):
+            try:
+                record(processing[processed], processed.result(), None)
+            except Exception as exc:  # noqa: BLE001
+                record(processing[processed], None, exc)
+    return [outcome for outcome in outcomes if outcome is not None]
+
+
 def main() -> int:
     cfg = parse_args()
     cfg.output_dir.mkdir(parents=True, exist_ok=True)
@@ -1724,54 +2567,11 @@ def main() -> int:
     run_dir = cfg.output_dir / run_id
     run_dir.mkdir(parents=False, exist_ok=False)
 
-    successes: list[dict[str, Any]] = []
-    failures: list[dict[str, str]] = []
-
-    for symbol in cfg.yahoo_symbols:
-        try:
-            levels, fetch_url = fetch_yahoo_series(
-                symbol=symbol,
-                start_date=start_date,
-                end_date=cfg.end_date,
-                timeout_seconds=cfg.timeout_seconds,
-            )
-            summary = process_single_series(
-                source="yahoo",
-                series_name=symbol,
-                levels=levels,
-                fetch_url=fetch_url,
-                run_dir=run_dir,
-                cfg=cfg,
-                start_date=start_date,
-            )
-            successes.append(summary)
-            print(f"ok source=yahoo series={symbol} stable_cycles={summary['stable_cycle_count']}")
-        except Exception as exc:  # noqa: BLE001
-            failures.append({"source": "yahoo", "series": symbol, "error": str(exc)})
-            print(f"error source=yahoo series={symbol} msg={exc}", file=sys.stderr)
-
-    for series_id in cfg.fred_series:
-        try:
-            levels, fetch_url = fetch_fred_series(
-                series_id=series_id,
-                start_date=start_date,
-                end_date=cfg.end_date,
-                timeout_seconds=cfg.timeout_seconds,
-            )
-            summary = process_single_series(
-                source="fred",
-                series_name=series_id,
-                levels=levels,
-                fetch_url=fetch_url,
-                run_dir=run_dir,
-                cfg=cfg,
-                start_date=start_date,
-            )
-            successes.append(summary)
-            print(f"ok source=fred series={series_id} stable_cycles={summary['stable_cycle_count']}")
-        except Exception as exc:  # noqa: BLE001
-            failures.append({"source": "fred", "series": series_id, "error": str(exc)})
-            print(f"error source=fred series={series_id} msg={exc}", file=sys.stderr)
+    series_jobs = [("yahoo", symbol) for symbol in cfg.yahoo_symbols]
+    series_jobs.extend(("fred", series_id) for series_id in cfg.fred_series)
+    outcomes = run_series_jobs(series_jobs, run_dir=run_dir, cfg=cfg, start_date=start_date)
+    successes = [outcome for outcome in outcomes if "error" not in outcome]
+    failures = [outcome for outcome in outcomes if "error" in outcome]
 
     run_summary = {
         "run_id": run_id,
@@ -1785,6 +2585,7 @@ def main() -> int:
         "failures": failures,
     }
     (run_dir / "summary.json").write_text(json.dumps(run_summary, indent=2), encoding="utf-8")
+    write_artifact_index(run_dir, run_id, successes, cfg)
 
     if successes:
         update_latest_symlink(cfg.output_dir, run_dir)
@@ -0,0 +1,194 @@
+"""Local SQLite store for daily Yahoo/FRED observations with incremental range fetches.
+
+Stdlib only, so both `fourier_cycles_pipeline.py` and the host script `scripts/finance_fourier_analysis.py` can use it.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import math
+import sqlite3
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+Point = tuple[dt.date, float]
+RangeFetcher = Callable[[dt.date, dt.date], list[Point]]
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS points (
+  source TEXT NOT NULL,
+  series TEXT NOT NULL,
+  date TEXT NOT NULL,
+  value REAL NOT NULL,
+  PRIMARY KEY (source, series, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS coverage (
+  source TEXT NOT NULL,
+  series TEXT NOT NULL,
+  start_date TEXT NOT NULL,
+  end_date TEXT NOT NULL,
+  updated_at_utc TEXT NOT NULL,
+  PRIMARY KEY (source, series)
+);
+"""
+
+
+class MarketDataStore:
+    """Observations keyed by (source, series, date) plus the contiguous date range already fetched per series.
+
+    Coverage records the requested range, not the first/last observation, so weekends, holidays and
+    monthly release gaps are not fetched again. It is a single span, so fetches always extend it contiguously.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA_SQL)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per call: fetches run in worker threads.
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def coverage(self, source: str, series: str) -> tuple[dt.date, dt.date] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT start_date, end_date FROM coverage WHERE source = ? AND series = ?",
+                (source, series),
+            ).fetchone()
+        if row is None:
+            return None
+        return dt.date.fromisoformat(row[0]), dt.date.fromisoformat(row[1])
+
+    def missing_ranges(
+        self,
+        source: str,
+        series: str,
+        start: dt.date,
+        end: dt.date,
+        refresh_days: int,
+    ) -> list[tuple[dt.date, dt.date]]:
+        """Ranges to fetch so `start..end` is covered; the newest `refresh_days` are always re-fetched.
+
+        A request starting after the covered span also fetches the gap, so the coverage span stays contiguous.
+        """
+        covered = self.coverage(source, series)
+        if covered is None:
+            return [(start, end)]
+        covered_start, covered_end = covered
+        ranges: list[tuple[dt.date, dt.date]] = []
+        if start < covered_start:
+            ranges.append((start, covered_start - dt.timedelta(days=1)))
+        refresh_from = covered_end - dt.timedelta(days=max(0, refresh_days))
+        if end > refresh_from:
+            fetch_from = min(start, covered_end + dt.timedelta(days=1))
+            ranges.append((max(fetch_from, refresh_from + dt.timedelta(days=1)), end))
+        return ranges
+
+    def merge(
+        self,
+        source: str,
+        series: str,
+        points: Iterable[Point],
+        range_start: dt.date,
+        range_end: dt.date,
+    ) -> None:
+        """Replace the observations in `range_start..range_end` and extend the coverage to include it."""
+        rows = [(source, series, date.isoformat(), float(value)) for date, value in points]
+        now = dt.datetime.now(dt.timezone.utc).isoformat()
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM points WHERE source = ? AND series = ? AND date BETWEEN ? AND ?",
+                (source, series, range_start.isoformat(), range_end.isoformat()),
+            )
+            conn.executemany("INSERT OR REPLACE INTO points(source, series, date, value) VALUES (?,?,?,?)", rows)
+            conn.execute(
+                "INSERT INTO coverage(source, series, start_date, end_date, updated_at_utc) VALUES (?,?,?,?,?) "
+                "ON CONFLICT(source, series) DO UPDATE SET "
+                "start_date = MIN(start_date, excluded.start_date), end_date = MAX(end_date, excluded.end_date), "
+                "updated_at_utc = excluded.updated_at_utc",
+                (source, series, range_start.isoformat(), range_end.isoformat(), now),
+            )
+
+    def replace(
+        self,
+        source: str,
+        series: str,
+        points: Iterable[Point],
+        range_start: dt.date,
+        range_end: dt.date,
+    ) -> None:
+        """Drop everything stored for the series and keep `points` with `range_start..range_end` as coverage."""
+        rows = [(source, series, date.isoformat(), float(value)) for date, value in points]
+        now = dt.datetime.now(dt.timezone.utc).isoformat()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM points WHERE source = ? AND series = ?", (source, series))
+            conn.executemany("INSERT OR REPLACE INTO points(source, series, date, value) VALUES (?,?,?,?)", rows)
+            conn.execute(
+                "INSERT OR REPLACE INTO coverage(source, series, start_date, end_date, updated_at_utc) VALUES (?,?,?,?,?)",
+                (source, series, range_start.isoformat(), range_end.isoformat(), now),
+            )
+
+    def disagrees(self, source: str, series: str, points: list[Point], rel_tol: float = 1e-6) -> bool:
+        """True when fetched `points` differ from stored values on common dates (split adjustment, revision)."""
+        if not points:
+            return False
+        stored = dict(self.load(source, series, min(date for date, _ in points), max(date for date, _ in points)))
+        return any(
+            date in stored and not math.isclose(stored[date], float(value), rel_tol=rel_tol) for date, value in points
+        )
+
+    def load(self, source: str, series: str, start: dt.date, end: dt.date) -> list[Point]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT date, value FROM points WHERE source = ? AND series = ? AND date BETWEEN ? AND ? ORDER BY date",
+                (source, series, start.isoformat(), end.isoformat()),
+            ).fetchall()
+        return [(dt.date.fromisoformat(date), float(value)) for date, value in rows]
+
+    def sync(
+        self,
+        source: str,
+        series: str,
+        start: dt.date,
+        end: dt.date,
+        fetch_range: RangeFetcher,
+        *,
+        offline: bool = False,
+        refresh_days: int = 7,
+        full_refresh: bool = False,
+        today: dt.date | None = None,
+    ) -> tuple[list[Point], list[str]]:
+        """Fetch what is missing for `start..end`, merge it and return the stored points plus warnings.
+
+        When re-fetched days disagree with stored values (Yahoo split adjustment, FRED revisions) the stored
+        history is stale as a whole: `start..end` is fetched again and replaces it, as with `full_refresh=True`.
+        Network errors fall back to whatever is cached for the range (reported as a warning); with nothing
+        cached the error is raised. `offline=True` never calls `fetch_range`.
+        """
+        today = today or dt.datetime.now(dt.timezone.utc).date()
+        warnings: list[str] = []
+        if not offline:
+            try:
+                if not full_refresh:
+                    for range_start, range_end in self.missing_ranges(source, series, start, end, refresh_days):
+                        points = fetch_range(range_start, range_end)
+                        if self.disagrees(source, series, points):
+                            warnings.append("stored history disagrees with re-fetched days (split/revision), re-fetching")
+                            full_refresh = True
+                            break
+                        # Never mark future days as covered: they would not be fetched once they exist.
+                        self.merge(source, series, points, range_start, min(range_end, today))
+                if full_refresh:
+                    self.replace(source, series, fetch_range(start, end), start, min(end, today))
+            except Exception as exc:  # noqa: BLE001
+                if not self.load(source, series, start, end):
+                    raise
+                warnings.append(f"fetch failed, using cached data: {exc}")
+        points = self.load(source, series, start, end)
+        if not points:
+            raise RuntimeError(f"no stored observations for {source}:{series} in {start.isoformat()}..{end.isoformat()}")
+        return points, warnings
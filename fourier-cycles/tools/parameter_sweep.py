@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""Parameter sweep for fourier-cycles: evaluate a grid of AnalysisConfig overrides on shared intermediates.
+
+Each series is fetched once. Resample/transform runs once per transform group (grid points with equal
+timeframe/resample/signal settings), the full spectrum once per period range, and window FFT power, window
+metrics and surrogate distributions once per stage key. Only the parameter-dependent stages (candidate
+discovery, presence/rank aggregation, selection) run per grid point. Groups are evaluated in parallel.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import dataclasses
+import datetime as dt
+import itertools
+import json
+import multiprocessing
+import sys
+import time
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SRC_DIR = SCRIPT_DIR.parent / "src"
+
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from fourier_cycles_pipeline import (  # type: ignore  # noqa: E402
+    AnalysisConfig,
+    StageMemo,
+    _jsonable,
+    build_signal,
+    compute_spectrum,
+    discover_candidate_spectrum,
+    evaluate_stability,
+    fetch_series,
+    infer_step_days,
+    parse_args as parse_pipeline_args,
+    resample_levels,
+    select_cycles_for_output,
+    trim_to_timeframe,
+)
+
+
+# Grid points that differ in one of these need their own signal (trim/resample/transform).
+TRANSFORM_FIELDS = (
+    "timeframe_days",
+    "resample_rule",
+    "signal_mode_yahoo",
+    "signal_mode_fred",
+    "detrend_rolling_days",
+    "min_points",
+    "end_date",
+)
+# Evaluated per grid point on a shared signal.
+ANALYSIS_FIELDS = (
+    "min_period_days",
+    "max_period_days",
+    "top_k",
+    "min_presence_ratio",
+    "min_window_power_ratio",
+    "rolling_windows_days",
+    "rolling_step_days",
+    "harmonic_include_trend",
+    "snr_presence_threshold",
+    "snr_peak_bandwidth_ratio",
+    "snr_background_bandwidth_ratio",
+    "snr_background_exclusion_ratio",
+    "surrogate_count",
+    "surrogate_seed",
+    "rank_weight_amp",
+    "rank_weight_snr",
+    "rank_weight_presence",
+    "rank_weight_phase",
+    "selection_top_k",
+    "selection_min_presence_ratio",
+    "selection_min_norm_power_percentile",
+    "selection_min_period_distance_ratio",
+    "selection_min_phase_locking_r",
+    "selection_max_p_value_bandmax",
+    "selection_min_amp_sigma",
+)
+SWEEP_FIELDS = TRANSFORM_FIELDS + ANALYSIS_FIELDS
+
+CYCLE_FIELDS = [
+    "period_days",
+    "presence_ratio",
+    "snr_median",
+    "amp_median",
+    "phase_locking_r",
+    "p_value_bandmax",
+    "rank_score_norm",
+]
+
+
+def parse_args() -> tuple[argparse.Namespace, list[str]]:
+    """Tool flags before `--`; everything after it is passed to the pipeline parser (base config)."""
+    argv = sys.argv[1:]
+    pipeline_argv: list[str] = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, pipeline_argv = argv[:split], argv[split + 1 :]
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        epilog="Base config: FOURIER_* env vars plus pipeline flags after `--` (e.g. -- --yahoo-symbols SPY).",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--grid",
+        required=True,
+        help=(
+            "JSON file or inline JSON: {field: [values, ...]} (cartesian product) "
+            "or [{field: value, ...}, ...] (explicit grid points)."
+        ),
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="",
+        help="Write sweep tables here (default: <FOURIER_OUTPUT_DIR>/sweeps/sweep_<UTC timestamp>).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Processes for the per-group evaluation (0=pipeline --workers, 1=sequential in-process).",
+    )
+    return parser.parse_args(argv), pipeline_argv
+
+
+def load_grid(raw: str) -> list[dict[str, Any]]:
+    path = Path(raw).expanduser()
+    spec = json.loads(path.read_text(encoding="utf-8") if path.is_file() else raw)
+    if isinstance(spec, dict):
+        fields = list(spec)
+        axes = [value if isinstance(value, list) else [value] for value in spec.values()]
+        if any(not axis for axis in axes):
+            raise ValueError("grid axes must not be empty")
+        points = [dict(zip(fields, values)) for values in itertools.product(*axes)]
+    elif isinstance(spec, list) and all(isinstance(point, dict) for point in spec):
+        points = spec or [{}]
+    else:
+        raise ValueError("grid must be a JSON object of value lists or a list of objects")
+    unknown = sorted({field for point in points for field in point} - set(SWEEP_FIELDS))
+    if unknown:
+        raise ValueError(f"grid: unsupported field(s) {unknown}, expected a subset of {list(SWEEP_FIELDS)}")
+    return points
+
+
+def _flag_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, list):
+        return ",".join(str(item) for item in value)
+    return str(value)
+
+
+def config_for(pipeline_argv: list[str], overrides: dict[str, Any]) -> AnalysisConfig:
+    """Base config with `overrides` applied through the pipeline parser (same defaults, clamps and checks)."""
+    argv = list(pipeline_argv)
+    for field, value in overrides.items():
+        argv.extend([f"--{field.replace('_', '-')}", _flag_value(value)])
+    return parse_pipeline_args(argv)
+
+
+def _transform_key(cfg: AnalysisConfig) -> tuple[Any, ...]:
+    return tuple(_flag_value(getattr(cfg, field)) for field in TRANSFORM_FIELDS)
+
+
+def sweep_group(
+    source: str,
+    series_name: str,
+    levels: pd.Series,
+    points: list[tuple[str, AnalysisConfig]],
+) -> dict[str, Any]:
+    """Evaluate all grid points of one transform group on one series; they share one signal and stage memo."""
+    cfg0 = points[0][1]
+    start_date = cfg0.end_date - dt.timedelta(days=cfg0.timeframe_days)
+    trimmed = resample_levels(trim_to_timeframe(levels, start_date=start_date, end_date=cfg0.end_date), cfg0.resample_rule)
+    signal_mode = cfg0.signal_mode_yahoo if source == "yahoo" else cfg0.signal_mode_fred
+    signal_dates, signal, _ = build_signal(
+        trimmed,
+        signal_mode=signal_mode,
+        detrend_rolling_days=cfg0.detrend_rolling_days,
+    )
+    if len(trimmed) < cfg0.min_points or len(signal) < cfg0.min_points:
+        message = f"Signal too short ({len(signal)} < {cfg0.min_points}) for {source}:{series_name}"
+        return {"results": [{"config_id": config_id, "error": message} for config_id, _ in points], "stages": {}}
+    step_days = infer_step_days(signal_dates)
+
+    memo = StageMemo()
+    window_spectra: dict[tuple[int, int], Any] = {}
+    spectra: dict[tuple[float, float], tuple[pd.DataFrame, Any, Any]] = {}
+    stages: Counter[str] = Counter()
+    results: list[dict[str, Any]] = []
+    for config_id, cfg in points:
+        started = time.perf_counter()
+        try:
+            period_range = (cfg.min_period_days, cfg.max_period_days)
+            if period_range in spectra:
+                stages["spectrum_reused"] += 1
+            else:
+                spectrum, full_freqs, full_power, _ = compute_spectrum(
+                    signal=signal,
+                    step_days=step_days,
+                    min_period_days=cfg.min_period_days,
+                    max_period_days=cfg.max_period_days,
+                )
+                spectra[period_range] = (spectrum, full_freqs, full_power)
+            spectrum, full_freqs, full_power = spectra[period_range]
+            candidate_pool = discover_candidate_spectrum(spectrum, cfg=cfg)
+            evaluated, _, _ = evaluate_stability(
+                signal=signal,
+                signal_dates=signal_dates,
+                step_days=step_days,
+                candidate_spectrum=candidate_pool,
+                full_freqs=full_freqs,
+                full_power=full_power,
+                cfg=cfg,
+                state=memo,
+                window_spectra=window_spectra,
+            )
+            selected = select_cycles_for_output(evaluated, cfg)
+        except Exception as exc:  # noqa: BLE001
+            results.append({"config_id": config_id, "error": str(exc)})
+            continue
+        results.append(
+            {
+                "config_id": config_id,
+                "signal_points": len(signal),
+                "candidate_count": len(evaluated),
+                "stable_count": sum(1 for cycle in evaluated if cycle["stable"]),
+                "selected": [{field: cycle.get(field) for field in CYCLE_FIELDS} for cycle in selected],
+                "seconds": time.perf_counter() - started,
+            }
+        )
+    stages.update(f"{stage}_reused" for stage in memo.reused)
+    stages["window_ffts"] = len(window_spectra)
+    return {"results": results, "stages": dict(stages)}
+
+
+def run_sweep(
+    grid: list[tuple[str, dict[str, Any], AnalysisConfig]],
+    base: AnalysisConfig,
+    workers: int,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Fetch every series once (threads), then evaluate (series, transform group) tasks in a process pool."""
+    series_jobs = [("yahoo", symbol) for symbol in base.yahoo_symbols]
+    series_jobs.extend(("fred", series_id) for series_id in base.fred_series)
+    groups: dict[tuple[Any, ...], list[tuple[str, AnalysisConfig]]] = {}
+    for config_id, _, cfg in grid:
+        groups.setdefault(_transform_key(cfg), []).append((config_id, cfg))
+    # One fetch covering the widest timeframe/latest end date of the grid.
+    end_date = max(cfg.end_date for _, _, cfg in grid)
+    start_date = min(cfg.end_date - dt.timedelta(days=cfg.timeframe_days) for _, _, cfg in grid)
+    fetch_cfg = dataclasses.replace(base, end_date=end_date)
+
+    rows: list[dict[str, Any]] = []
+    stages: Counter[str] = Counter()
+
+    def record(source: str, series_name: str, outcome: dict[str, Any]) -> None:
+        for result in outcome["results"]:
+            rows.append({"source": source, "series": series_name, **result})
+        stages.update(outcome["stages"])
+
+    # spawn: worker processes must not inherit the fetch threads (fork with live threads can deadlock).
+    tasks = len(series_jobs) * len(groups)
+    cpu_pool = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        if workers > 1 and tasks > 1
+        else nullcontext()
+    )
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(series_jobs)))) as fetch_pool, cpu_pool as pool:
+        fetches = {
+            fetch_pool.submit(fetch_series, source, series_name, start_date, fetch_cfg): (source, series_name)
+            for source, series_name in series_jobs
+        }
+        processing: dict[Future[dict[str, Any]], tuple[str, str, list[tuple[str, AnalysisConfig]]]] = {}
+        for fetched in as_completed(fetches):
+            source, series_name = fetches[fetched]
+            try:
+                levels, _ = fetched.result()
+            except Exception as exc:  # noqa: BLE001
+                print(f"error source={source} series={series_name} msg={exc}", file=sys.stderr)
+                record(source, series_name, {"results": [{"config_id": cid, "error": str(exc)} for cid, _, _ in grid], "stages": {}})
+                continue
+            for points in groups.values():
+                if pool is None:
+                    record(source, series_name, sweep_group(source, series_name, levels, points))
+                else:
+                    processing[pool.submit(sweep_group, source, series_name, levels, points)] = (source, series_name, points)
+        for processed in as_completed(processing):
+            source, series_name, points = processing[processed]
+            try:
+                record(source, series_name, processed.result())
+            except Exception as exc:  # noqa: BLE001
+                record(source, series_name, {"results": [{"config_id": cid, "error": str(exc)} for cid, _ in points], "stages": {}})
+
+    order = {config_id: idx for idx, (config_id, _, _) in enumerate(grid)}
+    jobs = {job: idx for idx, job in enumerate(series_jobs)}
+    rows.sort(key=lambda row: (order[row["config_id"]], jobs[(row["source"], row["series"])]))
+    return rows, {"transform_groups": len(groups), "series": len(series_jobs), **dict(sorted(stages.items()))}
+
+
+def write_tables(
+    out_dir: Path,
+    grid: list[tuple[str, dict[str, Any], AnalysisConfig]],
+    rows: list[dict[str, Any]],
+    payload: dict[str, Any],
+) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    swept = list(dict.fromkeys(field for _, overrides, _ in grid for field in overrides))
+    overrides_by_id = {config_id: overrides for config_id, overrides, _ in grid}
+
+    def override_cells(config_id: str) -> list[Any]:
+        overrides = overrides_by_id[config_id]
+        return [_flag_value(overrides[field]) if field in overrides else "" for field in swept]
+
+    with (out_dir / "sweep_summary.csv").open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(
+            ["config_id", *swept, "source", "series", "candidate_count", "stable_count", "selected_count", "selected_periods", "seconds", "error"]
+        )
+        for row in rows:
+            selected = row.get("selected", [])
+            writer.writerow(
+                [
+                    row["config_id"],
+                    *override_cells(row["config_id"]),
+                    row["source"],
+                    row["series"],
+                    row.get("candidate_count", ""),
+                    row.get("stable_count", ""),
+                    len(selected) if "error" not in row else "",
+                    ";".join(f"{float(cycle['period_days']):.2f}" for cycle in selected),
+                    f"{row['seconds']:.4f}" if "seconds" in row else "",
+                    row.get("error", ""),
+                ]
+            )
+    with (out_dir / "sweep_cycles.csv").open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["config_id", *swept, "source", "series", "rank", *CYCLE_FIELDS])
+        for row in rows:
+            for rank, cycle in enumerate(row.get("selected", []), start=1):
+                writer.writerow(
+                    [row["config_id"], *override_cells(row["config_id"]), row["source"], row["series"], rank]
+                    + [cycle[field] for field in CYCLE_FIELDS]
+                )
+    (out_dir / "sweep.json").write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def main() -> int:
+    args, pipeline_argv = parse_args()
+    base = parse_pipeline_args(pipeline_argv)
+    if not base.yahoo_symbols and not base.fred_series:
+        raise RuntimeError("No symbols configured: both Yahoo and FRED lists are empty")
+    points = load_grid(args.grid)
+    width = len(str(len(points)))
+    grid = [
+        (f"cfg{idx:0{width}d}", overrides, config_for(pipeline_argv, overrides))
+        for idx, overrides in enumerate(points, start=1)
+    ]
+    workers = args.workers if args.workers > 0 else base.workers
+
+    started = time.perf_counter()
+    rows, stages = run_sweep(grid, base, workers)
+    elapsed = time.perf_counter() - started
+
+    out_dir = (
+        Path(args.output_dir).expanduser()
+        if args.output_dir
+        else base.output_dir / "sweeps" / dt.datetime.now(dt.timezone.utc).strftime("sweep_%Y%m%dT%H%M%SZ")
+    )
+    payload = {
+        "generated_at_utc": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "base_config": {key: _jsonable(value) for key, value in dataclasses.asdict(base).items()},
+        "grid": [{"config_id": config_id, "overrides": overrides} for config_id, overrides, _ in grid],
+        "shared_stages": stages,
+        "elapsed_seconds": elapsed,
+        "results": rows,
+    }
+    write_tables(out_dir.resolve(), grid, rows, payload)
+
+    print("Fourier Parameter Sweep")
+    print(f"configs={len(grid)} series={stages['series']} transform_groups={stages['transform_groups']} seconds={elapsed:.2f}")
+    print("shared:", " ".join(f"{key}={value}" for key, value in stages.items() if key not in ("series", "transform_groups")) or "-")
+    print("")
+    print("config\tseries\tstable\tselected_periods")
+    for row in rows:
+        label = f"{row['source']}:{row['series']}"
+        if "error" in row:
+            print(f"{row['config_id']}\t{label}\t-\terror: {row['error']}")
+            continue
+        periods = ", ".join(f"{float(cycle['period_days']):.1f}" for cycle in row["selected"]) or "none"
+        print(f"{row['config_id']}\t{label}\t{row['stable_count']}\t{periods}")
+    print("")
+    print(f"artifacts: {out_dir.resolve()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
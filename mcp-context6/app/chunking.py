@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+import os
 import re
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Iterator
 
 
 @dataclass(frozen=True)
@@ -11,6 +16,8 @@ class Chunk:
     char_len: int
 
 
+_log = logging.getLogger(__name__)
+
 _re_heading = re.compile(r"^(#{1,6})\s+(.*)$")
 
 
@@ -19,12 +26,77 @@ def _approx_tokens(text: str) -> int:
     return max(1, len(text) // 4)
 
 
+@lru_cache(maxsize=8)
+def token_counter(name: str) -> Callable[[str], int]:
+    """Token counting function for `CONTEXT6_CHUNK_TOKENIZER`.
+
+    `approx` (default) is the chars/4 heuristic; `tiktoken[:<encoding>]` and `hf:<model>` use real tokenizers
+    (optional dependencies). Falls back to `approx` if the library is missing or the tokenizer cannot be
+    loaded (e.g. its vocabulary download fails offline). Cached per process, so the fallback is logged once.
+    """
+    name = (name or "approx").strip()
+    try:
+        if name == "tiktoken" or name.startswith("tiktoken:"):
+            import tiktoken  # type: ignore[import-not-found]
+
+            enc = tiktoken.get_encoding(name.partition(":")[2] or "cl100k_base")
+            return lambda text: max(1, len(enc.encode(text, disallowed_special=())))
+        if name.startswith("hf:"):
+            from tokenizers import Tokenizer  # type: ignore[import-not-found]
+
+            tok = Tokenizer.from_pretrained(name[3:])
+            return lambda text: max(1, len(tok.encode(text, add_special_tokens=False).ids))
+    except Exception as e:
+        _log.warning("chunk tokenizer %r unavailable, using approx: %s", name, e)
+    return _approx_tokens
+
+
+@dataclass(frozen=True)
+class ChunkerConfig:
+    mode: str = "fixed"  # fixed | cdc
+    tokenizer: str = "approx"
+    target_chunk_tokens: int = 400
+    max_chunk_tokens: int = 800
+
+
+def load_chunker_cfg_from_env() -> ChunkerConfig:
+    mode = os.getenv("CONTEXT6_CHUNKER", "fixed").strip().lower() or "fixed"
+    if mode not in ("fixed", "cdc"):
+        raise ValueError(f"Unsupported CONTEXT6_CHUNKER: {mode}")
+    return ChunkerConfig(
+        mode=mode,
+        tokenizer=os.getenv("CONTEXT6_CHUNK_TOKENIZER", "approx").strip() or "approx",
+        target_chunk_tokens=int(os.getenv("CONTEXT6_CHUNK_TARGET_TOKENS", "400")),
+        max_chunk_tokens=int(os.getenv("CONTEXT6_CHUNK_MAX_TOKENS", "800")),
+    )
+
+
+def chunk_document(*, markdown: str, cfg: ChunkerConfig) -> list[Chunk]:
+    count = token_counter(cfg.tokenizer)
+    if cfg.mode == "cdc":
+        return list(
+            iter_chunks_cdc(
+                markdown=markdown,
+                target_chunk_tokens=cfg.target_chunk_tokens,
+                max_chunk_tokens=cfg.max_chunk_tokens,
+                count_tokens=count,
+            )
+        )
+    return chunk_markdown(
+        markdown=markdown,
+        target_chunk_tokens=cfg.target_chunk_tokens,
+        max_chunk_tokens=cfg.max_chunk_tokens,
+        count_tokens=count,
+    )
+
+
 def chunk_markdown(
     *,
     markdown: str,
     target_chunk_tokens: int = 400,
     max_chunk_tokens: int = 800,
     overlap_tokens: int = 60,
+    count_tokens: Callable[[str], int] = _approx_tokens,
 ) -> list[Chunk]:
     lines = markdown.splitlines()
     heading_stack: list[tuple[int, str]] = []
@@ -54,7 +126,7 @@ def chunk_markdown(
             overlap: list[str] = []
             tok = 0
             for line in reversed(buf):
-                tok += _approx_tokens(line + "\n")
+                tok += count_tokens(line + "\n")
                 overlap.append(line)
                 if tok >= overlap_tokens:
                     break
@@ -82,7 +154,7 @@ def chunk_markdown(
             continue
 
         # preserve empty lines as paragraph boundaries
-        tok = _approx_tokens(line + "\n")
+        tok = count_tokens(line + "\n")
         if buf_tokens + tok > max_chunk_tokens and buf:
             flush()
             # carry overlap into next buffer
@@ -102,3 +174,110 @@ def chunk_markdown(
     flush()
     return [c for c in chunks if c.text.strip()]
 
+
+# Content-defined cut: ~1 in 4 paragraphs qualifies once a chunk has its minimum size.
+_CDC_CUT_MODULUS = 4
+
+
+def _is_cut_point(unit: str) -> bool:
+    h = hashlib.blake2b(unit.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(h, "little") % _CDC_CUT_MODULUS == 0
+
+
+def _split_line(line: str, max_tokens: int, count_tokens: Callable[[str], int]) -> Iterator[str]:
+    """Split one over-long line into pieces of at most `max_tokens`, preferring whitespace boundaries."""
+    rest = line.strip()
+    while rest:
+        if count_tokens(rest) <= max_tokens:
+            yield rest
+            return
+        lo, hi = 1, len(rest)  # longest prefix that fits (a single char always goes through)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if count_tokens(rest[:mid]) <= max_tokens:
+                lo = mid
+            else:
+                hi = mid - 1
+        cut = rest.rfind(" ", 0, lo + 1)
+        if cut <= 0:
+            cut = lo
+        yield rest[:cut].strip()
+        rest = rest[cut:].strip()
+
+
+def iter_chunks_cdc(
+    *,
+    markdown: str,
+    target_chunk_tokens: int = 400,
+    max_chunk_tokens: int = 800,
+    count_tokens: Callable[[str], int] = _approx_tokens,
+) -> Iterator[Chunk]:
+    """Heading-anchored, content-defined chunking (streaming).
+
+    Headings always start a new chunk. Within a section, paragraphs are accumulated and a chunk ends after
+    a paragraph whose own hash is a cut point (once `target_chunk_tokens // 2` is reached) or when
+    `max_chunk_tokens` would be exceeded. Boundaries depend only on nearby content, so an edit early in a
+    document only changes the chunks around it. A single line above `max_chunk_tokens` is split on word (or
+    character) boundaries, so no chunk exceeds the cap. No overlap: copied neighbour text would make chunk texts
+    (and content-addressed chunk IDs) depend on their neighbours.
+    """
+    min_tokens = max(1, target_chunk_tokens // 2)
+    heading_stack: list[tuple[int, str]] = []
+    buf: list[str] = []
+    buf_tokens = 0
+
+    def heading_path() -> str:
+        return " > ".join(h for _, h in heading_stack)
+
+    def flush() -> Iterator[Chunk]:
+        nonlocal buf, buf_tokens
+        text = "\n\n".join(buf).strip()
+        buf, buf_tokens = [], 0
+        if text:
+            yield Chunk(heading_path=heading_path(), text=text + "\n", char_len=len(text))
+
+    def units(lines: list[str]) -> Iterator[str]:
+        # Oversized paragraphs are split at line boundaries (same cut rule, applied per line), oversized lines
+        # within the line.
+        para = "\n".join(lines).strip()
+        if not para:
+            return
+        if count_tokens(para) <= max_chunk_tokens:
+            yield para
+            return
+        for ln in lines:
+            yield from _split_line(ln, max_chunk_tokens, count_tokens)
+
+    def add(unit: str) -> Iterator[Chunk]:
+        nonlocal buf_tokens
+        tok = count_tokens(unit)
+        if buf and buf_tokens + tok > max_chunk_tokens:
+            yield from flush()
+        buf.append(unit)
+        buf_tokens += tok
+        if buf_tokens >= min_tokens and _is_cut_point(unit):
+            yield from flush()
+
+    para: list[str] = []
+    for raw in markdown.splitlines():
+        line = raw.rstrip()
+        m = _re_heading.match(line)
+        if m:
+            for u in units(para):
+                yield from add(u)
+            para = []
+            yield from flush()
+            level = len(m.group(1))
+            while heading_stack and heading_stack[-1][0] >= level:
+                heading_stack.pop()
+            heading_stack.append((level, m.group(2).strip()))
+            continue
+        if not line.strip():
+            for u in units(para):
+                yield from add(u)
+            para = []
+            continue
+        para.append(line)
+    for u in units(para):
+        yield from add(u)
+    yield from flush()
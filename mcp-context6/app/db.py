@@ -6,6 +6,7 @@ from pathlib import Path
 
 
 SCHEMA_SQL = """
+PRAGMA auto_vacuum=INCREMENTAL;
 PRAGMA journal_mode=WAL;
 PRAGMA synchronous=NORMAL;
 PRAGMA foreign_keys=ON;
@@ -57,7 +58,8 @@ CREATE TABLE IF NOT EXISTS chunks (
   text_hash TEXT NOT NULL,
   text TEXT NOT NULL,
   heading_path TEXT NOT NULL,
-  char_len INTEGER NOT NULL
+  char_len INTEGER NOT NULL,
+  title TEXT
 );
 
 CREATE TABLE IF NOT EXISTS chunk_versions (
@@ -69,20 +71,12 @@ CREATE TABLE IF NOT EXISTS chunk_versions (
   PRIMARY KEY (snapshot_id, chunk_id)
 );
 
-CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
-  chunk_id UNINDEXED,
-  doc_id UNINDEXED,
-  title,
-  heading_path,
-  text,
-  tokenize='porter'
-);
-
 CREATE TABLE IF NOT EXISTS embeddings (
   chunk_id TEXT NOT NULL REFERENCES chunks(chunk_id) ON DELETE CASCADE,
   model TEXT NOT NULL,
   dim INTEGER NOT NULL,
   created_at_utc TEXT NOT NULL,
+  vector BLOB,
   PRIMARY KEY(chunk_id, model, dim)
 );
 
@@ -93,9 +87,23 @@ CREATE TABLE IF NOT EXISTS owui_uploads (
   content_hash TEXT NOT NULL,
   file_id TEXT NOT NULL,
   created_at_utc TEXT NOT NULL,
+  state TEXT NOT NULL DEFAULT 'added',
+  error TEXT,
+  updated_at_utc TEXT,
   PRIMARY KEY(snapshot_id, doc_id, knowledge_id)
 );
 
+CREATE TABLE IF NOT EXISTS crawl_cache (
+  source_id TEXT NOT NULL REFERENCES sources(source_id) ON DELETE CASCADE,
+  url TEXT NOT NULL,
+  doc_id TEXT NOT NULL,
+  etag TEXT,
+  last_modified TEXT,
+  links_json TEXT NOT NULL,
+  fetched_at_utc TEXT NOT NULL,
+  PRIMARY KEY(source_id, url)
+);
+
 CREATE TABLE IF NOT EXISTS jobs (
   job_id TEXT PRIMARY KEY,
   source_id TEXT NOT NULL,
@@ -112,6 +120,45 @@ CREATE TABLE IF NOT EXISTS jobs (
 );
 """
 
+# External-content FTS over `chunks`, kept in sync by triggers (no separate FTS writes during ingest).
+# content_rowid is the implicit rowid of `chunks`; after a VACUUM run `INSERT INTO chunks_fts(chunks_fts) VALUES('rebuild')`.
+FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+  chunk_id UNINDEXED,
+  doc_id UNINDEXED,
+  title,
+  heading_path,
+  text,
+  content='chunks',
+  content_rowid='rowid',
+  tokenize='porter'
+);
+
+CREATE TRIGGER IF NOT EXISTS chunks_fts_ai AFTER INSERT ON chunks BEGIN
+  INSERT INTO chunks_fts(rowid, chunk_id, doc_id, title, heading_path, text)
+  VALUES (new.rowid, new.chunk_id, new.doc_id, new.title, new.heading_path, new.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_fts_ad AFTER DELETE ON chunks BEGIN
+  INSERT INTO chunks_fts(chunks_fts, rowid, chunk_id, doc_id, title, heading_path, text)
+  VALUES ('delete', old.rowid, old.chunk_id, old.doc_id, old.title, old.heading_path, old.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_fts_au AFTER UPDATE OF title, heading_path, text ON chunks BEGIN
+  INSERT INTO chunks_fts(chunks_fts, rowid, chunk_id, doc_id, title, heading_path, text)
+  VALUES ('delete', old.rowid, old.chunk_id, old.doc_id, old.title, old.heading_path, old.text);
+  INSERT INTO chunks_fts(rowid, chunk_id, doc_id, title, heading_path, text)
+  VALUES (new.rowid, new.chunk_id, new.doc_id, new.title, new.heading_path, new.text);
+END;
+"""
+
+INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS idx_chunk_versions_chunk_id ON chunk_versions(chunk_id, snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_document_versions_doc_id ON document_versions(doc_id);
+CREATE INDEX IF NOT EXISTS idx_chunks_doc_id ON chunks(doc_id);
+CREATE INDEX IF NOT EXISTS idx_owui_uploads_doc ON owui_uploads(doc_id, knowledge_id, content_hash);
+"""
+
 
 @dataclass(frozen=True)
 class Db:
@@ -136,6 +183,39 @@ def init_db(db_path: str) -> Db:
             conn.execute("ALTER TABLE jobs ADD COLUMN knowledge_id TEXT")
         if "knowledge_name" not in cols:
             conn.execute("ALTER TABLE jobs ADD COLUMN knowledge_name TEXT")
+        cols = {r["name"] for r in conn.execute("PRAGMA table_info(embeddings)").fetchall()}
+        if "vector" not in cols:
+            conn.execute("ALTER TABLE embeddings ADD COLUMN vector BLOB")
+        cols = {r["name"] for r in conn.execute("PRAGMA table_info(owui_uploads)").fetchall()}
+        if "state" not in cols:
+            # Rows written before per-document state existed were only inserted once the doc was added.
+            conn.execute("ALTER TABLE owui_uploads ADD COLUMN state TEXT NOT NULL DEFAULT 'added'")
+            conn.execute("ALTER TABLE owui_uploads ADD COLUMN error TEXT")
+            conn.execute("ALTER TABLE owui_uploads ADD COLUMN updated_at_utc TEXT")
+        cols = {r["name"] for r in conn.execute("PRAGMA table_info(chunks)").fetchall()}
+        if "title" not in cols:
+            conn.execute("ALTER TABLE chunks ADD COLUMN title TEXT")
+            conn.execute(
+                "UPDATE chunks SET title = (SELECT cv.title FROM chunk_versions cv "
+                "JOIN snapshots s ON s.snapshot_id = cv.snapshot_id WHERE cv.chunk_id = chunks.chunk_id "
+                "ORDER BY s.started_at_utc DESC LIMIT 1)"
+            )
+        # Pre-existing standalone FTS table: replace with the external-content one and rebuild from `chunks`.
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='chunks_fts'").fetchone()
+        rebuild_fts = row is not None and "content=" not in str(row["sql"])
+        if rebuild_fts:
+            conn.execute("DROP TABLE chunks_fts")
+        conn.commit()
+        conn.executescript(FTS_SQL)
+        # auto_vacuum only takes effect on new DBs or after one full VACUUM; gc then runs incremental_vacuum.
+        if int(conn.execute("PRAGMA auto_vacuum").fetchone()[0]) != 2:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+            rebuild_fts = True  # VACUUM may renumber chunks.rowid (the FTS content_rowid)
+        if rebuild_fts:
+            conn.execute("INSERT INTO chunks_fts(chunks_fts) VALUES('rebuild')")
+        # Secondary indexes for chunk/doc lookups (the composite PKs lead with snapshot_id).
+        conn.executescript(INDEXES_SQL)
         conn.commit()
     finally:
         conn.close()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import re
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+
+class Embedder(Protocol):
+    model: str
+    dim: int
+
+    def embed(self, texts: list[str]) -> list[list[float]]: ...
+
+
+def pack_vector(vec: list[float]) -> bytes:
+    return array("f", vec).tobytes()
+
+
+def unpack_vector(blob: bytes) -> list[float]:
+    arr = array("f")
+    arr.frombytes(blob)
+    return arr.tolist()
+
+
+def _l2_normalize(vec: list[float]) -> list[float]:
+    norm = math.sqrt(sum(v * v for v in vec))
+    if norm == 0.0:
+        return vec
+    return [v / norm for v in vec]
+
+
+_TOKEN_RE = re.compile(r"[0-9A-Za-zÀ-ÿ_]+")
+
+
+@dataclass
+class HashingEmbedder:
+    """Dependency-free feature-hashing embedder (unigrams + bigrams).
+
+    Not semantic, but deterministic and fast; used when no model backend is installed and for local testing.
+    """
+
+    dim: int = 256
+    model: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.model = f"hash-v1-{self.dim}"
+
+    def _embed_one(self, text: str) -> list[float]:
+        vec = [0.0] * self.dim
+        tokens = [t.lower() for t in _TOKEN_RE.findall(text)]
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for g in grams:
+            h = hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest()
+            idx = int.from_bytes(h[:4], "little") % self.dim
+            vec[idx] += 1.0 if h[4] & 1 else -1.0
+        return _l2_normalize(vec)
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed_one(t) for t in texts]
+
+
+class FastEmbedEmbedder:
+    """Local CPU embedder via `fastembed` (ONNX runtime; optional dependency)."""
+
+    def __init__(self, *, model: str, batch_size: int, cache_dir: str | None = None) -> None:
+        from fastembed import TextEmbedding  # type: ignore[import-not-found]
+
+        self.model = model
+        self._batch_size = batch_size
+        self._impl: Any = TextEmbedding(model_name=model, cache_dir=cache_dir)
+        probe = next(iter(self._impl.embed(["dim probe"], batch_size=1)))
+        self.dim = int(len(probe))
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        return [_l2_normalize([float(x) for x in v]) for v in self._impl.embed(texts, batch_size=self._batch_size)]
+
+
+@dataclass(frozen=True)
+class EmbeddingConfig:
+    backend: str
+    model: str
+    batch_size: int
+
+
+def load_embedding_cfg_from_env() -> EmbeddingConfig:
+    return EmbeddingConfig(
+        backend=os.getenv("CONTEXT6_EMBEDDER", "off").strip().lower(),
+        model=os.getenv("CONTEXT6_EMBED_MODEL", "BAAI/bge-small-en-v1.5").strip(),
+        batch_size=max(1, int(os.getenv("CONTEXT6_EMBED_BATCH_SIZE", "64"))),
+    )
+
+
+def load_embedder(cfg: EmbeddingConfig, *, cache_dir: str | None = None) -> Embedder | None:
+    if cfg.backend in ("", "off", "none", "false", "0"):
+        return None
+    if cfg.backend == "hash":
+        return HashingEmbedder()
+    if cfg.backend == "fastembed":
+        try:
+            return FastEmbedEmbedder(model=cfg.model, batch_size=cfg.batch_size, cache_dir=cache_dir)
+        except ImportError:
+            # Optional dependency missing: keep search working (FTS only) instead of failing startup.
+            return None
+    raise ValueError(f"Unsupported CONTEXT6_EMBEDDER: {cfg.backend}")
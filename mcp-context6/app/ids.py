@@ -19,6 +19,11 @@ def chunk_id(*, doc_id: str, chunk_index: int, text_hash: str) -> str:
     return sha256_hex(f"{doc_id}:{chunk_index}:{text_hash}")
 
 
+def content_chunk_id(*, doc_id: str, text_hash: str, occurrence: int) -> str:
+    # Position-independent: the n-th chunk with this text in the document (n only matters for duplicates).
+    return sha256_hex(f"{doc_id}:c:{text_hash}:{occurrence}")
+
+
 def snapshot_id(*, source_id: str, resolved_ref: str, started_at_utc: str) -> str:
     return sha256_hex(f"{source_id}:{resolved_ref}:{started_at_utc}")
 
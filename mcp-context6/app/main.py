@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 import os
+from functools import partial
 from pathlib import Path
 from typing import Any
 
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
+from .chunking import load_chunker_cfg_from_env
 from .db import init_db
-from .mcp_rpc import handle_mcp_request
+from .embeddings import load_embedder, load_embedding_cfg_from_env
+from .mcp_rpc import ToolCallPool, handle_mcp_request, parse_tool_limits
 from .service import Context6Paths, Context6Service
+from .vector_index import make_vector_index
 
 
 def _make_app() -> FastAPI:
@@ -20,7 +25,27 @@ def _make_app() -> FastAPI:
     cache_dir.mkdir(parents=True, exist_ok=True)
 
     db = init_db(str(paths.db_path))
-    svc = Context6Service(db=db, paths=paths)
+    embedder = load_embedder(load_embedding_cfg_from_env(), cache_dir=str(cache_dir / "models"))
+    vector_index = make_vector_index(db=db, model=embedder.model, dim=embedder.dim) if embedder else None
+    # Default: one normalize process per core; on a single core the pool only adds IPC overhead.
+    normalize_workers = os.getenv("CONTEXT6_NORMALIZE_WORKERS", "").strip()
+    cores = os.cpu_count() or 1
+    svc = Context6Service(
+        db=db,
+        paths=paths,
+        embedder=embedder,
+        vector_index=vector_index,
+        normalize_workers=int(normalize_workers) if normalize_workers else (cores if cores > 1 else 0),
+        chunker=load_chunker_cfg_from_env(),
+        keep_snapshots=int(os.getenv("CONTEXT6_KEEP_SNAPSHOTS", "10")),
+        search_cache_size=int(os.getenv("CONTEXT6_SEARCH_CACHE_SIZE", "256")),
+        owui_workers=int(os.getenv("CONTEXT6_OWUI_UPLOAD_WORKERS", "4")),
+    )
+    pool = ToolCallPool(
+        max_workers=int(os.getenv("CONTEXT6_MCP_WORKERS", "8")),
+        tool_limits=parse_tool_limits(os.getenv("CONTEXT6_MCP_TOOL_LIMITS", "search=4,owui.knowledge.create=1")),
+        call_ttl_s=int(os.getenv("CONTEXT6_MCP_CALL_TTL_SECONDS", "3600")),
+    )
 
     app = FastAPI(title="context6", version="0.1.0")
 
@@ -30,7 +55,9 @@ def _make_app() -> FastAPI:
 
     @app.post("/mcp")
     async def mcp(payload: dict[str, Any]) -> JSONResponse:
-        res = handle_mcp_request(svc=svc, payload=payload)
+        # Tool calls do blocking SQLite/HTTP work; keep them off the event loop.
+        loop = asyncio.get_running_loop()
+        res = await loop.run_in_executor(pool.executor, partial(handle_mcp_request, svc=svc, payload=payload, pool=pool))
         return JSONResponse(res)
 
     return app
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable
 
 from fastapi import HTTPException
 
@@ -12,6 +17,7 @@ from .models import (
     KnowledgeCreateRequest,
     KnowledgeListRequest,
     SearchRequest,
+    SnapshotsGcRequest,
     SnapshotsListRequest,
     SourcesCreateRequest,
     SyncPrepareRequest,
@@ -19,6 +25,7 @@ from .models import (
     SyncStatusRequest,
 )
 from .service import Context6Service, ToolUserError
+from .time_utils import now_utc_iso
 
 
 @dataclass(frozen=True)
@@ -54,10 +61,11 @@ def _capabilities_markdown() -> str:
             "- `snapshots.list` — Snapshots anzeigen",
             "- `search` — Suche über Chunks",
             "- `get_chunk` / `get_doc` — Inhalte holen",
+            "- `calls.status` — Status/Ergebnis eines Tool-Calls mit `async: true`",
             "",
             "Hinweis:",
             "- Volltexte bleiben SSOT in SQLite/Files.",
-            "- `search` ist lokale SQLite-FTS Suche (keine Vektor-DB).",
+            "- `search` ist lokale SQLite-FTS Suche; optional (CONTEXT6_EMBEDDER) zusätzlich Dense-Vektoren (Qdrant oder in-process), per RRF fusioniert.",
             "- Optional kann `sync.start` mit `knowledge_id` oder `knowledge_name` die Docs in Open WebUI Knowledge hochladen (Open WebUI übernimmt Processing/Embeddings).",
         ]
     )
@@ -163,15 +171,26 @@ TOOLS: list[ToolDef] = [
         description="List snapshots for a source",
         input_schema=_simple_schema(props={"source_id": {"type": "string"}, "limit": {"type": "integer"}}, required=["source_id"]),
     ),
+    ToolDef(
+        name="snapshots.gc",
+        description="Apply snapshot retention (keep last N per source) and garbage-collect orphaned chunks, docs and files",
+        input_schema=_simple_schema(props={"source_id": {"type": "string"}, "keep": {"type": "integer"}}),
+    ),
     ToolDef(
         name="search",
-        description="Search over indexed chunks (SQLite FTS)",
+        description="Search over indexed chunks (SQLite FTS, fused with dense vectors when embeddings are enabled)",
         input_schema=_simple_schema(
             props={
                 "query": {"type": "string"},
                 "top_k": {"type": "integer"},
                 "source_id": {"type": "string"},
                 "snapshot_id": {"type": "string"},
+                "match": {
+                    "type": "string",
+                    "enum": ["auto", "all", "any", "raw"],
+                    "description": "auto: all terms, topped up with any-term hits; raw: FTS5 syntax as-is",
+                },
+                "prefix": {"type": "boolean", "description": "Match terms as prefixes"},
             },
             required=["query"],
         ),
@@ -186,10 +205,218 @@ TOOLS: list[ToolDef] = [
         description="Get a document by doc_id",
         input_schema=_simple_schema(props={"doc_id": {"type": "string"}}, required=["doc_id"]),
     ),
+    ToolDef(
+        name="calls.status",
+        description="Get state/result of a tool call started with `async: true` (any tool accepts it)",
+        input_schema=_simple_schema(props={"call_id": {"type": "string"}}, required=["call_id"]),
+    ),
 ]
 
+_TOOL_NAMES = frozenset(t.name for t in TOOLS)
+
+
+class InvalidParamsError(ValueError):
+    """Malformed tool arguments; answered with JSON-RPC `-32602`."""
+
+
+def parse_async_flag(args: dict[str, Any]) -> bool:
+    """Pop the `async` tool argument: a JSON bool, or "true"/"false"/"1"/"0" from clients that send strings."""
+    value = args.pop("async", None)
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    flag = str(value).strip().lower() if isinstance(value, str) else None
+    if flag in ("true", "1"):
+        return True
+    if flag in ("false", "0"):
+        return False
+    raise InvalidParamsError(f"`async` must be a boolean, got {value!r}")
+
+
+def parse_tool_limits(raw: str) -> dict[str, int]:
+    """Per-tool concurrency limits from `name=n,name=n` (invalid entries are ignored, limits are at least 1)."""
+    limits: dict[str, int] = {}
+    for part in (raw or "").split(","):
+        name, sep, value = part.partition("=")
+        if not sep or not name.strip():
+            continue
+        try:
+            limits[name.strip()] = max(1, int(value.strip()))
+        except ValueError:
+            continue
+    return limits
+
+
+class ToolCallPool:
+    """Worker pools for tool calls: bounded threads, per-tool limits and in-memory async calls.
+
+    Request dispatch (`executor`) and async calls use separate pools. An async call over its tool limit waits in a
+    per-tool queue instead of parking a worker thread, so a busy tool never blocks `calls.status` or other requests.
+    """
+
+    def __init__(self, *, max_workers: int, tool_limits: dict[str, int], call_ttl_s: int) -> None:
+        workers = max(1, max_workers)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mcp-tool")
+        self._call_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mcp-call")
+        self._limits = {name: max(1, n) for name, n in tool_limits.items()}
+        self._slots = threading.Condition()  # guards _active/_pending
+        self._active: dict[str, int] = {}
+        self._pending: dict[str, deque[tuple[str, Callable[[], Any]]]] = {}
+        self._ttl_s = call_ttl_s
+        self._lock = threading.Lock()
+        self._calls: dict[str, dict[str, Any]] = {}
+
+    def run(self, name: str, fn: Callable[[], Any]) -> Any:
+        limit = self._limits.get(name)
+        if limit is None:
+            return fn()
+        with self._slots:
+            while self._active.get(name, 0) >= limit:
+                self._slots.wait()
+            self._active[name] = self._active.get(name, 0) + 1
+        try:
+            return fn()
+        finally:
+            self._release(name)
+
+    def submit(self, name: str, fn: Callable[[], Any]) -> dict[str, Any]:
+        call_id = uuid.uuid4().hex
+        with self._lock:
+            self._prune(time.time())
+            self._calls[call_id] = {"call_id": call_id, "tool": name, "state": "queued", "created_at_utc": now_utc_iso()}
+        limit = self._limits.get(name)
+        if limit is not None:
+            with self._slots:
+                if self._active.get(name, 0) >= limit:
+                    self._pending.setdefault(name, deque()).append((call_id, fn))
+                    return {"call_id": call_id, "tool": name, "state": "queued"}
+                self._active[name] = self._active.get(name, 0) + 1
+        self._call_executor.submit(self._run_call, call_id, name, fn)
+        return {"call_id": call_id, "tool": name, "state": "queued"}
+
+    def status(self, call_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            self._prune(time.time())
+            call = self._calls.get(call_id)
+            return {k: v for k, v in call.items() if k != "finished_ts"} if call else None
 
-def handle_mcp_request(*, svc: Context6Service, payload: dict[str, Any]) -> dict[str, Any]:
+    def _run_call(self, call_id: str, name: str, fn: Callable[[], Any]) -> None:
+        with self._lock:
+            self._calls[call_id].update({"state": "running", "started_at_utc": now_utc_iso()})
+        try:
+            update: dict[str, Any] = {"state": "finished", "result": fn()}
+        except Exception as e:
+            update = {"state": "failed", "error": str(e), "data": getattr(e, "data", None)}
+        finally:
+            if name in self._limits:
+                self._release(name)
+        update.update({"finished_at_utc": now_utc_iso(), "finished_ts": time.time()})
+        with self._lock:
+            self._calls[call_id].update(update)
+
+    def _release(self, name: str) -> None:
+        with self._slots:
+            queue = self._pending.get(name)
+            # A queued async call takes over the slot; otherwise free it for waiting synchronous calls.
+            nxt = queue.popleft() if queue else None
+            if nxt is None:
+                self._active[name] -= 1
+            self._slots.notify_all()
+        if nxt is not None:
+            self._call_executor.submit(self._run_call, nxt[0], name, nxt[1])
+
+    def _prune(self, now: float) -> None:
+        expired = [
+            cid for cid, c in self._calls.items() if c.get("finished_ts") is not None and now - c["finished_ts"] > self._ttl_s
+        ]
+        for cid in expired:
+            self._calls.pop(cid, None)
+
+
+def _call_tool(svc: Context6Service, name: str, args: dict[str, Any]) -> dict[str, Any] | None:
+    """Run one tool and return its MCP result payload (None = unknown tool)."""
+    if name == "capabilities.get":
+        max_chars_raw = (args or {}).get("max_chars")
+        try:
+            max_chars = int(max_chars_raw) if max_chars_raw is not None else 2000
+        except Exception:
+            max_chars = 2000
+        return {"content": [{"type": "text", "text": _truncate_text(_capabilities_markdown(), max_chars)}]}
+    if name == "sources.create":
+        req = SourcesCreateRequest.model_validate(args)
+        res = svc.create_source(req)
+        return {"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]}
+    if name == "sources.list":
+        res = {"sources": svc.list_sources()}
+        return {"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]}
+    if name == "sources.delete":
+        sid = str(args.get("source_id", "")).strip()
+        if not sid:
+            raise ValueError("source_id required")
+        res = svc.delete_source(sid)
+        return {"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]}
+    if name == "sync.start":
+        req = SyncStartRequest.model_validate(args)
+        res = svc.start_sync(
+            source_id=req.source_id,
+            mode=req.mode,
+            knowledge_id=req.knowledge_id,
+            knowledge_name=req.knowledge_name,
+            create_knowledge_if_missing=req.create_knowledge_if_missing,
+        )
+        return {"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]}
+    if name == "sync.prepare":
+        req = SyncPrepareRequest.model_validate(args)
+        res = svc.sync_prepare(source_id=req.source_id)
+        return {"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]}
+    if name == "sync.status":
+        req = SyncStatusRequest.model_validate(args)
+        res = svc.get_job(req.job_id)
+        if not res:
+            return {"content": [{"type": "text", "text": json.dumps({"error": "job not found"})}]}
+        return {"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]}
+    if name == "owui.knowledge.list":
+        req = KnowledgeListRequest.model_validate(args)
+        res = svc.owui_list_knowledge(query=req.query, limit=req.limit)
+        return {"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]}
+    if name == "owui.knowledge.create":
+        req = KnowledgeCreateRequest.model_validate(args)
+        res = svc.owui_create_knowledge(name=req.name, description=req.description)
+        return {"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]}
+    if name == "snapshots.list":
+        req = SnapshotsListRequest.model_validate(args)
+        res = {"snapshots": svc.list_snapshots(source_id=req.source_id, limit=req.limit)}
+        return {"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]}
+    if name == "snapshots.gc":
+        req = SnapshotsGcRequest.model_validate(args)
+        res = svc.gc(source_id=req.source_id, keep=req.keep)
+        return {"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]}
+    if name == "search":
+        req = SearchRequest.model_validate(args)
+        res = {
+            "results": svc.search(
+                query=req.query,
+                top_k=req.top_k,
+                source_id=req.source_id,
+                snapshot_id=req.snapshot_id,
+                match=req.match,
+                prefix=req.prefix,
+            )
+        }
+        return {"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]}
+    if name == "get_chunk":
+        req = GetChunkRequest.model_validate(args)
+        res = svc.get_chunk(req.chunk_id)
+        return {"content": [{"type": "text", "text": json.dumps(res or {"error": "not found"}, ensure_ascii=False)}]}
+    if name == "get_doc":
+        req = GetDocRequest.model_validate(args)
+        res = svc.get_doc(req.doc_id)
+        return {"content": [{"type": "text", "text": json.dumps(res or {"error": "not found"}, ensure_ascii=False)}]}
+    return None
+
+
+def handle_mcp_request(
+    *, svc: Context6Service, payload: dict[str, Any], pool: ToolCallPool | None = None
+) -> dict[str, Any]:
     jsonrpc = payload.get("jsonrpc")
     if jsonrpc != "2.0":
         raise HTTPException(status_code=400, detail="invalid jsonrpc")
@@ -226,77 +453,33 @@ def handle_mcp_request(*, svc: Context6Service, payload: dict[str, Any]) -> dict
             )
 
         if method == "tools/call":
-            name = params.get("name")
-            args = params.get("arguments") or {}
-
-            if name == "capabilities.get":
-                max_chars_raw = (args or {}).get("max_chars")
-                try:
-                    max_chars = int(max_chars_raw) if max_chars_raw is not None else 2000
-                except Exception:
-                    max_chars = 2000
-                return ok({"content": [{"type": "text", "text": _truncate_text(_capabilities_markdown(), max_chars)}]})
-            if name == "sources.create":
-                req = SourcesCreateRequest.model_validate(args)
-                res = svc.create_source(req)
-                return ok({"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]})
-            if name == "sources.list":
-                res = {"sources": svc.list_sources()}
-                return ok({"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]})
-            if name == "sources.delete":
-                sid = str(args.get("source_id", "")).strip()
-                if not sid:
-                    raise ValueError("source_id required")
-                res = svc.delete_source(sid)
-                return ok({"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]})
-            if name == "sync.start":
-                req = SyncStartRequest.model_validate(args)
-                res = svc.start_sync(
-                    source_id=req.source_id,
-                    mode=req.mode,
-                    knowledge_id=req.knowledge_id,
-                    knowledge_name=req.knowledge_name,
-                    create_knowledge_if_missing=req.create_knowledge_if_missing,
-                )
-                return ok({"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]})
-            if name == "sync.prepare":
-                req = SyncPrepareRequest.model_validate(args)
-                res = svc.sync_prepare(source_id=req.source_id)
-                return ok({"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]})
-            if name == "sync.status":
-                req = SyncStatusRequest.model_validate(args)
-                res = svc.get_job(req.job_id)
-                if not res:
-                    return ok({"content": [{"type": "text", "text": json.dumps({"error": "job not found"})}]})
-                return ok({"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]})
-            if name == "owui.knowledge.list":
-                req = KnowledgeListRequest.model_validate(args)
-                res = svc.owui_list_knowledge(query=req.query, limit=req.limit)
-                return ok({"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]})
-            if name == "owui.knowledge.create":
-                req = KnowledgeCreateRequest.model_validate(args)
-                res = svc.owui_create_knowledge(name=req.name, description=req.description)
-                return ok({"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]})
-            if name == "snapshots.list":
-                req = SnapshotsListRequest.model_validate(args)
-                res = {"snapshots": svc.list_snapshots(source_id=req.source_id, limit=req.limit)}
-                return ok({"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]})
-            if name == "search":
-                req = SearchRequest.model_validate(args)
-                res = {"results": svc.search(query=req.query, top_k=req.top_k, source_id=req.source_id, snapshot_id=req.snapshot_id)}
+            name = str(params.get("name"))
+            args = dict(params.get("arguments") or {})
+            run_async = parse_async_flag(args)
+
+            if name == "calls.status":
+                call_id = str(args.get("call_id", "")).strip()
+                if not call_id:
+                    raise ValueError("call_id required")
+                res = pool.status(call_id) if pool is not None else None
+                return ok({"content": [{"type": "text", "text": json.dumps(res or {"error": "call not found"}, ensure_ascii=False)}]})
+            if name not in _TOOL_NAMES:
+                return err(-32601, f"unknown tool: {name}")
+            if run_async and pool is not None:
+                res = pool.submit(name, lambda: _call_tool(svc, name, args))
                 return ok({"content": [{"type": "text", "text": json.dumps(res, ensure_ascii=False)}]})
-            if name == "get_chunk":
-                req = GetChunkRequest.model_validate(args)
-                res = svc.get_chunk(req.chunk_id)
-                return ok({"content": [{"type": "text", "text": json.dumps(res or {"error": "not found"}, ensure_ascii=False)}]})
-            if name == "get_doc":
-                req = GetDocRequest.model_validate(args)
-                res = svc.get_doc(req.doc_id)
-                return ok({"content": [{"type": "text", "text": json.dumps(res or {"error": "not found"}, ensure_ascii=False)}]})
 
-            return err(-32601, f"unknown tool: {name}")
+            if pool is not None:
+                result = pool.run(name, lambda: _call_tool(svc, name, args))
+            else:
+                result = _call_tool(svc, name, args)
+            if result is None:
+                return err(-32601, f"unknown tool: {name}")
+            return ok(result)
 
         return err(-32601, f"unknown method: {method}")
+    except InvalidParamsError as e:
+        return err(-32602, "invalid params", {"message": str(e)})
     except ToolUserError as e:
         return err(-32000, "tool user error", {"message": str(e), "data": getattr(e, "data", {})})
     except Exception as e:
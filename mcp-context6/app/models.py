@@ -29,7 +29,8 @@ class LocalSourceConfig(BaseModel):
 class SourceLimits(BaseModel):
     max_pages_per_run: int = 100
     max_depth: int = 3
-    delay_seconds: float = 1.0
+    delay_seconds: float = 1.0  # crawl: per host
+    max_concurrency: int = 4  # crawl: requests in flight
     max_doc_size_mb: int = 10
     playwright_timeout_seconds: int = 20
 
@@ -105,11 +106,18 @@ class SnapshotsListRequest(BaseModel):
     limit: int = 10
 
 
+class SnapshotsGcRequest(BaseModel):
+    source_id: str | None = None
+    keep: int | None = None
+
+
 class SearchRequest(BaseModel):
     query: str
     top_k: int = 8
     source_id: str | None = None
     snapshot_id: str | None = None
+    match: Literal["auto", "all", "any", "raw"] = "auto"
+    prefix: bool = False
 
 
 class SearchResponse(BaseModel):
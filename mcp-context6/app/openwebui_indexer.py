@@ -83,18 +83,21 @@ def upload_markdown(*, cfg: OpenWebUIConfig, markdown: str, filename: str) -> st
     return str(file_id)
 
 
-def poll_processing(*, cfg: OpenWebUIConfig, file_id: str) -> dict[str, Any]:
+def get_processing_status(*, cfg: OpenWebUIConfig, file_id: str) -> dict[str, Any]:
     import requests
 
     url = f"{cfg.base_url}/api/v1/files/{file_id}/process/status"
-    headers = _auth_headers(cfg)
+    resp = requests.get(url, headers=_auth_headers(cfg), timeout=30)
+    if resp.status_code >= 400:
+        raise RuntimeError(f"openwebui process status failed: {resp.status_code} {resp.text}")
+    return resp.json()
+
+
+def poll_processing(*, cfg: OpenWebUIConfig, file_id: str) -> dict[str, Any]:
     deadline = time.time() + cfg.process_timeout_s
     last: dict[str, Any] = {}
     while time.time() < deadline:
-        resp = requests.get(url, headers=headers, timeout=30)
-        if resp.status_code >= 400:
-            raise RuntimeError(f"openwebui process status failed: {resp.status_code} {resp.text}")
-        last = resp.json()
+        last = get_processing_status(cfg=cfg, file_id=file_id)
         status = (last.get("status") or "").lower()
         if status in {"completed", "failed"}:
             return last
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from .db import Db
+from .openwebui_indexer import OpenWebUIConfig, add_to_knowledge, get_processing_status, upload_markdown
+from .time_utils import now_utc_iso
+
+
+# Per-document states in owui_uploads: uploaded -> processed -> added (or failed). A later sync of the same
+# knowledge resumes from `uploaded`/`processed` with the stored file_id instead of uploading again.
+_RESUMABLE_STATES = ("uploaded", "processed")
+
+
+@dataclass(frozen=True)
+class OwuiDoc:
+    doc_id: str
+    url_or_path: str
+    content_hash: str
+    filename: str
+    markdown: str  # rendered (frontmatter + body), ready to upload
+
+
+@dataclass
+class OwuiStageResult:
+    embedded: int = 0
+    skipped: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+
+class OwuiIndexStage:
+    """Concurrent Open WebUI indexing for one sync job.
+
+    Uploads and knowledge adds run on a bounded thread pool; a single poller thread checks the processing
+    status of all uploaded files every `poll_interval_s` (instead of one sleeping poll loop per document).
+    State is written per document to `owui_uploads` with short, separate transactions. With `reuse_added`
+    (incremental syncs) a doc already added with the same content is not uploaded again.
+    """
+
+    def __init__(
+        self,
+        *,
+        db: Db,
+        cfg: OpenWebUIConfig,
+        knowledge_id: str,
+        snapshot_id: str,
+        workers: int,
+        reuse_added: bool = False,
+    ) -> None:
+        self._db = db
+        self._cfg = cfg
+        self._knowledge_id = knowledge_id
+        self._snapshot_id = snapshot_id
+        self._workers = max(1, int(workers))
+        self._reuse_added = reuse_added
+        self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="owui")
+        self._result = OwuiStageResult()
+        self._cond = threading.Condition()
+        self._outstanding = 0
+        self._max_outstanding = self._workers * 4  # bounds rendered markdown held in memory
+        self._polling: dict[str, tuple[OwuiDoc, float]] = {}  # file_id -> (doc, deadline)
+        self._submitted: set[str] = set()
+        self._closed = False
+        self._poller = threading.Thread(target=self._poll_loop, name="owui-poller", daemon=True)
+        self._poller.start()
+
+    # --- public API -------------------------------------------------------------------------------------
+
+    def submit(self, doc: OwuiDoc) -> None:
+        """Queue one document; blocks while too many documents are in flight."""
+        with self._cond:
+            while self._outstanding >= self._max_outstanding:
+                self._cond.wait()
+            self._outstanding += 1
+            self._submitted.add(doc.doc_id)
+        try:
+            prev = self._previous(doc)
+        except Exception as e:
+            self._fail(doc, "", e)
+            return
+        if prev is not None and prev["state"] == "added":
+            try:
+                self._set_state(doc, state="added", file_id=str(prev["file_id"]))
+            except Exception as e:
+                self._fail(doc, str(prev["file_id"]), e)
+                return
+            self._finish(skipped=True)
+        elif prev is not None and prev["state"] == "processed":
+            self._schedule(self._add, doc, str(prev["file_id"]))
+        elif prev is not None and prev["state"] == "uploaded":
+            self._start_polling(doc, str(prev["file_id"]))
+        else:
+            self._schedule(self._upload, doc)
+
+    def resume_pending(self, *, source_id: str) -> None:
+        """Finish uploads interrupted in an earlier job for docs this job did not touch (e.g. skipped as
+        unchanged by an incremental sync), as long as the stored content is still the doc's latest version."""
+        conn = self._db.connect()
+        try:
+            marks = ",".join("?" for _ in _RESUMABLE_STATES)
+            rows = conn.execute(
+                "SELECT ou.doc_id, ou.content_hash, ou.file_id, ou.state, dv.url_or_path FROM owui_uploads ou "
+                "JOIN documents d ON d.doc_id = ou.doc_id "
+                "JOIN document_versions dv ON dv.doc_id = d.doc_id AND dv.snapshot_id = d.latest_snapshot_id "
+                f"WHERE d.source_id = ? AND ou.knowledge_id = ? AND ou.state IN ({marks}) "
+                "AND ou.content_hash = dv.content_hash AND ou.file_id != '' "
+                "ORDER BY ou.updated_at_utc DESC",
+                (source_id, self._knowledge_id, *_RESUMABLE_STATES),
+            ).fetchall()
+        finally:
+            conn.close()
+        seen: set[str] = set()
+        for r in rows:
+            did = str(r["doc_id"])
+            if did in seen or did in self._submitted:
+                continue
+            seen.add(did)
+            # markdown is not needed: the file is already in Open WebUI
+            self.submit(
+                OwuiDoc(doc_id=did, url_or_path=str(r["url_or_path"]), content_hash=str(r["content_hash"]), filename="", markdown="")
+            )
+
+    def close(self, *, abort: bool = False) -> OwuiStageResult:
+        """Wait for all queued documents (unless `abort`), stop the poller and return counts/errors."""
+        if not abort:
+            with self._cond:
+                while self._outstanding:
+                    self._cond.wait()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._pool.shutdown(wait=not abort, cancel_futures=abort)
+        self._poller.join(timeout=5)
+        return self._result
+
+    # --- stages -----------------------------------------------------------------------------------------
+
+    def _upload(self, doc: OwuiDoc) -> None:
+        try:
+            file_id = upload_markdown(cfg=self._cfg, markdown=doc.markdown, filename=doc.filename)
+            self._set_state(doc, state="uploaded", file_id=file_id)
+        except Exception as e:
+            self._fail(doc, "", e)
+            return
+        self._start_polling(doc, file_id)
+
+    def _start_polling(self, doc: OwuiDoc, file_id: str) -> None:
+        with self._cond:
+            self._polling[file_id] = (doc, time.time() + self._cfg.process_timeout_s)
+            self._cond.notify_all()
+
+    def _poll_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._polling and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                pending = list(self._polling.items())
+            for file_id, (doc, deadline) in pending:
+                try:
+                    status = get_processing_status(cfg=self._cfg, file_id=file_id)
+                except Exception as e:
+                    self._stop_polling(file_id)
+                    self._fail(doc, file_id, e)
+                    continue
+                state = (status.get("status") or "").lower()
+                if state == "completed":
+                    self._stop_polling(file_id)
+                    try:
+                        self._set_state(doc, state="processed", file_id=file_id)
+                    except Exception as e:
+                        self._fail(doc, file_id, e)
+                        continue
+                    self._schedule(self._add, doc, file_id)
+                elif state == "failed":
+                    self._stop_polling(file_id)
+                    self._fail(doc, file_id, RuntimeError(f"openwebui processing failed: {status}"))
+                elif time.time() > deadline:
+                    self._stop_polling(file_id)
+                    self._fail(doc, file_id, RuntimeError(f"openwebui process status timeout: {status}"))
+            # new uploads notify the condition; keep the full interval so they wait for the next pass
+            next_pass = time.monotonic() + self._cfg.poll_interval_s
+            with self._cond:
+                while not self._closed and (remaining := next_pass - time.monotonic()) > 0:
+                    self._cond.wait(timeout=remaining)
+                if self._closed:
+                    return
+
+    def _schedule(self, fn: Any, *args: Any) -> None:
+        # close() marks the stage closed under the condition before shutting the pool down
+        with self._cond:
+            if self._closed:
+                return  # aborted: the persisted per-doc state lets the next sync resume
+            self._pool.submit(fn, *args)
+
+    def _stop_polling(self, file_id: str) -> None:
+        with self._cond:
+            self._polling.pop(file_id, None)
+
+    def _add(self, doc: OwuiDoc, file_id: str) -> None:
+        try:
+            add_to_knowledge(cfg=self._cfg, knowledge_id=self._knowledge_id, file_id=file_id)
+            self._set_state(doc, state="added", file_id=file_id)
+        except Exception as e:
+            self._fail(doc, file_id, e)
+            return
+        self._finish(embedded=True)
+
+    # --- bookkeeping ------------------------------------------------------------------------------------
+
+    def _previous(self, doc: OwuiDoc) -> Any:
+        states = ("added", *_RESUMABLE_STATES) if self._reuse_added else _RESUMABLE_STATES
+        marks = ",".join("?" for _ in states)
+        conn = self._db.connect()
+        try:
+            return conn.execute(
+                "SELECT state, file_id FROM owui_uploads "
+                f"WHERE doc_id = ? AND knowledge_id = ? AND content_hash = ? AND file_id != '' AND state IN ({marks}) "
+                "ORDER BY CASE state WHEN 'added' THEN 0 WHEN 'processed' THEN 1 ELSE 2 END, updated_at_utc DESC "
+                "LIMIT 1",
+                (doc.doc_id, self._knowledge_id, doc.content_hash, *states),
+            ).fetchone()
+        finally:
+            conn.close()
+
+    def _set_state(self, doc: OwuiDoc, *, state: str, file_id: str, error: str | None = None) -> None:
+        now = now_utc_iso()
+        conn = self._db.connect()
+        try:
+            conn.execute(
+                "INSERT INTO owui_uploads(snapshot_id, doc_id, knowledge_id, content_hash, file_id, created_at_utc, state, error, updated_at_utc) "
+                "VALUES (?,?,?,?,?,?,?,?,?) "
+                "ON CONFLICT(snapshot_id, doc_id, knowledge_id) DO UPDATE SET content_hash = excluded.content_hash, "
+                "file_id = excluded.file_id, state = excluded.state, error = excluded.error, updated_at_utc = excluded.updated_at_utc",
+                (self._snapshot_id, doc.doc_id, self._knowledge_id, doc.content_hash, file_id, now, state, error, now),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _fail(self, doc: OwuiDoc, file_id: str, exc: Exception) -> None:
+        try:
+            self._set_state(doc, state="failed", file_id=file_id, error=str(exc))
+        finally:
+            with self._cond:
+                self._result.errors.append({"kind": "process", "ref": doc.url_or_path, "message": str(exc)})
+            self._finish()
+
+    def _finish(self, *, embedded: bool = False, skipped: bool = False) -> None:
+        with self._cond:
+            if embedded:
+                self._result.embedded += 1
+            if skipped:
+                self._result.skipped += 1
+            self._outstanding -= 1
+            self._cond.notify_all()
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import copy
+import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
+from typing import Any, Hashable
 
 
 @dataclass(frozen=True)
@@ -31,3 +36,61 @@ def make_snippet(text: str, *, max_chars: int = 220) -> str:
         return t
     return t[: max_chars - 1] + "…"
 
+
+_QUERY_TOKEN_RE = re.compile(r"\w+", flags=re.UNICODE)
+_MAX_QUERY_TOKENS = 32
+
+
+def query_tokens(query: str) -> list[str]:
+    """Split a user query into word tokens (deduplicated, order kept); punctuation never reaches FTS5."""
+    seen: dict[str, None] = {}
+    for tok in _QUERY_TOKEN_RE.findall(query or ""):
+        seen.setdefault(tok.lower(), None)
+    return list(seen)[:_MAX_QUERY_TOKENS]
+
+
+def build_fts_query(tokens: list[str], *, any_term: bool = False, prefix: bool = False) -> str | None:
+    """Safe FTS5 MATCH expression: every token quoted (FTS operators/punctuation lose their meaning).
+
+    `any_term` joins with OR instead of the implicit AND; `prefix` makes every term a prefix query.
+    """
+    if not tokens:
+        return None
+    star = "*" if prefix else ""
+    terms = ['"' + t.replace('"', '""') + '"' + star for t in tokens]
+    return (" OR " if any_term else " ").join(terms)
+
+
+class SearchCache:
+    """Thread-safe LRU of search results, invalidated per source when one of its snapshots completes."""
+
+    def __init__(self, *, max_entries: int) -> None:
+        self._max = max(0, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[str | None, list[dict[str, Any]]]] = OrderedDict()
+
+    def get(self, key: Hashable) -> list[dict[str, Any]] | None:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(hit[1])
+
+    def put(self, key: Hashable, results: list[dict[str, Any]], *, source_id: str | None) -> None:
+        if self._max <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (source_id, copy.deepcopy(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, source_id: str | None = None) -> None:
+        """Drop entries scoped to `source_id` plus all unscoped ones; `None` clears everything."""
+        with self._lock:
+            if source_id is None:
+                self._entries.clear()
+                return
+            for key in [k for k, (sid, _) in self._entries.items() if sid is None or sid == source_id]:
+                del self._entries[key]
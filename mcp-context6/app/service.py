@@ -1,16 +1,25 @@
 from __future__ import annotations
 
 import json
+import multiprocessing
+import os
 import re
+import sqlite3
 import threading
-from dataclasses import dataclass
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
+from urllib.parse import urlparse
 from uuid import uuid4
 
-from .chunking import chunk_markdown
+from .chunking import ChunkerConfig, chunk_document
 from .db import Db
+from .embeddings import Embedder, pack_vector
 from .ids import chunk_id as make_chunk_id
+from .ids import content_chunk_id as make_content_chunk_id
 from .ids import doc_id as make_doc_id
 from .ids import job_id as make_job_id
 from .ids import snapshot_id as make_snapshot_id
@@ -25,19 +34,34 @@ from .models import (
 )
 from .normalize import normalize_html, normalize_markdown
 from .openwebui_indexer import (
-    add_to_knowledge,
     create_knowledge,
     find_knowledge_by_name,
     list_knowledge,
     list_knowledge_files,
     load_openwebui_cfg_from_env,
-    poll_processing,
     render_markdown,
-    upload_markdown,
 )
-from .search import make_snippet, rrf_fuse
-from .sources import CrawlFetcher, GithubFetcher, LocalFetcher, canonicalize_url
+from .owui_stage import OwuiDoc, OwuiIndexStage
+from .search import SearchCache, build_fts_query, make_snippet, query_tokens, rrf_fuse
+from .sources import CrawlFetcher, CrawlPage, FetchedDoc, GithubFetcher, LocalFetcher, canonicalize_url
 from .time_utils import now_utc_iso
+from .vector_index import VectorIndex, VectorPoint
+
+
+# Chunks are embedded in batches of this size during sync (the embedder batches internally as well).
+_EMBED_FLUSH_CHUNKS = 256
+# FTS5 snippet(): highlight markers around matched terms, and max tokens per snippet (FTS5 caps at 64).
+_SNIPPET_MARKS = ("**", "**")
+_SNIPPET_TOKENS = 32
+# Text prefix fetched for dense-only hits (no FTS snippet); make_snippet trims it to 220 chars.
+_SNIPPET_PREFIX_CHARS = 512
+# Sync jobs write documents/chunks with executemany and commit once per this many documents.
+_INGEST_BATCH_DOCS = 100
+# gc: FTS5 'merge' work per run, free pages released per incremental_vacuum, and min age of deletable files
+# (a running sync writes/touches its files before committing the rows that reference them).
+_GC_FTS_MERGE_PAGES = 500
+_GC_VACUUM_PAGES = 2000
+_GC_FILE_GRACE_SECONDS = 3600
 
 
 class ToolUserError(RuntimeError):
@@ -59,6 +83,11 @@ class Context6Paths:
     def docs_dir(self) -> Path:
         return self.data_dir / "docs"
 
+    @property
+    def objects_dir(self) -> Path:
+        # Normalized markdown by content hash: docs/objects/<aa>/<sha256>.md
+        return self.docs_dir / "objects"
+
 
 def _ensure_dirs(paths: Context6Paths) -> None:
     paths.data_dir.mkdir(parents=True, exist_ok=True)
@@ -149,11 +178,100 @@ def _make_owui_filename(*, canonical_path: str, doc_id: str) -> str:
     return f"{prefix}{slug}{suffix}"
 
 
+@dataclass(frozen=True)
+class _PreparedDoc:
+    doc_id: str
+    title: str | None
+    markdown: str
+    raw_format: str
+    norm_format: str
+    content_hash: str
+    chunks: list[tuple[str, int, str, str, str, int]]  # (chunk_id, index, text_hash, text, heading_path, char_len)
+
+
+def _prepare_doc(
+    doc_id: str, raw_bytes: bytes, content_type: str, url_or_path: str, chunker: ChunkerConfig
+) -> _PreparedDoc:
+    """Detect + normalize + chunk one document (CPU-bound; runs in the normalize process pool)."""
+    raw_text = raw_bytes.decode("utf-8", errors="replace")
+    if content_type in ("text/markdown", "text/plain") or url_or_path.endswith((".md", ".mdx")):
+        norm = normalize_markdown(raw_text)
+    else:
+        norm = normalize_html(raw_text)
+    chunks: list[tuple[str, int, str, str, str, int]] = []
+    seen: dict[str, int] = {}
+    for idx, ch in enumerate(chunk_document(markdown=norm.markdown, cfg=chunker)):
+        th = sha256_hex(ch.text)
+        if chunker.mode == "cdc":
+            # Content-addressed: unchanged chunks keep their ID (and FTS rows/embeddings) when text moves.
+            seen[th] = seen.get(th, 0) + 1
+            cid = make_content_chunk_id(doc_id=doc_id, text_hash=th, occurrence=seen[th])
+        else:
+            cid = make_chunk_id(doc_id=doc_id, chunk_index=idx, text_hash=th)
+        chunks.append((cid, idx, th, ch.text, ch.heading_path, ch.char_len))
+    return _PreparedDoc(
+        doc_id=doc_id,
+        title=norm.title,
+        markdown=norm.markdown,
+        raw_format=norm.raw_format,
+        norm_format=norm.norm_format,
+        content_hash=sha256_hex(norm.markdown),
+        chunks=chunks,
+    )
+
+
+@dataclass
+class _IngestBatch:
+    """Rows of up to `_INGEST_BATCH_DOCS` documents, written in one transaction."""
+
+    documents: list[tuple[Any, ...]] = field(default_factory=list)
+    document_versions: list[tuple[Any, ...]] = field(default_factory=list)
+    document_updates: list[tuple[Any, ...]] = field(default_factory=list)
+    chunks: list[tuple[Any, ...]] = field(default_factory=list)
+    chunk_versions: list[tuple[Any, ...]] = field(default_factory=list)
+    vectors: list[tuple[str, str, str]] = field(default_factory=list)  # (chunk_id, doc_id, text) to embed
+    owui: list[OwuiDoc] = field(default_factory=list)  # handed to the OWUI stage after the batch commits
+
+
+@dataclass
+class _SyncRun:
+    source_id: str
+    snapshot_id: str
+    started_at_utc: str
+    owui_stage: OwuiIndexStage | None
+    counts: dict[str, int] = field(
+        default_factory=lambda: {"docs": 0, "chunks": 0, "embedded": 0, "skipped": 0, "vectors": 0}
+    )
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    pending_vectors: list[tuple[str, str, str]] = field(default_factory=list)
+
+
 class Context6Service:
-    def __init__(self, *, db: Db, paths: Context6Paths) -> None:
+    def __init__(
+        self,
+        *,
+        db: Db,
+        paths: Context6Paths,
+        embedder: Embedder | None = None,
+        vector_index: VectorIndex | None = None,
+        normalize_workers: int = 0,
+        chunker: ChunkerConfig | None = None,
+        keep_snapshots: int = 0,
+        search_cache_size: int = 0,
+        owui_workers: int = 4,
+    ) -> None:
         self._db = db
         self._paths = paths
         self._job_threads: dict[str, threading.Thread] = {}
+        self._embedder = embedder
+        self._vector_index = vector_index if embedder is not None else None
+        self._chunker = chunker or ChunkerConfig()
+        self._keep_snapshots = max(0, int(keep_snapshots))  # 0 = keep all
+        self._search_cache = SearchCache(max_entries=search_cache_size)
+        self._owui_workers = max(1, int(owui_workers))
+        self._normalize_workers = max(0, int(normalize_workers))
+        self._normalize_pool: ProcessPoolExecutor | None = None
+        self._normalize_pool_lock = threading.Lock()
 
     def create_source(self, req: SourcesCreateRequest) -> dict[str, Any]:
         # Validate + normalize config by type.
@@ -221,6 +339,7 @@ class Context6Service:
         try:
             conn.execute("DELETE FROM sources WHERE source_id = ?", (source_id,))
             conn.commit()
+            self._search_cache.invalidate(source_id)
             return {"deleted": True}
         finally:
             conn.close()
@@ -462,8 +581,47 @@ class Context6Service:
         finally:
             conn.close()
 
-    def search(self, *, query: str, top_k: int, source_id: str | None, snapshot_id: str | None) -> list[dict[str, Any]]:
+    def search(
+        self,
+        *,
+        query: str,
+        top_k: int,
+        source_id: str | None,
+        snapshot_id: str | None,
+        match: str = "auto",
+        prefix: bool = False,
+    ) -> list[dict[str, Any]]:
         top_k = int(top_k)
+        key = (query, top_k, source_id, snapshot_id, match, bool(prefix))
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            return cached
+        results = self._search(
+            query=query, top_k=top_k, source_id=source_id, snapshot_id=snapshot_id, match=match, prefix=prefix
+        )
+        self._search_cache.put(key, results, source_id=source_id)
+        return results
+
+    def _sparse_search(
+        self, conn: Any, fts_query: str, *, scope_sql: str, params: list[Any], limit: int
+    ) -> list[Any]:
+        # Snippets come from FTS5 itself (matched terms highlighted) instead of re-reading full chunk texts;
+        # EXISTS keeps one row per chunk even if it is in many snapshots.
+        return conn.execute(
+            "SELECT chunks_fts.chunk_id AS chunk_id, bm25(chunks_fts) AS score, "
+            "snippet(chunks_fts, 4, ?, ?, '…', ?) AS snippet "
+            "FROM chunks_fts "
+            "WHERE chunks_fts MATCH ? "
+            "AND EXISTS (SELECT 1 FROM chunk_versions cv "
+            f"WHERE cv.chunk_id = chunks_fts.chunk_id{scope_sql}) "
+            "ORDER BY score "
+            "LIMIT ?",
+            (*_SNIPPET_MARKS, _SNIPPET_TOKENS, fts_query, *params, limit),
+        ).fetchall()
+
+    def _search(
+        self, *, query: str, top_k: int, source_id: str | None, snapshot_id: str | None, match: str, prefix: bool
+    ) -> list[dict[str, Any]]:
         conn = self._db.connect()
         try:
             where: list[str] = []
@@ -474,39 +632,82 @@ class Context6Service:
             if snapshot_id:
                 where.append("cv.snapshot_id = ?")
                 params.append(snapshot_id)
-            where.append("chunks_fts MATCH ?")
-            params.append(query)
-            where_sql = "WHERE " + " AND ".join(where)
-
-            # Sparse: SQLite FTS
-            sparse_rows = conn.execute(
-                f"SELECT c.chunk_id AS chunk_id, bm25(chunks_fts) AS score "
-                f"FROM chunks_fts "
-                f"JOIN chunks c ON c.chunk_id = chunks_fts.chunk_id "
-                f"JOIN chunk_versions cv ON cv.chunk_id = c.chunk_id "
-                f"{where_sql} "
-                f"LIMIT ?",
-                (*params, max(50, top_k * 4)),
-            ).fetchall()
-            # bm25 lower is better; invert by rank later
+            scope_sql = "".join(f" AND {w}" for w in where)
+
+            # Sparse: SQLite FTS over a rewritten query. `raw` passes FTS5 syntax through unchanged;
+            # `auto` requires all terms and tops up with any-term matches when that finds too few.
+            limit = max(50, top_k * 4)
+            sparse_rows: list[Any] = []
+            if match == "raw":
+                if query.strip():
+                    try:
+                        sparse_rows = self._sparse_search(conn, query, scope_sql=scope_sql, params=params, limit=limit)
+                    except sqlite3.OperationalError as e:
+                        raise ToolUserError(f"invalid FTS5 query: {e}", data={"match": "raw"}) from e
+            else:
+                tokens = query_tokens(query)
+                fts_query = build_fts_query(tokens, any_term=(match == "any"), prefix=prefix)
+                if fts_query:
+                    sparse_rows = self._sparse_search(conn, fts_query, scope_sql=scope_sql, params=params, limit=limit)
+                if match == "auto" and len(tokens) > 1 and len(sparse_rows) < top_k:
+                    seen = {r["chunk_id"] for r in sparse_rows}
+                    any_query = build_fts_query(tokens, any_term=True, prefix=prefix)
+                    assert any_query is not None
+                    sparse_rows += [
+                        r
+                        for r in self._sparse_search(conn, any_query, scope_sql=scope_sql, params=params, limit=limit)
+                        if r["chunk_id"] not in seen
+                    ][: limit - len(sparse_rows)]
+            # bm25 lower is better; ordered ascending so list position is the rank
             sparse_ranked = [(r["chunk_id"], float(r["score"])) for r in sparse_rows]
+            snippets = {r["chunk_id"]: r["snippet"] for r in sparse_rows}
+
+            # Dense: vector index (Qdrant or in-process), filtered to the requested snapshot via chunk_versions.
+            dense_ranked: list[tuple[str, float]] = []
+            if self._embedder is not None and self._vector_index is not None:
+                qvec = self._embedder.embed([query])[0]
+                dense_ranked = self._vector_index.search(qvec, top_k=max(50, top_k * 4), source_id=source_id)
+                if snapshot_id and dense_ranked:
+                    ids = [cid for cid, _ in dense_ranked]
+                    marks = ",".join("?" for _ in ids)
+                    present = {
+                        r["chunk_id"]
+                        for r in conn.execute(
+                            f"SELECT chunk_id FROM chunk_versions WHERE snapshot_id = ? AND chunk_id IN ({marks})",
+                            (snapshot_id, *ids),
+                        ).fetchall()
+                    }
+                    dense_ranked = [(cid, s) for cid, s in dense_ranked if cid in present]
 
             # Fuse
-            fused = rrf_fuse(dense=[], sparse=sparse_ranked, k=60)
+            fused = rrf_fuse(dense=dense_ranked, sparse=sparse_ranked, k=60)
             ranked_ids = sorted(fused.items(), key=lambda kv: kv[1], reverse=True)[:top_k]
+            if not ranked_ids:
+                return []
+
+            # Hydrate all hits in one query: chunk_version of the newest snapshot (snapshot_id is a digest) per chunk.
+            # Only dense-only hits need text (no FTS snippet); a prefix is enough for make_snippet.
+            marks = ",".join("?" for _ in ranked_ids)
+            rows = conn.execute(
+                "SELECT c.chunk_id, c.heading_path, substr(c.text, 1, ?) AS text_head, cv.url_or_path, cv.title "
+                "FROM ("
+                "  SELECT v.chunk_id, v.url_or_path, v.title, "
+                "         ROW_NUMBER() OVER (PARTITION BY v.chunk_id ORDER BY s.started_at_utc DESC) AS rn "
+                "  FROM chunk_versions v JOIN snapshots s ON s.snapshot_id = v.snapshot_id "
+                f"  WHERE v.chunk_id IN ({marks})"
+                ") cv "
+                "JOIN chunks c ON c.chunk_id = cv.chunk_id "
+                "WHERE cv.rn = 1",
+                (_SNIPPET_PREFIX_CHARS, *[cid for cid, _ in ranked_ids]),
+            ).fetchall()
+            by_id = {r["chunk_id"]: r for r in rows}
 
             results: list[dict[str, Any]] = []
             for cid, score in ranked_ids:
-                row = conn.execute(
-                    "SELECT c.chunk_id, c.heading_path, c.text, cv.url_or_path, cv.title "
-                    "FROM chunks c "
-                    "JOIN chunk_versions cv ON cv.chunk_id = c.chunk_id "
-                    "WHERE c.chunk_id = ? "
-                    "ORDER BY cv.snapshot_id DESC LIMIT 1",
-                    (cid,),
-                ).fetchone()
+                row = by_id.get(cid)
                 if not row:
                     continue
+                snippet = snippets.get(cid)
                 results.append(
                     {
                         "chunk_id": row["chunk_id"],
@@ -514,18 +715,358 @@ class Context6Service:
                         "title": row["title"],
                         "url": row["url_or_path"],
                         "heading_path": row["heading_path"],
-                        "snippet": make_snippet(row["text"]),
+                        "snippet": " ".join(snippet.split()) if snippet else make_snippet(row["text_head"]),
                     }
                 )
             return results
         finally:
             conn.close()
 
+    def _embed_chunks(
+        self, conn: Any, items: list[tuple[str, str, str]], *, source_id: str, snapshot_id: str
+    ) -> int:
+        """Embed chunks that have no vector for the active model yet; store in SQLite and push to the vector index."""
+        embedder = self._embedder
+        assert embedder is not None
+        items = list({cid: (cid, did, text) for cid, did, text in items}.values())
+        done: set[str] = set()
+        for i in range(0, len(items), 500):  # stay below SQLite's bound-parameter limit
+            part = [cid for cid, _, _ in items[i : i + 500]]
+            marks = ",".join("?" for _ in part)
+            done.update(
+                r["chunk_id"]
+                for r in conn.execute(
+                    f"SELECT chunk_id FROM embeddings WHERE model = ? AND dim = ? AND vector IS NOT NULL AND chunk_id IN ({marks})",
+                    (embedder.model, embedder.dim, *part),
+                ).fetchall()
+            )
+        todo = [it for it in items if it[0] not in done]
+        if not todo:
+            return 0
+        vectors = embedder.embed([t for _, _, t in todo])
+        created = now_utc_iso()
+        conn.executemany(
+            "INSERT OR REPLACE INTO embeddings(chunk_id, model, dim, created_at_utc, vector) VALUES (?,?,?,?,?)",
+            [(cid, embedder.model, embedder.dim, created, pack_vector(vec)) for (cid, _, _), vec in zip(todo, vectors)],
+        )
+        conn.commit()  # persist before the (possibly remote) index upsert
+        if self._vector_index is not None:
+            self._vector_index.upsert(
+                [
+                    VectorPoint(chunk_id=cid, vector=vec, source_id=source_id, snapshot_id=snapshot_id, doc_id=did)
+                    for (cid, did, _), vec in zip(todo, vectors)
+                ]
+            )
+        return len(todo)
+
+    def _get_normalize_pool(self) -> ProcessPoolExecutor | None:
+        if self._normalize_workers <= 0:
+            return None
+        with self._normalize_pool_lock:
+            if self._normalize_pool is None:
+                # spawn: forking the multithreaded server process can deadlock in the child.
+                self._normalize_pool = ProcessPoolExecutor(
+                    max_workers=self._normalize_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._normalize_pool
+
+    def _prepare_docs(
+        self, source_id: str, docs: Iterable[FetchedDoc]
+    ) -> Iterator[tuple[FetchedDoc, _PreparedDoc | BaseException | None]]:
+        """Normalize + chunk docs in the process pool, yielding results in input order.
+
+        Keeps a bounded window of documents in flight so fetching (lazy iterators), CPU work and the
+        caller's SQLite writes overlap. Failures are yielded as the exception, per document.
+        """
+        pool = self._get_normalize_pool()
+        if pool is None:
+            for doc in docs:
+                if doc.not_modified:
+                    yield doc, None
+                    continue
+                did = make_doc_id(source_id=source_id, canonical_path=doc.canonical_path)
+                try:
+                    yield doc, _prepare_doc(did, doc.raw_bytes, doc.content_type, doc.url_or_path, self._chunker)
+                except Exception as e:
+                    yield doc, e
+            return
+
+        window: deque[tuple[FetchedDoc, Future[_PreparedDoc] | None]] = deque()
+        max_in_flight = self._normalize_workers * 4
+
+        def drain_one() -> tuple[FetchedDoc, _PreparedDoc | BaseException | None]:
+            doc, fut = window.popleft()
+            if fut is None:
+                return doc, None
+            try:
+                return doc, fut.result()
+            except Exception as e:
+                return doc, e
+
+        try:
+            for doc in docs:
+                if doc.not_modified:
+                    window.append((doc, None))
+                else:
+                    did = make_doc_id(source_id=source_id, canonical_path=doc.canonical_path)
+                    window.append(
+                        (doc, pool.submit(_prepare_doc, did, doc.raw_bytes, doc.content_type, doc.url_or_path, self._chunker))
+                    )
+                while len(window) >= max_in_flight:
+                    yield drain_one()
+            while window:
+                yield drain_one()
+        finally:
+            for _, fut in window:
+                if fut is not None:
+                    fut.cancel()
+
+    def _store_normalized(self, content_hash: str, markdown: str) -> Path:
+        path = self._paths.objects_dir / content_hash[:2] / f"{content_hash}.md"
+        if path.exists():
+            os.utime(path)  # fresh mtime protects it from a concurrent gc until this batch commits
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+        tmp.write_text(markdown, encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+    def gc(self, *, source_id: str | None = None, keep: int | None = None, scan_files: bool = True) -> dict[str, Any]:
+        """Retention: keep the last `keep` finished snapshots per source and collect what nothing references.
+
+        Rows of an expired snapshot that are still a document's latest version (incremental syncs skip
+        unchanged docs) are kept, as is the snapshot row then. Afterwards orphaned chunks (FTS via trigger,
+        embeddings, vector points), documents and normalized files are removed, followed by an FTS merge step
+        and an incremental vacuum. Each step commits on its own so syncs are not blocked for long.
+        With `scan_files=False` (after a sync) only the files of the collected versions are checked instead of
+        walking the whole docs directory.
+        """
+        keep = self._keep_snapshots if keep is None else int(keep)
+        stats = {"snapshots": 0, "chunk_versions": 0, "chunks": 0, "documents": 0, "files": 0}
+        released: set[str] = set()
+        conn = self._db.connect()
+        try:
+            if keep > 0:
+                if source_id:
+                    source_ids = [source_id]
+                else:
+                    source_ids = [str(r["source_id"]) for r in conn.execute("SELECT source_id FROM sources").fetchall()]
+                for sid in source_ids:
+                    for snap in self._expired_snapshots(conn, sid, keep):
+                        self._gc_snapshot(conn, snap, stats, released)
+            self._gc_orphans(conn, stats)
+            # Incremental maintenance: bounded FTS segment merge + release of free pages (auto_vacuum=INCREMENTAL).
+            conn.execute("INSERT INTO chunks_fts(chunks_fts, rank) VALUES('merge', ?)", (_GC_FTS_MERGE_PAGES,))
+            conn.commit()
+            conn.execute(f"PRAGMA incremental_vacuum({_GC_VACUUM_PAGES})").fetchall()
+        finally:
+            conn.close()
+        stats["files"] = self._gc_files(None if scan_files else released)
+        self._search_cache.invalidate(source_id)
+        return stats
+
+    def _expired_snapshots(self, conn: Any, source_id: str, keep: int) -> list[str]:
+        rows = conn.execute(
+            "SELECT snapshot_id, status FROM snapshots WHERE source_id = ? ORDER BY started_at_utc DESC",
+            (source_id,),
+        ).fetchall()
+        kept = 0
+        expired: list[str] = []
+        for r in rows:
+            if r["status"] == "running":
+                continue
+            if r["status"] in ("success", "success_with_errors") and kept < keep:
+                kept += 1
+                continue
+            expired.append(str(r["snapshot_id"]))
+        return expired
+
+    def _gc_snapshot(self, conn: Any, snapshot_id: str, stats: dict[str, int], released: set[str]) -> None:
+        not_latest = "SELECT doc_id FROM documents WHERE latest_snapshot_id IS NOT ?"
+        released.update(
+            str(r["normalized_path"])
+            for r in conn.execute(
+                f"SELECT normalized_path FROM document_versions WHERE snapshot_id = ? AND doc_id IN ({not_latest})",
+                (snapshot_id, snapshot_id),
+            )
+        )
+        cur = conn.execute(
+            "DELETE FROM chunk_versions WHERE snapshot_id = ? AND chunk_id IN "
+            f"(SELECT c.chunk_id FROM chunks c WHERE c.doc_id IN ({not_latest}))",
+            (snapshot_id, snapshot_id),
+        )
+        stats["chunk_versions"] += max(0, cur.rowcount)
+        conn.execute(f"DELETE FROM document_versions WHERE snapshot_id = ? AND doc_id IN ({not_latest})", (snapshot_id, snapshot_id))
+        conn.execute(f"DELETE FROM owui_uploads WHERE snapshot_id = ? AND doc_id IN ({not_latest})", (snapshot_id, snapshot_id))
+        left = conn.execute("SELECT 1 FROM document_versions WHERE snapshot_id = ? LIMIT 1", (snapshot_id,)).fetchone()
+        if not left:
+            conn.execute("DELETE FROM chunk_versions WHERE snapshot_id = ?", (snapshot_id,))
+            conn.execute("DELETE FROM owui_uploads WHERE snapshot_id = ?", (snapshot_id,))
+            conn.execute("UPDATE jobs SET snapshot_id = NULL WHERE snapshot_id = ?", (snapshot_id,))
+            conn.execute("DELETE FROM snapshots WHERE snapshot_id = ?", (snapshot_id,))
+            stats["snapshots"] += 1
+        conn.commit()
+
+    def _gc_orphans(self, conn: Any, stats: dict[str, int]) -> None:
+        while True:
+            ids = [
+                str(r["chunk_id"])
+                for r in conn.execute(
+                    "SELECT c.chunk_id FROM chunks c WHERE NOT EXISTS "
+                    "(SELECT 1 FROM chunk_versions cv WHERE cv.chunk_id = c.chunk_id) LIMIT 500"
+                ).fetchall()
+            ]
+            if not ids:
+                break
+            marks = ",".join("?" for _ in ids)
+            conn.execute(f"DELETE FROM embeddings WHERE chunk_id IN ({marks})", ids)
+            conn.execute(f"DELETE FROM chunks WHERE chunk_id IN ({marks})", ids)  # chunks_fts via trigger
+            conn.commit()
+            if self._vector_index is not None:
+                self._vector_index.delete(ids)
+            stats["chunks"] += len(ids)
+        orphan_docs = "SELECT d.doc_id FROM documents d WHERE NOT EXISTS (SELECT 1 FROM document_versions dv WHERE dv.doc_id = d.doc_id)"
+        conn.execute(f"DELETE FROM crawl_cache WHERE doc_id IN ({orphan_docs})")
+        cur = conn.execute(f"DELETE FROM documents WHERE doc_id IN ({orphan_docs})")
+        stats["documents"] += max(0, cur.rowcount)
+        conn.commit()
+
+    def _gc_files(self, candidates: set[str] | None = None) -> int:
+        """Delete unreferenced normalized files: all under docs_dir, or only `candidates` when given."""
+        conn = self._db.connect()
+        try:
+            referenced = {str(r["normalized_path"]) for r in conn.execute("SELECT DISTINCT normalized_path FROM document_versions")}
+        finally:
+            conn.close()
+        cutoff = time.time() - _GC_FILE_GRACE_SECONDS
+        removed = 0
+        root = self._paths.docs_dir
+        if candidates is None:
+            # Covers content-addressed objects and legacy per-snapshot files (docs/<snapshot_id>/<doc_id>.md).
+            paths = sorted(root.rglob("*.md"))
+            dirs = sorted((p for p in root.rglob("*") if p.is_dir()), key=lambda p: len(p.parts), reverse=True)
+        else:
+            paths = sorted(Path(p) for p in candidates - referenced)
+            dirs = sorted({p.parent for p in paths}, key=lambda p: len(p.parts), reverse=True)
+        for path in paths:
+            try:
+                if str(path) in referenced or path.stat().st_mtime > cutoff:
+                    continue
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                continue
+        for d in dirs:
+            if d != self._paths.objects_dir and d != root:
+                try:
+                    d.rmdir()  # only succeeds when empty
+                except OSError:
+                    pass
+        return removed
+
+    def _ingest_batch(self, conn: Any, batch: _IngestBatch, run: _SyncRun) -> None:
+        """Write one batch in a single transaction, then embed/upload it with no transaction open."""
+        if not batch.documents:
+            return
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO documents(doc_id, source_id, canonical_path) VALUES (?,?,?)",
+                batch.documents,
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO document_versions(snapshot_id, doc_id, url_or_path, content_hash, raw_format, norm_format, normalized_path) VALUES (?,?,?,?,?,?,?)",
+                batch.document_versions,
+            )
+            conn.executemany(
+                "UPDATE documents SET title = COALESCE(?, title), latest_snapshot_id = ? WHERE doc_id = ?",
+                batch.document_updates,
+            )
+            # chunks_fts follows via triggers; a changed title/heading re-indexes the (content-addressed) chunk,
+            # a moved one (cdc chunker) only gets its chunk_index updated.
+            conn.executemany(
+                "INSERT INTO chunks(chunk_id, doc_id, chunk_index, text_hash, text, heading_path, char_len, title) VALUES (?,?,?,?,?,?,?,?) "
+                "ON CONFLICT(chunk_id) DO UPDATE SET title = excluded.title, heading_path = excluded.heading_path, "
+                "chunk_index = excluded.chunk_index "
+                "WHERE chunks.title IS NOT excluded.title OR chunks.heading_path IS NOT excluded.heading_path "
+                "OR chunks.chunk_index != excluded.chunk_index",
+                batch.chunks,
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO chunk_versions(snapshot_id, chunk_id, source_id, url_or_path, title) VALUES (?,?,?,?,?)",
+                batch.chunk_versions,
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            run.errors.append({"kind": "db", "ref": str(batch.document_versions[0][2]), "message": str(e)})
+            return
+        run.counts["docs"] += len(batch.document_versions)
+        run.counts["chunks"] += len(batch.chunk_versions)
+
+        run.pending_vectors.extend(batch.vectors)
+        if len(run.pending_vectors) >= _EMBED_FLUSH_CHUNKS:
+            self._flush_vectors(conn, run)
+        if run.owui_stage is not None:
+            for item in batch.owui:
+                run.owui_stage.submit(item)  # blocks only when the stage's window is full
+
+    def _flush_vectors(self, conn: Any, run: _SyncRun) -> None:
+        pending, run.pending_vectors = run.pending_vectors, []
+        try:
+            run.counts["vectors"] += self._embed_chunks(
+                conn, pending, source_id=run.source_id, snapshot_id=run.snapshot_id
+            )
+        except Exception as e:
+            conn.rollback()
+            run.errors.append({"kind": "embed", "ref": run.snapshot_id, "message": str(e)})
+
+    def _load_crawl_validators(self, conn: Any, source_id: str) -> dict[str, CrawlPage]:
+        # Only pages whose document made it into a snapshot; anything else must be fetched in full.
+        rows = conn.execute(
+            "SELECT cc.url, cc.etag, cc.last_modified, cc.links_json FROM crawl_cache cc "
+            "JOIN documents d ON d.doc_id = cc.doc_id "
+            "WHERE cc.source_id = ? AND d.latest_snapshot_id IS NOT NULL",
+            (source_id,),
+        ).fetchall()
+        return {
+            str(r["url"]): CrawlPage(
+                etag=r["etag"], last_modified=r["last_modified"], links=tuple(json.loads(r["links_json"]))
+            )
+            for r in rows
+            if r["etag"] or r["last_modified"]
+        }
+
+    def _store_crawl_validators(self, conn: Any, run: _SyncRun, pages: dict[str, CrawlPage]) -> None:
+        if any(e.get("kind") == "db" for e in run.errors):
+            return  # a rolled-back batch: its pages must be fetched in full next time
+        failed = {e.get("ref") for e in run.errors}
+        fetched = now_utc_iso()
+        conn.executemany(
+            "INSERT OR REPLACE INTO crawl_cache(source_id, url, doc_id, etag, last_modified, links_json, fetched_at_utc) VALUES (?,?,?,?,?,?,?)",
+            [
+                (
+                    run.source_id,
+                    url,
+                    make_doc_id(source_id=run.source_id, canonical_path=urlparse(url).path or "/"),
+                    page.etag,
+                    page.last_modified,
+                    json.dumps(list(page.links)),
+                    fetched,
+                )
+                for url, page in pages.items()
+                if url not in failed
+            ],
+        )
+        conn.commit()
+
     def _run_sync_job(self, job_id: str, source_id: str, mode: str, knowledge_id: str | None) -> None:
         started = now_utc_iso()
         conn = self._db.connect()
+        owui_stage: OwuiIndexStage | None = None
         try:
             conn.execute("UPDATE jobs SET status=?, started_at_utc=? WHERE job_id=?", ("running", started, job_id))
+            conn.commit()  # don't hold the write lock while fetching
             source_row = conn.execute("SELECT type, config_json, limits_json FROM sources WHERE source_id=?", (source_id,)).fetchone()
             if not source_row:
                 conn.execute("UPDATE jobs SET status=?, last_error=? WHERE job_id=?", ("failed", "source not found", job_id))
@@ -539,6 +1080,7 @@ class Context6Service:
 
             resolved_ref = ""
             fetched_docs = []
+            crawler: CrawlFetcher | None = None
             max_bytes = int(limits.max_doc_size_mb) * 1024 * 1024
             if src_type == "local":
                 loc = LocalSourceConfig.model_validate(config.get("local") or {})
@@ -546,16 +1088,27 @@ class Context6Service:
                 resolved_ref = "local"
             elif src_type == "github":
                 gh = GithubSourceConfig.model_validate(config.get("github") or {})
+                base_ref = None
+                if mode == "incremental":
+                    # Diff against the last clean snapshot; docs that failed in a later one must be re-read.
+                    prev = conn.execute(
+                        "SELECT resolved_ref FROM snapshots WHERE source_id = ? AND status = 'success' "
+                        "ORDER BY started_at_utc DESC LIMIT 1",
+                        (source_id,),
+                    ).fetchone()
+                    base_ref = str(prev["resolved_ref"]) if prev else None
                 resolved_ref, fetched_docs = GithubFetcher(
                     repo=gh.repo,
                     ref=gh.ref,
                     include=gh.include,
                     exclude=gh.exclude,
                     max_doc_size_bytes=max_bytes,
+                    mirror_root=self._paths.cache_dir / "git",
+                    base_ref=base_ref,
                 ).fetch()
             elif src_type == "crawl":
                 cr = CrawlSourceConfig.model_validate(config.get("crawl") or {})
-                fetched_docs = CrawlFetcher(
+                crawler = CrawlFetcher(
                     start_urls=cr.start_urls,
                     allow_domains=cr.allow_domains,
                     allow_path_prefixes=cr.allow_path_prefixes,
@@ -563,7 +1116,11 @@ class Context6Service:
                     max_depth=limits.max_depth,
                     delay_s=limits.delay_seconds,
                     max_doc_size_bytes=max_bytes,
-                ).fetch()
+                    concurrency=limits.max_concurrency,
+                    # Conditional GETs only make sense when unchanged pages may be skipped.
+                    validators=self._load_crawl_validators(conn, source_id) if mode == "incremental" else None,
+                )
+                fetched_docs = crawler.fetch()  # streamed: pages are normalised while the crawl continues
                 resolved_ref = "crawl"
             else:
                 raise ValueError(f"Unsupported source type: {src_type}")
@@ -576,30 +1133,41 @@ class Context6Service:
             conn.execute("UPDATE jobs SET snapshot_id=? WHERE job_id=?", (snap_id, job_id))
             conn.commit()
 
-            counts = {"docs": 0, "chunks": 0, "embedded": 0, "skipped": 0}
-            errors: list[dict[str, Any]] = []
-
             # Open WebUI Knowledge indexing: upload normalized markdown, let Open WebUI do processing/embeddings.
             owui_cfg = load_openwebui_cfg_from_env()
             if knowledge_id and not owui_cfg:
                 raise RuntimeError("OPEN_WEBUI_API_KEY/OWUI_API_KEY is not set (required for Open WebUI indexing)")
 
-            for doc in fetched_docs:
-                try:
-                    did = make_doc_id(source_id=source_id, canonical_path=doc.canonical_path)
-                    # Ensure document row
-                    conn.execute(
-                        "INSERT OR IGNORE INTO documents(doc_id, source_id, canonical_path) VALUES (?,?,?)",
-                        (did, source_id, doc.canonical_path),
-                    )
+            if knowledge_id:
+                assert owui_cfg is not None  # validated above
+                owui_stage = OwuiIndexStage(
+                    db=self._db,
+                    cfg=owui_cfg,
+                    knowledge_id=knowledge_id,
+                    snapshot_id=snap_id,
+                    workers=self._owui_workers,
+                    reuse_added=mode == "incremental",
+                )
+            run = _SyncRun(
+                source_id=source_id,
+                snapshot_id=snap_id,
+                started_at_utc=started,
+                owui_stage=owui_stage,
+            )
+            counts = run.counts
+            errors = run.errors
 
-                    # Detect + normalize
-                    raw_text = doc.raw_bytes.decode("utf-8", errors="replace")
-                    if doc.content_type in ("text/markdown", "text/plain") or doc.url_or_path.endswith((".md", ".mdx")):
-                        norm = normalize_markdown(raw_text)
-                    else:
-                        norm = normalize_html(raw_text)
-                    content_hash = sha256_hex(norm.markdown)
+            batch = _IngestBatch()
+            for doc, prepared in self._prepare_docs(source_id, fetched_docs):
+                if doc.not_modified:  # crawl: 304 against the previous snapshot's validators
+                    counts["skipped"] += 1
+                    continue
+                try:
+                    if isinstance(prepared, BaseException):
+                        raise prepared
+                    assert prepared is not None
+                    did = prepared.doc_id
+                    content_hash = prepared.content_hash
 
                     # Incremental skip if unchanged vs latest snapshot
                     if mode == "incremental":
@@ -611,96 +1179,88 @@ class Context6Service:
                             counts["skipped"] += 1
                             continue
 
-                    # Persist normalized
-                    doc_dir = self._paths.docs_dir / snap_id
-                    doc_dir.mkdir(parents=True, exist_ok=True)
-                    norm_path = doc_dir / f"{did}.md"
-                    norm_path.write_text(norm.markdown, encoding="utf-8")
+                    # Persist normalized (content-addressed, shared across snapshots)
+                    norm_path = self._store_normalized(content_hash, prepared.markdown)
 
-                    conn.execute(
-                        "INSERT OR REPLACE INTO document_versions(snapshot_id, doc_id, url_or_path, content_hash, raw_format, norm_format, normalized_path) VALUES (?,?,?,?,?,?,?)",
-                        (snap_id, did, doc.url_or_path, content_hash, norm.raw_format, norm.norm_format, str(norm_path)),
-                    )
-                    conn.execute(
-                        "UPDATE documents SET title = COALESCE(?, title), latest_snapshot_id = ? WHERE doc_id = ?",
-                        (norm.title, snap_id, did),
+                    batch.documents.append((did, source_id, doc.canonical_path))
+                    batch.document_versions.append(
+                        (snap_id, did, doc.url_or_path, content_hash, prepared.raw_format, prepared.norm_format, str(norm_path))
                     )
-                    counts["docs"] += 1
+                    batch.document_updates.append((prepared.title, snap_id, did))
+                    for cid, idx, th, text, heading_path, char_len in prepared.chunks:
+                        batch.chunks.append((cid, did, idx, th, text, heading_path, char_len, prepared.title))
+                        batch.chunk_versions.append((snap_id, cid, source_id, doc.url_or_path, prepared.title))
+                        if self._embedder is not None:
+                            batch.vectors.append((cid, did, f"{heading_path}\n{text}".strip()))
 
-                    # Chunking
-                    chunks = chunk_markdown(markdown=norm.markdown)
-                    for idx, ch in enumerate(chunks):
-                        th = sha256_hex(ch.text)
-                        cid = make_chunk_id(doc_id=did, chunk_index=idx, text_hash=th)
-
-                        conn.execute(
-                            "INSERT OR IGNORE INTO chunks(chunk_id, doc_id, chunk_index, text_hash, text, heading_path, char_len) VALUES (?,?,?,?,?,?,?)",
-                            (cid, did, idx, th, ch.text, ch.heading_path, ch.char_len),
-                        )
-                        conn.execute(
-                            "INSERT OR REPLACE INTO chunk_versions(snapshot_id, chunk_id, source_id, url_or_path, title) VALUES (?,?,?,?,?)",
-                            (snap_id, cid, source_id, doc.url_or_path, norm.title),
-                        )
-                        # FTS upsert
-                        conn.execute("DELETE FROM chunks_fts WHERE chunk_id = ?", (cid,))
-                        conn.execute(
-                            "INSERT INTO chunks_fts(chunk_id, doc_id, title, heading_path, text) VALUES (?,?,?,?,?)",
-                            (cid, did, norm.title or "", ch.heading_path, ch.text),
-                        )
-                        counts["chunks"] += 1
-
-                    # Index into Open WebUI Knowledge (optional).
                     if knowledge_id:
-                        assert owui_cfg is not None  # validated above
-                        already = conn.execute(
-                            "SELECT content_hash FROM owui_uploads WHERE snapshot_id=? AND doc_id=? AND knowledge_id=?",
-                            (snap_id, did, knowledge_id),
-                        ).fetchone()
-                        if already and str(already["content_hash"]) == content_hash:
-                            counts["skipped"] += 1
-                        else:
-                            md = render_markdown(
-                                title=norm.title,
-                                url=doc.url_or_path,
-                                meta={
-                                    "source_id": source_id,
-                                    "snapshot_id": snap_id,
-                                    "doc_id": did,
-                                    "fetched_at": started,
-                                },
-                                markdown=norm.markdown,
-                            )
-                            filename = _make_owui_filename(canonical_path=doc.canonical_path, doc_id=did)
-                            file_id = upload_markdown(cfg=owui_cfg, markdown=md, filename=filename)
-                            process_status = poll_processing(cfg=owui_cfg, file_id=file_id)
-                            if (process_status.get("status") or "").lower() == "failed":
-                                raise RuntimeError(f"openwebui processing failed: {process_status}")
-                            add_to_knowledge(cfg=owui_cfg, knowledge_id=knowledge_id, file_id=file_id)
-                            conn.execute(
-                                "INSERT OR REPLACE INTO owui_uploads (snapshot_id, doc_id, knowledge_id, content_hash, file_id, created_at_utc) VALUES (?,?,?,?,?,?)",
-                                (snap_id, did, knowledge_id, content_hash, str(file_id), now_utc_iso()),
+                        batch.owui.append(
+                            OwuiDoc(
+                                doc_id=did,
+                                url_or_path=doc.url_or_path,
+                                content_hash=content_hash,
+                                filename=_make_owui_filename(canonical_path=doc.canonical_path, doc_id=did),
+                                markdown=render_markdown(
+                                    title=prepared.title,
+                                    url=doc.url_or_path,
+                                    meta={
+                                        "source_id": source_id,
+                                        "snapshot_id": snap_id,
+                                        "doc_id": did,
+                                        "fetched_at": started,
+                                    },
+                                    markdown=prepared.markdown,
+                                ),
                             )
-                            counts["embedded"] += 1
-
+                        )
                 except Exception as e:
                     errors.append({"kind": "process", "ref": doc.url_or_path, "message": str(e)})
 
+                if len(batch.documents) >= _INGEST_BATCH_DOCS:
+                    self._ingest_batch(conn, batch, run)
+                    batch = _IngestBatch()
+            self._ingest_batch(conn, batch, run)
+
+            if run.pending_vectors:
+                self._flush_vectors(conn, run)
+            if owui_stage is not None:
+                owui_stage.resume_pending(source_id=source_id)
+                owui = owui_stage.close()
+                owui_stage = None
+                counts["embedded"] += owui.embedded
+                counts["skipped"] += owui.skipped
+                errors.extend(owui.errors)
+            if crawler is not None:
+                self._store_crawl_validators(conn, run, crawler.pages)
+
             finished = now_utc_iso()
             conn.execute(
                 "UPDATE snapshots SET status=?, finished_at_utc=?, counts_json=?, errors_json=? WHERE snapshot_id=?",
                 ("success" if not errors else "success_with_errors", finished, json.dumps(counts), json.dumps(errors), snap_id),
             )
+            conn.commit()
+            self._search_cache.invalidate(source_id)
+            if self._keep_snapshots > 0:
+                # Runs once the snapshot counts as finished; failures are retried after the next sync or via snapshots.gc.
+                try:
+                    gc_stats = self.gc(source_id=source_id, scan_files=False)
+                    counts.update({f"gc_{k}": v for k, v in gc_stats.items()})
+                except Exception as e:
+                    errors.append({"kind": "gc", "ref": source_id, "message": str(e)})
             conn.execute(
                 "UPDATE jobs SET status=?, finished_at_utc=?, counts_json=?, errors_json=? WHERE job_id=?",
                 ("success" if not errors else "success_with_errors", finished, json.dumps(counts), json.dumps(errors), job_id),
             )
             conn.commit()
         except Exception as e:
+            if owui_stage is not None:
+                owui_stage.close(abort=True)  # per-doc state is persisted; the next sync resumes
             finished = now_utc_iso()
             conn.execute(
                 "UPDATE jobs SET status=?, finished_at_utc=?, last_error=? WHERE job_id=?",
                 ("failed", finished, str(e), job_id),
             )
             conn.commit()
+            self._search_cache.invalidate(source_id)  # batches committed before the failure are visible
         finally:
             conn.close()
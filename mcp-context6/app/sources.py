@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import fnmatch
+import os
+import queue
 import re
-import shutil
 import subprocess
-import tempfile
+import threading
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Iterator
 from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 from urllib.robotparser import RobotFileParser
 
@@ -64,6 +67,7 @@ class FetchedDoc:
     url_or_path: str
     raw_bytes: bytes
     content_type: str
+    not_modified: bool = False  # crawl: conditional GET answered 304, raw_bytes is empty
 
 
 class LocalFetcher:
@@ -86,37 +90,149 @@ class LocalFetcher:
             yield FetchedDoc(canonical_path=rel, url_or_path=str(path), raw_bytes=data, content_type="text/markdown")
 
 
+_MIRROR_LOCKS: dict[str, threading.Lock] = {}
+_MIRROR_LOCKS_GUARD = threading.Lock()
+
+
+def _mirror_lock(path: Path) -> threading.Lock:
+    with _MIRROR_LOCKS_GUARD:
+        return _MIRROR_LOCKS.setdefault(str(path), threading.Lock())
+
+
 class GithubFetcher:
-    def __init__(self, *, repo: str, ref: str, include: list[str], exclude: list[str], max_doc_size_bytes: int) -> None:
+    """Fetch docs from a persistent bare mirror (`<mirror_root>/<owner>__<name>.git`).
+
+    Each sync runs `git fetch` into the mirror; with `base_ref` (the previous snapshot's commit) only paths
+    changed since then are yielded. File contents are streamed lazily from `git cat-file --batch`.
+    """
+
+    def __init__(
+        self,
+        *,
+        repo: str,
+        ref: str,
+        include: list[str],
+        exclude: list[str],
+        max_doc_size_bytes: int,
+        mirror_root: Path,
+        base_ref: str | None = None,
+        remote_base_url: str | None = None,
+    ) -> None:
         self._repo = repo
         self._ref = ref
         self._include = include
         self._exclude = exclude
         self._max = max_doc_size_bytes
-
-    def fetch(self) -> tuple[str, list[FetchedDoc]]:
-        tmp = Path(tempfile.mkdtemp(prefix="context6_git_"))
+        self._base_ref = base_ref
+        base = (remote_base_url or os.getenv("CONTEXT6_GITHUB_BASE_URL", "https://github.com")).rstrip("/")
+        # Any git URL works, including a local path to a bare repo (tests).
+        self._url = f"{base}/{repo}.git"
+        self._mirror = Path(mirror_root) / (re.sub(r"[^A-Za-z0-9_.-]+", "__", repo) + ".git")
+
+    def _git(self, *args: str) -> str:
+        return subprocess.check_output(["git", "-C", str(self._mirror), *args], text=True)
+
+    def _update_mirror(self) -> str:
+        with _mirror_lock(self._mirror):
+            if not (self._mirror / "HEAD").exists():
+                self._mirror.parent.mkdir(parents=True, exist_ok=True)
+                subprocess.check_call(["git", "init", "--bare", "--quiet", str(self._mirror)])
+                subprocess.check_call(["git", "-C", str(self._mirror), "remote", "add", "origin", self._url])
+            else:
+                subprocess.check_call(["git", "-C", str(self._mirror), "remote", "set-url", "origin", self._url])
+            subprocess.check_call(["git", "-C", str(self._mirror), "fetch", "--quiet", "--no-tags", "origin", self._ref])
+            resolved = self._git("rev-parse", "FETCH_HEAD^{commit}").strip()
+            # Keep the synced commit reachable so it can serve as the diff base next time (survives git gc).
+            subprocess.check_call(["git", "-C", str(self._mirror), "update-ref", f"refs/context6/{self._ref}", resolved])
+            return resolved
+
+    def _changed_paths(self, resolved: str) -> set[str] | None:
+        if not self._base_ref or self._base_ref == resolved:
+            return None if not self._base_ref else set()
         try:
-            url = f"https://github.com/{self._repo}.git"
-            subprocess.check_call(["git", "clone", "--depth", "1", "--branch", self._ref, url, str(tmp)])
-            resolved = subprocess.check_output(["git", "-C", str(tmp), "rev-parse", "HEAD"], text=True).strip()
-            docs: list[FetchedDoc] = []
-            for path in tmp.rglob("*"):
-                if not path.is_file():
-                    continue
-                rel = str(path.relative_to(tmp))
-                if not match_globs(rel, include=self._include, exclude=self._exclude):
-                    continue
-                data = path.read_bytes()
-                if len(data) > self._max:
-                    continue
-                docs.append(FetchedDoc(canonical_path=rel, url_or_path=f"github:{self._repo}@{resolved}:{rel}", raw_bytes=data, content_type="text/markdown"))
-            return resolved, docs
+            subprocess.check_call(
+                ["git", "-C", str(self._mirror), "cat-file", "-e", f"{self._base_ref}^{{commit}}"],
+                stderr=subprocess.DEVNULL,
+            )
+        except subprocess.CalledProcessError:
+            return None  # base commit unknown to the mirror: fall back to a full listing
+        out = self._git("diff", "--name-only", "--no-renames", "--diff-filter=AMT", "-z", self._base_ref, resolved)
+        return {p for p in out.split("\0") if p}
+
+    def fetch(self) -> tuple[str, Iterator[FetchedDoc]]:
+        resolved = self._update_mirror()
+        changed = self._changed_paths(resolved)
+        entries: list[tuple[str, str]] = []  # (path, blob sha)
+        for line in self._git("ls-tree", "-r", "-l", "-z", resolved).split("\0"):
+            if not line:
+                continue
+            meta, rel = line.split("\t", 1)
+            _mode, kind, sha, size = meta.split()
+            if kind != "blob" or size == "-":
+                continue
+            if changed is not None and rel not in changed:
+                continue
+            if not match_globs(rel, include=self._include, exclude=self._exclude):
+                continue
+            if int(size) > self._max:
+                continue
+            entries.append((rel, sha))
+        return resolved, self._iter_docs(resolved, entries)
+
+    def _iter_docs(self, resolved: str, entries: list[tuple[str, str]]) -> Iterator[FetchedDoc]:
+        if not entries:
+            return
+        proc = subprocess.Popen(
+            ["git", "-C", str(self._mirror), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        assert proc.stdin is not None and proc.stdout is not None
+        try:
+            for rel, sha in entries:
+                proc.stdin.write(f"{sha}\n".encode())
+                proc.stdin.flush()
+                header = proc.stdout.readline().split()
+                if len(header) != 3:
+                    raise RuntimeError(f"git cat-file: unexpected reply for {rel}: {header!r}")
+                data = proc.stdout.read(int(header[2]))
+                proc.stdout.read(1)  # trailing LF
+                yield FetchedDoc(
+                    canonical_path=rel,
+                    url_or_path=f"github:{self._repo}@{resolved}:{rel}",
+                    raw_bytes=data,
+                    content_type="text/markdown",
+                )
         finally:
-            shutil.rmtree(tmp, ignore_errors=True)
+            proc.stdin.close()
+            proc.stdout.close()
+            proc.wait()
+
+
+@dataclass(frozen=True)
+class CrawlPage:
+    """HTTP validators and outgoing links of a crawled page (reused for conditional GETs on the next sync)."""
+
+    etag: str | None
+    last_modified: str | None
+    links: tuple[str, ...]
+
+
+class _TooLarge(Exception):
+    pass
+
+
+_HREF_RE = re.compile(r'href=["\\\']([^"\\\']+)["\\\']', flags=re.IGNORECASE)
 
 
 class CrawlFetcher:
+    """Async BFS crawler: `concurrency` requests in flight, `delay_s` politeness per host.
+
+    `validators` (page URL -> previous `CrawlPage`) turns requests into conditional GETs; a 304 yields a
+    `FetchedDoc(not_modified=True)` and its stored links keep the crawl going. Once the `fetch()` iterator is
+    exhausted, `pages` holds the validators/links of every page that answered 200 or 304.
+    """
+
     def __init__(
         self,
         *,
@@ -127,7 +243,10 @@ class CrawlFetcher:
         max_depth: int,
         delay_s: float,
         max_doc_size_bytes: int,
+        concurrency: int = 4,
+        validators: dict[str, CrawlPage] | None = None,
         user_agent: str = "context6-poC/0.1",
+        transport: httpx.AsyncBaseTransport | None = None,
     ) -> None:
         self._start_urls = [canonicalize_url(u) for u in start_urls]
         self._allow_domains = allow_domains
@@ -136,85 +255,225 @@ class CrawlFetcher:
         self._max_depth = int(max_depth)
         self._delay_s = float(delay_s)
         self._max = max_doc_size_bytes
+        self._concurrency = max(1, int(concurrency))
+        self._validators = validators or {}
         self._ua = user_agent
+        self._transport = transport
+        self.pages: dict[str, CrawlPage] = {}
+
+    def fetch(self) -> Iterator[FetchedDoc]:
+        """Stream docs in discovery order while the crawl is still running.
+
+        Sync jobs run in worker threads without an event loop, so the crawl gets its own loop in a helper thread
+        and hands docs over through a queue; normalisation starts on the first pages. Closing the iterator early
+        stops scheduling new requests.
+        """
+        docs: queue.Queue[FetchedDoc | BaseException | None] = queue.Queue()
+        stop = threading.Event()
+
+        def run() -> None:
+            try:
+                asyncio.run(self._crawl(docs.put, stop))
+            except BaseException as e:
+                docs.put(e)
+            else:
+                docs.put(None)
+
+        thread = threading.Thread(target=run, name="crawl", daemon=True)
+        thread.start()
+        try:
+            while (item := docs.get()) is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
+    def _allowed(self, url: str) -> bool:
+        return is_allowed_url(url=url, allow_domains=self._allow_domains, allow_path_prefixes=self._allow_prefixes)
+
+    async def _crawl(self, emit: Callable[[FetchedDoc], None], stop: threading.Event) -> None:
+        self.pages = {}
+        produced = 0  # docs counted against max_pages
+        # Pages are popped in discovery order; finished ones wait here until all earlier ones are done, so the
+        # emitted order is stable regardless of response timing.
+        finished: dict[int, FetchedDoc | None] = {}
+        next_order = 0
+        seen: set[str] = set()
+        frontier: deque[tuple[int, str, int]] = deque()
+        seq = 0
+
+        def enqueue(url: str, depth: int) -> None:
+            nonlocal seq
+            if url in seen or not self._allowed(url):
+                return
+            seen.add(url)
+            frontier.append((seq, url, depth))
+            seq += 1
 
-    def fetch(self) -> list[FetchedDoc]:
-        out: list[FetchedDoc] = []
-        visited: set[str] = set()
-        queue: list[tuple[str, int]] = []
         for u in self._start_urls:
-            queue.append((u, 0))
-
-        robots_cache: dict[str, RobotFileParser] = {}
-
-        def can_fetch(url: str) -> bool:
+            enqueue(u, 0)
+
+        def finish(order: int, doc: FetchedDoc | None) -> None:
+            nonlocal next_order
+            finished[order] = doc
+            while next_order in finished:
+                ready = finished.pop(next_order)
+                next_order += 1
+                if ready is not None:
+                    emit(ready)
+
+        cond = asyncio.Condition()
+        active = 0
+        host_locks: dict[str, asyncio.Lock] = {}
+        host_next: dict[str, float] = {}
+        robots: dict[str, RobotFileParser | None] = {}
+        robots_locks: dict[str, asyncio.Lock] = {}
+
+        async def host_slot(netloc: str) -> None:
+            # Per-host politeness: requests to one host start at least `delay_s` apart; other hosts are not delayed.
+            lock = host_locks.setdefault(netloc, asyncio.Lock())
+            async with lock:
+                loop = asyncio.get_running_loop()
+                wait = host_next.get(netloc, 0.0) - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                host_next[netloc] = loop.time() + self._delay_s
+
+        async def can_fetch(client: httpx.AsyncClient, url: str) -> bool:
             p = urlparse(url)
             base = f"{p.scheme}://{p.netloc}"
-            if base not in robots_cache:
-                rp = RobotFileParser()
-                rp.set_url(urljoin(base, "/robots.txt"))
-                try:
-                    rp.read()
-                except Exception:
+            async with robots_locks.setdefault(base, asyncio.Lock()):
+                if base not in robots:
+                    rp: RobotFileParser | None = RobotFileParser()
+                    try:
+                        await host_slot(p.netloc)
+                        resp = await client.get(urljoin(base, "/robots.txt"))
+                        if resp.status_code in (401, 403):
+                            rp.disallow_all = True  # type: ignore[union-attr]
+                        elif 400 <= resp.status_code < 500:
+                            rp.allow_all = True  # type: ignore[union-attr]
+                        elif resp.status_code == 200:
+                            rp.parse(resp.text.splitlines())  # type: ignore[union-attr]
+                        else:
+                            rp = None
+                    except Exception:
+                        rp = None
                     # strict: if robots can't be fetched, treat as disallow
-                    return False
-                robots_cache[base] = rp
-            rp = robots_cache[base]
-            return bool(rp.can_fetch(self._ua, url))
-
-        with httpx.Client(headers={"User-Agent": self._ua}, timeout=20.0, follow_redirects=True) as client:
-            while queue and len(out) < self._max_pages:
-                url, depth = queue.pop(0)
-                url = canonicalize_url(url)
-                if url in visited:
-                    continue
-                visited.add(url)
-
-                if depth < 0:
-                    continue
-                if not is_allowed_url(url=url, allow_domains=self._allow_domains, allow_path_prefixes=self._allow_prefixes):
-                    continue
-                if not can_fetch(url):
-                    continue
-
-                resp = client.get(url)
+                    robots[base] = rp
+            rp = robots[base]
+            return rp is not None and bool(rp.can_fetch(self._ua, url))
+
+        async def fetch_one(client: httpx.AsyncClient, url: str, depth: int) -> FetchedDoc | None:
+            if not await can_fetch(client, url):
+                return None
+            prev = self._validators.get(url)
+            headers: dict[str, str] = {}
+            if prev is not None:
+                if prev.etag:
+                    headers["If-None-Match"] = prev.etag
+                if prev.last_modified:
+                    headers["If-Modified-Since"] = prev.last_modified
+            await host_slot(urlparse(url).netloc)
+            async with client.stream("GET", url, headers=headers) as resp:
                 ct = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
-                if resp.status_code != 200:
-                    continue
-
-                if ct and not (ct.startswith("text/") or ct in ("application/xhtml+xml",)):
-                    continue
-
-                data = resp.content
-                if len(data) > self._max:
-                    continue
-
-                out.append(
-                    FetchedDoc(
+                if resp.status_code == 304 and prev is not None:
+                    self.pages[url] = CrawlPage(
+                        etag=resp.headers.get("ETag") or prev.etag,
+                        last_modified=resp.headers.get("Last-Modified") or prev.last_modified,
+                        links=prev.links,
+                    )
+                    doc = FetchedDoc(
+                        canonical_path=urlparse(url).path or "/",
+                        url_or_path=url,
+                        raw_bytes=b"",
+                        content_type=ct or "text/html",
+                        not_modified=True,
+                    )
+                    links: tuple[str, ...] = prev.links
+                else:
+                    if resp.status_code != 200:
+                        return None
+                    if ct and not (ct.startswith("text/") or ct in ("application/xhtml+xml",)):
+                        return None
+                    try:
+                        data = await self._read_limited(resp)
+                    except _TooLarge:
+                        return None
+                    is_html = "html" in (ct or "") or ct in ("application/xhtml+xml",)
+                    links = self._extract_links(url, data.decode(resp.encoding or "utf-8", errors="replace")) if is_html else ()
+                    self.pages[url] = CrawlPage(
+                        etag=resp.headers.get("ETag"), last_modified=resp.headers.get("Last-Modified"), links=links
+                    )
+                    doc = FetchedDoc(
                         canonical_path=urlparse(url).path or "/",
                         url_or_path=url,
                         raw_bytes=data,
                         content_type=ct or "text/html",
                     )
-                )
-
-                # Extract more links (HTML only)
-                if depth < self._max_depth and ("html" in (ct or "") or ct in ("application/xhtml+xml",)):
-                    text = resp.text
-                    for m in re.finditer(r'href=["\\\']([^"\\\']+)["\\\']', text, flags=re.IGNORECASE):
-                        href = m.group(1)
-                        if href.startswith("#") or href.startswith("mailto:") or href.startswith("javascript:"):
-                            continue
-                        nxt = canonicalize_url(urljoin(url, href))
-                        if nxt in visited:
-                            continue
-                        if not is_allowed_url(url=nxt, allow_domains=self._allow_domains, allow_path_prefixes=self._allow_prefixes):
-                            continue
-                        queue.append((nxt, depth + 1))
-
-                if self._delay_s > 0:
-                    import time
-
-                    time.sleep(self._delay_s)
-
-        return out
+            if depth < self._max_depth:
+                for nxt in links:
+                    enqueue(nxt, depth + 1)
+            return doc
+
+        async def worker(client: httpx.AsyncClient) -> None:
+            nonlocal active, produced
+            while True:
+                async with cond:
+                    # Wait while others are in flight and there is nothing (or no page budget) to schedule.
+                    while active and (not frontier or produced + active >= self._max_pages):
+                        await cond.wait()
+                    if stop.is_set() or not frontier or produced >= self._max_pages:
+                        cond.notify_all()
+                        return
+                    order, url, depth = frontier.popleft()
+                    active += 1
+                doc: FetchedDoc | None = None
+                try:
+                    doc = await fetch_one(client, url, depth)
+                except httpx.HTTPError:
+                    pass
+                finally:
+                    async with cond:
+                        active -= 1
+                        produced += doc is not None
+                        finish(order, doc)
+                        cond.notify_all()
+
+        limits = httpx.Limits(max_connections=self._concurrency, max_keepalive_connections=self._concurrency)
+        async with httpx.AsyncClient(
+            headers={"User-Agent": self._ua},
+            timeout=20.0,
+            follow_redirects=True,
+            limits=limits,
+            transport=self._transport,
+        ) as client:
+            await asyncio.gather(*(worker(client) for _ in range(self._concurrency)))
+
+        for order in sorted(finished):
+            if finished[order] is not None:
+                emit(finished[order])
+
+    async def _read_limited(self, resp: httpx.Response) -> bytes:
+        # Streamed size limit: reject by Content-Length up front, otherwise stop reading once over the limit.
+        declared = resp.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > self._max:
+            raise _TooLarge()
+        buf = bytearray()
+        async for part in resp.aiter_bytes():
+            buf.extend(part)
+            if len(buf) > self._max:
+                raise _TooLarge()
+        return bytes(buf)
+
+    def _extract_links(self, url: str, text: str) -> tuple[str, ...]:
+        links: list[str] = []
+        for m in _HREF_RE.finditer(text):
+            href = m.group(1)
+            if href.startswith("#") or href.startswith("mailto:") or href.startswith("javascript:"):
+                continue
+            nxt = canonicalize_url(urljoin(url, href))
+            if self._allowed(nxt):
+                links.append(nxt)
+        return tuple(dict.fromkeys(links))
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+import httpx
+
+from .db import Db
+from .embeddings import unpack_vector
+
+try:  # numpy is optional; the pure-Python path is fine for PoC-sized corpora.
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+
+@dataclass(frozen=True)
+class VectorPoint:
+    chunk_id: str
+    vector: list[float]
+    source_id: str
+    snapshot_id: str
+    doc_id: str
+
+
+class VectorIndex(Protocol):
+    def upsert(self, points: list[VectorPoint]) -> None: ...
+
+    def search(self, vector: list[float], *, top_k: int, source_id: str | None) -> list[tuple[str, float]]: ...
+
+    def delete(self, chunk_ids: list[str]) -> None: ...
+
+
+class LocalVectorIndex:
+    """In-process cosine index over the vectors stored in SQLite (`embeddings.vector`).
+
+    Loaded lazily on first search and kept in sync by `upsert`; used when Qdrant is not configured.
+    """
+
+    def __init__(self, *, db: Db, model: str, dim: int) -> None:
+        self._db = db
+        self._model = model
+        self._dim = dim
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._ids: list[str] = []
+        self._sources: list[str] = []
+        self._vectors: list[list[float]] = []
+        self._pos: dict[str, int] = {}
+        self._matrix: Any = None
+
+    def _load(self) -> None:
+        conn = self._db.connect()
+        try:
+            rows = conn.execute(
+                "SELECT e.chunk_id, e.vector, d.source_id FROM embeddings e "
+                "JOIN chunks c ON c.chunk_id = e.chunk_id "
+                "JOIN documents d ON d.doc_id = c.doc_id "
+                "WHERE e.model = ? AND e.dim = ? AND e.vector IS NOT NULL",
+                (self._model, self._dim),
+            ).fetchall()
+        finally:
+            conn.close()
+        for r in rows:
+            self._set(str(r["chunk_id"]), unpack_vector(r["vector"]), str(r["source_id"]))
+        self._loaded = True
+
+    def _set(self, chunk_id: str, vector: list[float], source_id: str) -> None:
+        pos = self._pos.get(chunk_id)
+        if pos is None:
+            self._pos[chunk_id] = len(self._ids)
+            self._ids.append(chunk_id)
+            self._sources.append(source_id)
+            self._vectors.append(vector)
+        else:
+            self._vectors[pos] = vector
+            self._sources[pos] = source_id
+        self._matrix = None
+
+    def upsert(self, points: list[VectorPoint]) -> None:
+        with self._lock:
+            if not self._loaded:
+                return  # vectors are already persisted in SQLite; picked up on first load
+            for p in points:
+                self._set(p.chunk_id, p.vector, p.source_id)
+
+    def delete(self, chunk_ids: list[str]) -> None:
+        with self._lock:
+            if not self._loaded:
+                return
+            drop = set(chunk_ids) & self._pos.keys()
+            if not drop:
+                return
+            keep = [i for i, cid in enumerate(self._ids) if cid not in drop]
+            self._ids = [self._ids[i] for i in keep]
+            self._sources = [self._sources[i] for i in keep]
+            self._vectors = [self._vectors[i] for i in keep]
+            self._pos = {cid: i for i, cid in enumerate(self._ids)}
+            self._matrix = None
+
+    def search(self, vector: list[float], *, top_k: int, source_id: str | None) -> list[tuple[str, float]]:
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if not self._ids:
+                return []
+            if np is not None:
+                if self._matrix is None:
+                    self._matrix = np.asarray(self._vectors, dtype=np.float32)
+                scores = self._matrix @ np.asarray(vector, dtype=np.float32)
+                if source_id:
+                    mask = np.fromiter((s == source_id for s in self._sources), dtype=bool, count=len(self._sources))
+                    scores = np.where(mask, scores, -np.inf)
+                k = min(top_k, len(self._ids))
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top])]
+                return [(self._ids[i], float(scores[i])) for i in top if np.isfinite(scores[i])]
+            scored = [
+                (self._ids[i], sum(a * b for a, b in zip(v, vector)))
+                for i, v in enumerate(self._vectors)
+                if not source_id or self._sources[i] == source_id
+            ]
+            scored.sort(key=lambda kv: kv[1], reverse=True)
+            return scored[:top_k]
+
+
+def _point_uuid(chunk_id: str) -> str:
+    # Qdrant point IDs must be UUIDs/ints; derive a stable UUID from the (hex) chunk_id.
+    return str(uuid.UUID(hex=chunk_id[:32]))
+
+
+class QdrantVectorIndex:
+    """Qdrant REST index (vectors + filter payload only; text stays in SQLite, see ADR qdrant-indexing-boundaries)."""
+
+    def __init__(self, *, url: str, api_key: str | None, model: str, dim: int, timeout_s: float = 30.0) -> None:
+        slug = re.sub(r"[^a-z0-9]+", "_", model.lower()).strip("_")
+        self.collection = f"context6__{slug}__{dim}"
+        self._dim = dim
+        headers = {"api-key": api_key} if api_key else {}
+        self._client = httpx.Client(base_url=url.rstrip("/"), headers=headers, timeout=timeout_s)
+        self._ready = False
+
+    def _ensure_collection(self) -> None:
+        if self._ready:
+            return
+        r = self._client.get(f"/collections/{self.collection}")
+        if r.status_code == 404:
+            r = self._client.put(
+                f"/collections/{self.collection}",
+                json={"vectors": {"size": self._dim, "distance": "Cosine"}},
+            )
+        r.raise_for_status()
+        self._ready = True
+
+    def upsert(self, points: list[VectorPoint]) -> None:
+        if not points:
+            return
+        self._ensure_collection()
+        body = {
+            "points": [
+                {
+                    "id": _point_uuid(p.chunk_id),
+                    "vector": p.vector,
+                    "payload": {
+                        "chunk_id": p.chunk_id,
+                        "doc_id": p.doc_id,
+                        "source_id": p.source_id,
+                        "snapshot_id": p.snapshot_id,
+                    },
+                }
+                for p in points
+            ]
+        }
+        r = self._client.put(f"/collections/{self.collection}/points", params={"wait": "true"}, json=body)
+        r.raise_for_status()
+
+    def delete(self, chunk_ids: list[str]) -> None:
+        if not chunk_ids:
+            return
+        self._ensure_collection()
+        r = self._client.post(
+            f"/collections/{self.collection}/points/delete",
+            params={"wait": "true"},
+            json={"points": [_point_uuid(cid) for cid in chunk_ids]},
+        )
+        r.raise_for_status()
+
+    def search(self, vector: list[float], *, top_k: int, source_id: str | None) -> list[tuple[str, float]]:
+        self._ensure_collection()
+        body: dict[str, Any] = {"vector": vector, "limit": int(top_k), "with_payload": ["chunk_id"]}
+        if source_id:
+            body["filter"] = {"must": [{"key": "source_id", "match": {"value": source_id}}]}
+        r = self._client.post(f"/collections/{self.collection}/points/search", json=body)
+        r.raise_for_status()
+        hits = (r.json() or {}).get("result") or []
+        return [(str(h["payload"]["chunk_id"]), float(h["score"])) for h in hits if (h.get("payload") or {}).get("chunk_id")]
+
+
+def make_vector_index(*, db: Db, model: str, dim: int) -> VectorIndex:
+    url = os.getenv("CONTEXT6_QDRANT_URL", "").strip()
+    if url:
+        api_key = os.getenv("QDRANT_API_KEY", "").strip() or None
+        return QdrantVectorIndex(url=url, api_key=api_key, model=model, dim=dim)
+    return LocalVectorIndex(db=db, model=model, dim=dim)
@@ -0,0 +1,8 @@
+"""Test setup: make the service package (`app`) importable without installing it."""
+
+import sys
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+if str(SERVICE_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVICE_DIR))
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import time
+from collections import Counter
+from typing import AsyncIterator, Callable
+
+import httpx
+
+from app.sources import CrawlFetcher, CrawlPage
+
+
+def _html(*links: str) -> str:
+    return "<html><body>" + "".join(f'<a href="{href}">x</a>' for href in links) + "</body></html>"
+
+
+def _fetcher(handler: Callable[[httpx.Request], httpx.Response], **overrides: object) -> CrawlFetcher:
+    kwargs: dict[str, object] = {
+        "start_urls": ["https://docs.test/"],
+        "allow_domains": ["docs.test"],
+        "allow_path_prefixes": ["/"],
+        "max_pages": 50,
+        "max_depth": 5,
+        "delay_s": 0.0,
+        "max_doc_size_bytes": 100_000,
+        "concurrency": 4,
+        "transport": httpx.MockTransport(handler),
+    }
+    kwargs.update(overrides)
+    return CrawlFetcher(**kwargs)  # type: ignore[arg-type]
+
+
+def _site(pages: dict[str, str], requests: list[httpx.Request]) -> Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        body = pages.get(request.url.path)
+        if body is None:
+            return httpx.Response(404)
+        return httpx.Response(200, headers={"Content-Type": "text/html"}, text=body)
+
+    return handler
+
+
+# --- Frontier ---
+
+
+def test_crawl_dedups_urls_on_enqueue_and_keeps_discovery_order() -> None:
+    pages = {
+        "/": _html("/a", "/b", "/a#top", "/a?utm_source=x"),
+        "/a": _html("/", "/b", "/c"),
+        "/b": _html("/a", "/c"),
+        "/c": _html("/"),
+    }
+    requests: list[httpx.Request] = []
+
+    docs = list(_fetcher(_site(pages, requests)).fetch())
+
+    assert [d.canonical_path for d in docs] == ["/", "/a", "/b", "/c"]
+    counts = Counter(r.url.path for r in requests if r.url.path != "/robots.txt")
+    assert counts == {"/": 1, "/a": 1, "/b": 1, "/c": 1}
+
+
+def test_crawl_delays_requests_per_host_only() -> None:
+    pages = {"/": _html("/a", "/b", "https://other.test/x", "https://other.test/y"), "/a": "", "/b": "", "/x": "", "/y": ""}
+    requests: list[httpx.Request] = []
+    started: dict[str, list[float]] = {}
+    site = _site(pages, requests)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        started.setdefault(request.url.host, []).append(time.monotonic())
+        return site(request)
+
+    fetcher = _fetcher(handler, allow_domains=["docs.test", "other.test"], delay_s=0.2, concurrency=4)
+    docs = list(fetcher.fetch())
+
+    assert len(docs) == 5
+    for host, times in started.items():
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        assert all(gap >= 0.19 for gap in gaps), (host, gaps)
+    # the second host is not held back by the first host's delay
+    assert started["other.test"][0] - started["docs.test"][0] < 0.2 * len(started["docs.test"])
+
+
+# --- Conditional GET ---
+
+
+def test_crawl_reuses_previous_page_on_304() -> None:
+    pages = {"/": "changed, must not be read", "/a": _html()}
+    requests: list[httpx.Request] = []
+    site = _site(pages, requests)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/" and request.headers.get("If-None-Match") == '"v1"':
+            requests.append(request)
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return site(request)
+
+    validators = {"https://docs.test/": CrawlPage(etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT", links=("https://docs.test/a",))}
+    fetcher = _fetcher(handler, validators=validators)
+    docs = list(fetcher.fetch())
+
+    root = next(r for r in requests if r.url.path == "/")
+    assert root.headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert [(d.canonical_path, d.not_modified) for d in docs] == [("/", True), ("/a", False)]
+    assert docs[0].raw_bytes == b""
+    # the stored links keep the crawl going and are kept for the next sync
+    assert fetcher.pages["https://docs.test/"] == validators["https://docs.test/"]
+
+
+# --- Size limit ---
+
+
+def test_crawl_aborts_oversized_streamed_bodies() -> None:
+    sent = {"chunks": 0}
+
+    async def body() -> AsyncIterator[bytes]:
+        for _ in range(100):
+            sent["chunks"] += 1
+            yield b"x" * 1000
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        if request.url.path == "/":
+            return httpx.Response(200, headers={"Content-Type": "text/html"}, text=_html("/big", "/declared", "/ok"))
+        if request.url.path == "/big":
+            return httpx.Response(200, headers={"Content-Type": "text/html"}, content=body())
+        if request.url.path == "/declared":
+            return httpx.Response(200, headers={"Content-Type": "text/html", "Content-Length": "999999"}, content=b"")
+        return httpx.Response(200, headers={"Content-Type": "text/html"}, text="small")
+
+    docs = list(_fetcher(handler, max_doc_size_bytes=5_000).fetch())
+
+    assert [d.canonical_path for d in docs] == ["/", "/ok"]
+    assert sent["chunks"] <= 6  # stopped reading just past the limit
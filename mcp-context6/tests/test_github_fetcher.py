@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from app.sources import GithubFetcher
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+class _Upstream:
+    """Local bare repo `<root>/remote/owner/docs.git`, filled from a work tree with `commit()`."""
+
+    def __init__(self, root: Path) -> None:
+        self.remote_base = root / "remote"
+        self.bare = self.remote_base / "owner" / "docs.git"
+        self.work = root / "work"
+        self.bare.parent.mkdir(parents=True)
+        self._git(root, "init", "--bare", "--quiet", str(self.bare))
+        self._git(root, "init", "--quiet", "-b", "main", str(self.work))
+
+    @staticmethod
+    def _git(cwd: Path, *args: str) -> str:
+        return subprocess.check_output(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args], cwd=cwd, text=True
+        )
+
+    def commit(self, files: dict[str, str | None]) -> str:
+        for rel, content in files.items():
+            path = self.work / rel
+            if content is None:
+                path.unlink()
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        self._git(self.work, "add", "-A")
+        self._git(self.work, "commit", "--quiet", "-m", "update")
+        self._git(self.work, "push", "--quiet", str(self.bare), "main")
+        return self._git(self.work, "rev-parse", "HEAD").strip()
+
+
+def _fetch(
+    upstream: _Upstream,
+    mirror_root: Path,
+    *,
+    base_ref: str | None = None,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    max_doc_size_bytes: int = 10_000,
+) -> tuple[str, dict[str, bytes]]:
+    fetcher = GithubFetcher(
+        repo="owner/docs",
+        ref="main",
+        include=include if include is not None else ["**/*.md", "*.md"],
+        exclude=exclude or [],
+        max_doc_size_bytes=max_doc_size_bytes,
+        mirror_root=mirror_root,
+        base_ref=base_ref,
+        remote_base_url=str(upstream.remote_base),
+    )
+    resolved, docs = fetcher.fetch()
+    return resolved, {d.canonical_path: d.raw_bytes for d in docs}
+
+
+@pytest.fixture
+def upstream(tmp_path: Path) -> _Upstream:
+    return _Upstream(tmp_path)
+
+
+def test_first_sync_lists_all_matching_docs(upstream: _Upstream, tmp_path: Path) -> None:
+    head = upstream.commit({"README.md": "# Readme\n", "docs/a.md": "# A\n", "src/main.py": "print()\n"})
+
+    resolved, docs = _fetch(upstream, tmp_path / "mirrors")
+
+    assert resolved == head
+    assert docs == {"README.md": b"# Readme\n", "docs/a.md": b"# A\n"}
+    assert (tmp_path / "mirrors" / "owner__docs.git" / "HEAD").exists()
+
+
+def test_incremental_sync_yields_only_changed_paths(upstream: _Upstream, tmp_path: Path) -> None:
+    first = upstream.commit({"README.md": "# Readme\n", "docs/a.md": "# A\n", "docs/b.md": "# B\n"})
+    _fetch(upstream, tmp_path / "mirrors")
+    second = upstream.commit({"docs/a.md": "# A v2\n", "docs/c.md": "# C\n", "docs/b.md": None})
+
+    resolved, docs = _fetch(upstream, tmp_path / "mirrors", base_ref=first)
+
+    assert resolved == second
+    assert docs == {"docs/a.md": b"# A v2\n", "docs/c.md": b"# C\n"}
+    # unchanged ref: nothing to read
+    assert _fetch(upstream, tmp_path / "mirrors", base_ref=second)[1] == {}
+
+
+def test_unknown_base_ref_falls_back_to_full_listing(upstream: _Upstream, tmp_path: Path) -> None:
+    upstream.commit({"README.md": "# Readme\n", "docs/a.md": "# A\n"})
+
+    _, docs = _fetch(upstream, tmp_path / "mirrors", base_ref="0" * 40)
+
+    assert set(docs) == {"README.md", "docs/a.md"}
+
+
+def test_include_exclude_and_size_filters(upstream: _Upstream, tmp_path: Path) -> None:
+    upstream.commit(
+        {
+            "docs/a.md": "# A\n",
+            "docs/drafts/wip.md": "# WIP\n",
+            "docs/big.md": "x" * 500,
+            "notes.txt": "plain\n",
+        }
+    )
+
+    _, docs = _fetch(
+        upstream,
+        tmp_path / "mirrors",
+        include=["docs/*"],
+        exclude=["docs/drafts/*"],
+        max_doc_size_bytes=100,
+    )
+
+    assert set(docs) == {"docs/a.md"}
@@ -1,22 +1,30 @@
+import asyncio
+import codecs
 import hashlib
+import io
 import json
 import os
 import time
 import requests
 import re
+import signal
 import sqlite3
+import struct
 import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 import subprocess
 import uuid
+from functools import partial
 from typing import Any
 from xml.etree.ElementTree import ParseError
 
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
-from fastapi import Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import Header, Query
 from pydantic import BaseModel, Field
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import (
@@ -36,6 +44,9 @@ def _split_languages(value: str) -> list[str]:
 DEFAULT_LANGUAGES = _split_languages(os.getenv("TRANSCRIPT_MINER_DEFAULT_LANGUAGES", "de,en"))
 FETCH_RETRIES = int(os.getenv("TRANSCRIPT_MINER_FETCH_RETRIES", "2"))
 FETCH_RETRY_BACKOFF_SECONDS = float(os.getenv("TRANSCRIPT_MINER_FETCH_RETRY_BACKOFF_SECONDS", "0.5"))
+FETCH_CACHE_SIZE = max(0, int(os.getenv("TRANSCRIPT_MINER_FETCH_CACHE_SIZE", "256")))
+FETCH_CACHE_TTL_SECONDS = max(0, int(os.getenv("TRANSCRIPT_MINER_FETCH_CACHE_TTL_SECONDS", "3600")))
+FETCH_USE_LOCAL_STORE = os.getenv("TRANSCRIPT_MINER_FETCH_USE_LOCAL_STORE", "true").strip().lower() in {"1", "true", "yes"}
 CONFIG_DIR = os.getenv("TRANSCRIPT_MINER_CONFIG_DIR", "/transcript_miner_config")
 OUTPUT_DIR = os.getenv("TRANSCRIPT_MINER_OUTPUT_DIR", "/transcript_miner_output")
 CONFIG_BACKUP_DIR = os.getenv(
@@ -43,6 +54,8 @@ CONFIG_BACKUP_DIR = os.getenv(
     "/data/config_backups",
 )
 RUNS_DIR = os.getenv("TRANSCRIPT_MINER_RUNS_DIR", "/data/runs")
+# Sidecar line-offset indexes for output JSONL files (kept out of the shared output tree).
+OUTPUT_INDEX_DIR = os.getenv("TRANSCRIPT_MINER_OUTPUT_INDEX_DIR", "/data/output_index")
 KNOWLEDGE_MAP_JSON_PATH = os.getenv("OPEN_WEBUI_KNOWLEDGE_ID_BY_TOPIC_JSON_PATH", "").strip()
 KNOWLEDGE_MAP_JSON = os.getenv("OPEN_WEBUI_KNOWLEDGE_ID_BY_TOPIC_JSON", "").strip()
 if not KNOWLEDGE_MAP_JSON and KNOWLEDGE_MAP_JSON_PATH:
@@ -74,6 +87,17 @@ KNOWLEDGE_DEDUP_PRECHECK = os.getenv("OPEN_WEBUI_KNOWLEDGE_DEDUP_PRECHECK", "tru
     "yes",
 }
 KNOWLEDGE_DEDUP_CACHE_TTL = int(os.getenv("OPEN_WEBUI_KNOWLEDGE_DEDUP_CACHE_TTL_SECONDS", "900"))
+RUN_MAX_CONCURRENCY = max(1, int(os.getenv("TRANSCRIPT_MINER_RUN_MAX_CONCURRENCY", "1")))
+RUN_EVENTS_POLL_SECONDS = max(0.1, float(os.getenv("TRANSCRIPT_MINER_RUN_EVENTS_POLL_SECONDS", "0.5")))
+RUN_EVENTS_CHUNK_BYTES = 64 * 1024
+RUN_RECOVERY_POLL_SECONDS = max(1, int(os.getenv("TRANSCRIPT_MINER_RUN_RECOVERY_POLL_SECONDS", "5")))
+MCP_WORKERS = max(1, int(os.getenv("TRANSCRIPT_MINER_MCP_WORKERS", "8")))
+# Per-tool concurrency limits, e.g. "sync.topic=1,transcript.fetch=2". Tools not listed are only bounded by MCP_WORKERS.
+MCP_TOOL_LIMITS_RAW = os.getenv(
+    "TRANSCRIPT_MINER_MCP_TOOL_LIMITS",
+    "sync.topic=1,index.transcript=2,transcript.fetch=2,runs.start=1",
+)
+MCP_JOB_TTL_SECONDS = max(60, int(os.getenv("TRANSCRIPT_MINER_MCP_JOB_TTL_SECONDS", "3600")))
 
 
 @dataclass(frozen=True)
@@ -212,8 +236,11 @@ Configs:
     4) `POST /configs/{config_id}` with `validate_only=false` to write
 
 Run + sync:
-- `POST /runs/start` — starts TranscriptMiner for a given config (async) and returns `run_id`
-- `GET /runs/{run_id}` — returns status + log tail
+- `POST /runs/start` — queues a TranscriptMiner run for a given config (async) and returns `run_id`
+  - runs are started FIFO from a persistent queue (max concurrency + one active run per topic)
+- `GET /runs/{run_id}` — returns status + log tail (+ `queue_position` while queued)
+- `POST /runs/{run_id}/cancel` — cancels a queued or running run
+- `GET /runs/{run_id}/events?offset=0` — server-sent events: `state`, `log` (incremental from byte offset), `end`
 - `POST /sync/topic/{topic}` — indexes summaries for a topic into Open WebUI Knowledge (same service)
   - Default: lifecycle routing to derived collections:
     - targets: `<topic>_new` (per channel max N newest) and `<topic>_archive` (rest up to max age)
@@ -234,6 +261,7 @@ Indexing (Knowledge Collections):
 
 Notes:
 - If a tool call fails, reduce output size using `max_chars` and retry.
+- Long MCP tools (`sync.topic`, `index.transcript`, `transcript.fetch`) accept `"async": true`: returns `job_id`, poll via `jobs.status`.
 - If tools are not enabled in the current chat, the model cannot call them.
 - `POST /runs/start` requires `YOUTUBE_API_KEY` and, with LLM enabled, backend-specific auth:
   - `TM_LLM_BACKEND=openrouter`: `OPENROUTER_API_KEY`
@@ -310,6 +338,9 @@ class OutputTextResponse(BaseModel):
     truncated: bool
     text: str
     meta: dict[str, Any] | None = None
+    offset: int = 0
+    next_offset: int | None = Field(default=None, description="Byte cursor for the next page (pass as `offset`).")
+    total_bytes: int | None = None
 
 
 class CapabilitiesResponse(BaseModel):
@@ -369,6 +400,7 @@ class RunStartResponse(BaseModel):
     log_path: str
     summary: str | None = None
     auto_sync: bool = False
+    queue_position: int | None = None
 
 
 class RunStatusResponse(BaseModel):
@@ -381,6 +413,7 @@ class RunStatusResponse(BaseModel):
     exit_code: int | None = None
     config_id: str | None = None
     topic: str | None = None
+    queue_position: int | None = None
     log_tail: str | None = None
     error: str | None = None
     summary: str | None = None
@@ -414,7 +447,7 @@ class SyncTopicRequest(BaseModel):
         default=5,
         ge=1,
         le=60,
-        description="Polling-Intervall für Healing-Status (Sekunden).",
+        description="Fallback-Recheck-Intervall für Healing-Status (Sekunden); Abschluss wird per Run-Event signalisiert.",
     )
     create_knowledge_if_missing: bool = Field(
         default=False,
@@ -450,7 +483,7 @@ class IndexTranscriptRequest(BaseModel):
     knowledge_id: str | None = None
 
 
-from .mcp_rpc import handle_mcp_request, make_tools  # noqa: E402
+from .mcp_rpc import handle_mcp_request, make_tools, parse_async_flag, parse_tool_limits  # noqa: E402
 
 
 def _format_timestamp(seconds: float) -> str:
@@ -581,23 +614,108 @@ def _list_topics() -> list[str]:
     return topics
 
 
+# Sidecar layout: header (magic, indexed source bytes, source mtime_ns, sha256 of the first 4 KiB) followed by
+# one little-endian uint64 byte offset per valid JSON-object line.
+_JSONL_INDEX_MAGIC = b"TMJSONL1"
+_JSONL_INDEX_HEADER = struct.Struct("<8sQQ32s")
+_JSONL_INDEX_HEAD_BYTES = 4096
+_JSONL_INDEX_LOCK = threading.Lock()
+
+
+def _jsonl_index_path(path: str) -> str:
+    digest = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:32]
+    return os.path.join(OUTPUT_INDEX_DIR, f"{digest}.offsets")
+
+
+def _jsonl_head_hash(fh: Any, size: int) -> bytes:
+    fh.seek(0)
+    return hashlib.sha256(fh.read(min(size, _JSONL_INDEX_HEAD_BYTES))).digest()
+
+
+def _scan_jsonl_offsets(fh: Any, start: int) -> list[int]:
+    offsets: list[int] = []
+    fh.seek(start)
+    pos = start
+    for raw in fh:
+        line_start = pos
+        pos += len(raw)
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            if not raw.endswith(b"\n"):
+                # Partial trailing line (writer still appending): index it on the next call.
+                pos = line_start
+            continue
+        if isinstance(obj, dict):
+            offsets.append(line_start)
+    fh.seek(pos)
+    return offsets
+
+
+def _ensure_jsonl_index(path: str) -> str:
+    """Build or extend the sidecar offset index for an (append-mostly) JSONL file and return its path."""
+    idx_path = _jsonl_index_path(path)
+    st = os.stat(path)
+    with _JSONL_INDEX_LOCK, open(path, "rb") as src:
+        indexed_size = 0
+        if os.path.isfile(idx_path):
+            with open(idx_path, "rb") as idx:
+                header = idx.read(_JSONL_INDEX_HEADER.size)
+            if len(header) == _JSONL_INDEX_HEADER.size:
+                magic, indexed_size, mtime_ns, head_hash = _JSONL_INDEX_HEADER.unpack(header)
+                if magic != _JSONL_INDEX_MAGIC:
+                    indexed_size = 0
+                elif indexed_size == st.st_size and mtime_ns == st.st_mtime_ns:
+                    return idx_path
+                elif indexed_size >= st.st_size or head_hash != _jsonl_head_hash(src, indexed_size):
+                    indexed_size = 0
+            else:
+                indexed_size = 0
+
+        os.makedirs(OUTPUT_INDEX_DIR, exist_ok=True)
+        new_offsets = _scan_jsonl_offsets(src, indexed_size)
+        scanned_to = src.tell()
+        header = _JSONL_INDEX_HEADER.pack(
+            _JSONL_INDEX_MAGIC, scanned_to, st.st_mtime_ns, _jsonl_head_hash(src, scanned_to)
+        )
+        payload = struct.pack(f"<{len(new_offsets)}Q", *new_offsets)
+        if indexed_size:
+            with open(idx_path, "r+b") as idx:
+                idx.seek(0, os.SEEK_END)
+                idx.write(payload)
+                idx.seek(0)
+                idx.write(header)
+        else:
+            tmp = f"{idx_path}.tmp"
+            with open(tmp, "wb") as idx:
+                idx.write(header)
+                idx.write(payload)
+            os.replace(tmp, idx_path)
+    return idx_path
+
+
 def _read_jsonl(path: str, *, limit: int, offset: int) -> tuple[int, list[dict[str, Any]]]:
-    total = 0
+    idx_path = _ensure_jsonl_index(path)
     items: list[dict[str, Any]] = []
-    with open(path, "r", encoding="utf-8") as fh:
-        for line in fh:
-            line = line.strip()
-            if not line:
-                continue
+    with open(idx_path, "rb") as idx:
+        total = (os.fstat(idx.fileno()).st_size - _JSONL_INDEX_HEADER.size) // 8
+        if offset >= total:
+            return total, items
+        idx.seek(_JSONL_INDEX_HEADER.size + 8 * offset)
+        count = min(limit, total - offset)
+        offsets = struct.unpack(f"<{count}Q", idx.read(8 * count))
+    with open(path, "rb") as fh:
+        for line_start in offsets:
+            fh.seek(line_start)
             try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if not isinstance(obj, dict):
+                obj = json.loads(fh.readline())
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 continue
-            if total >= offset and len(items) < limit:
+            if isinstance(obj, dict):
                 items.append(obj)
-            total += 1
     return total, items
 
 
@@ -1543,12 +1661,24 @@ def _sync_topic_lifecycle(*, topic: str, req: SyncTopicRequest) -> SyncTopicResp
     )
 
 
-def _read_text_file(path: str, *, max_chars: int) -> tuple[bool, str]:
-    with open(path, "r", encoding="utf-8", errors="replace") as fh:
-        text = fh.read()
-    if max_chars and len(text) > max_chars:
-        return True, text[:max_chars].rstrip() + "\n\n[...truncated...]\n"
-    return False, text
+def _read_text_file(path: str, *, max_chars: int, offset: int = 0) -> tuple[bool, str, int | None]:
+    """Read up to max_chars characters starting at byte `offset`.
+
+    Returns (truncated, text, next_offset); next_offset is the byte cursor for the following page (None at EOF).
+    """
+    with open(path, "rb") as raw:
+        size = os.fstat(raw.fileno()).st_size
+        raw.seek(min(max(0, offset), size))
+        # surrogateescape keeps the byte <-> char mapping exact, so the cursor stays valid for invalid UTF-8 too.
+        fh = io.TextIOWrapper(raw, encoding="utf-8", errors="surrogateescape", newline="")
+        text = fh.read(max_chars) if max_chars else fh.read()
+        consumed = len(text.encode("utf-8", errors="surrogateescape"))
+        fh.detach()
+    next_offset = min(max(0, offset), size) + consumed
+    text = text.encode("utf-8", errors="surrogateescape").decode("utf-8", errors="replace")
+    if next_offset < size:
+        return True, text.rstrip() + "\n\n[...truncated...]\n", next_offset
+    return False, text, None
 
 
 def _validate_yaml(text: str) -> tuple[bool, str | None]:
@@ -1628,18 +1758,42 @@ def _run_log_path(run_id: str) -> str:
     return os.path.join(RUNS_DIR, f"{run_id}.log")
 
 
+_RUN_TERMINAL_STATES = frozenset({"finished", "failed", "cancelled"})
+# Every meta write bumps a per-run sequence number; waiters block on the condition instead of polling.
+_RUN_STATE_COND = threading.Condition()
+_RUN_STATE_SEQ: dict[str, int] = {}
+
+
+def _notify_run_state(run_id: str) -> None:
+    with _RUN_STATE_COND:
+        _RUN_STATE_SEQ[run_id] = _RUN_STATE_SEQ.get(run_id, 0) + 1
+        _RUN_STATE_COND.notify_all()
+
+
+def _run_state_seq(run_id: str) -> int:
+    with _RUN_STATE_COND:
+        return _RUN_STATE_SEQ.get(run_id, 0)
+
+
+def _wait_run_state_change(run_id: str, seq: int, timeout_s: float) -> int:
+    with _RUN_STATE_COND:
+        _RUN_STATE_COND.wait_for(lambda: _RUN_STATE_SEQ.get(run_id, 0) != seq, timeout=max(0.0, timeout_s))
+        return _RUN_STATE_SEQ.get(run_id, 0)
+
+
 def _write_run_meta(run_id: str, meta: dict[str, Any]) -> None:
     os.makedirs(RUNS_DIR, exist_ok=True)
     path = _run_meta_path(run_id)
     _atomic_write(path, json.dumps(meta, ensure_ascii=False, indent=2) + "\n")
+    _notify_run_state(run_id)
 
 
-def _append_run_log(run_id: str, message: str) -> None:
+def _append_run_log(run_id: str, message: str, *, tag: str = "auto-sync") -> None:
     try:
         path = _run_log_path(run_id)
         ts = datetime.now(timezone.utc).isoformat()
         with open(path, "a", encoding="utf-8") as fh:
-            fh.write(f"[auto-sync {ts}] {message}\n")
+            fh.write(f"[{tag} {ts}] {message}\n")
     except Exception:
         pass
 
@@ -1787,21 +1941,30 @@ def _heal_missing_summaries(
         return False, f"no config found for topic: {topic}"
 
     resp = start_run(RunStartRequest(config_id=config_id, only=["llm"]))
-    if resp.status != "started" or not resp.run_id:
+    if resp.status not in ("started", "queued") or not resp.run_id:
         return False, resp.summary or "failed to start healing run"
 
-    deadline = time.time() + max(30, int(timeout_s))
-    while time.time() < deadline:
-        status = get_run(resp.run_id)
-        if status.state in ("finished", "failed"):
-            if status.exit_code == 0:
-                return True, None
-            return False, status.summary or status.error or f"healing exit_code={status.exit_code}"
-        time.sleep(max(1, int(poll_s)))
+    status = _wait_for_run_completion(resp.run_id, timeout_s=max(30, int(timeout_s)), recheck_s=max(1, int(poll_s)))
+    if status.state in _RUN_TERMINAL_STATES:
+        if status.exit_code == 0:
+            return True, None
+        return False, status.summary or status.error or f"healing exit_code={status.exit_code}"
 
     return False, "healing timeout"
 
 
+def _wait_for_run_completion(run_id: str, *, timeout_s: float, recheck_s: float = 30.0) -> "RunStatusResponse":
+    """Block until the run reaches a terminal state (or timeout); wakes on meta writes, rechecks every recheck_s."""
+    deadline = time.time() + timeout_s
+    while True:
+        seq = _run_state_seq(run_id)
+        status = get_run(run_id)
+        remaining = deadline - time.time()
+        if status.state in _RUN_TERMINAL_STATES or status.state == "not_found" or remaining <= 0:
+            return status
+        _wait_run_state_change(run_id, seq, min(remaining, recheck_s))
+
+
 def _queue_auto_sync(run_id: str, topic: str) -> None:
     def _worker() -> None:
         try:
@@ -1837,26 +2000,218 @@ def _queue_auto_sync(run_id: str, topic: str) -> None:
     t.start()
 
 
+def _finish_run(run_id: str, exit_code: int | None, topic: str | None) -> None:
+    meta = _read_run_meta(run_id) or {"run_id": run_id}
+    meta["exit_code"] = exit_code
+    meta["finished_at"] = meta.get("finished_at") or datetime.now(timezone.utc).isoformat()
+    meta["state"] = "cancelled" if meta.get("cancel_requested") else "finished"
+    _write_run_meta(run_id, meta)
+    _run_queue_finish(run_id, meta["state"])
+    _schedule_runs()
+    if meta["state"] == "cancelled":
+        return
+    if AUTO_SYNC_AFTER_RUN and topic:
+        if meta.get("auto_sync_state") not in {"running", "finished", "failed"}:
+            meta["auto_sync_state"] = "queued"
+            _write_run_meta(run_id, meta)
+            if exit_code != 0:
+                _append_run_log(run_id, f"auto-sync queued despite non-zero exit (exit_code={exit_code})")
+            _queue_auto_sync(run_id, topic)
+
+
 def _watch_run_for_autosync(run_id: str, proc: subprocess.Popen[Any], topic: str | None) -> None:
     def _worker() -> None:
         exit_code = proc.wait()
-        meta = _read_run_meta(run_id) or {}
-        meta["exit_code"] = int(exit_code)
-        meta["finished_at"] = meta.get("finished_at") or datetime.now(timezone.utc).isoformat()
-        meta["state"] = "finished"
-        _write_run_meta(run_id, meta)
-        if AUTO_SYNC_AFTER_RUN and topic:
-            if meta.get("auto_sync_state") not in {"running", "finished", "failed"}:
-                meta["auto_sync_state"] = "queued"
-                _write_run_meta(run_id, meta)
-                if exit_code != 0:
-                    _append_run_log(run_id, f"auto-sync queued despite non-zero exit (exit_code={exit_code})")
-                _queue_auto_sync(run_id, topic)
+        RUN_PROCS.pop(run_id, None)
+        _finish_run(run_id, int(exit_code), topic)
+
+    t = threading.Thread(target=_worker, daemon=True)
+    t.start()
+
+
+_RUN_SCHED_LOCK = threading.Lock()
+
+
+def _init_runs_db() -> None:
+    os.makedirs(os.path.dirname(INDEXER_DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(INDEXER_DB_PATH, timeout=30)
+    try:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS run_queue (
+              run_id TEXT PRIMARY KEY,
+              state TEXT NOT NULL,
+              topic TEXT,
+              config_id TEXT NOT NULL,
+              command_json TEXT NOT NULL,
+              pid INTEGER,
+              enqueued_at REAL NOT NULL,
+              started_at TEXT,
+              finished_at TEXT
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_run_queue_state ON run_queue(state, enqueued_at)")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _runs_db() -> sqlite3.Connection:
+    return sqlite3.connect(INDEXER_DB_PATH, timeout=30)
+
+
+def _run_queue_position(run_id: str) -> int | None:
+    conn = _runs_db()
+    try:
+        row = conn.execute("SELECT state, enqueued_at FROM run_queue WHERE run_id = ?", (run_id,)).fetchone()
+        if not row or row[0] != "queued":
+            return None
+        ahead = conn.execute(
+            """
+            SELECT COUNT(*) FROM run_queue
+            WHERE state = 'queued' AND (enqueued_at < ? OR (enqueued_at = ? AND run_id < ?))
+            """,
+            (row[1], row[1], run_id),
+        ).fetchone()[0]
+        return int(ahead) + 1
+    finally:
+        conn.close()
+
+
+def _run_queue_finish(run_id: str, state: str) -> None:
+    conn = _runs_db()
+    try:
+        conn.execute(
+            "UPDATE run_queue SET state = ?, finished_at = ? WHERE run_id = ? AND state = 'running'",
+            (state, datetime.now(timezone.utc).isoformat(), run_id),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _is_run_process(pid: int) -> bool:
+    # PIDs get reused after a container restart; only trust a pid that still runs transcript_miner.
+    if (_proc_state(pid) or "Z").startswith("Z"):
+        return False
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as fh:
+            return b"transcript_miner" in fh.read()
+    except Exception:
+        return False
+
+
+def _launch_run(run_id: str, cmd: list[str], topic: str | None) -> subprocess.Popen[Any]:
+    os.makedirs(RUNS_DIR, exist_ok=True)
+    log_fh = open(_run_log_path(run_id), "ab", buffering=0)
+    proc = subprocess.Popen(
+        cmd,
+        cwd="/",
+        stdout=log_fh,
+        stderr=subprocess.STDOUT,
+        env=os.environ.copy(),
+    )
+    RUN_PROCS[run_id] = proc
+    meta = _read_run_meta(run_id) or {"run_id": run_id}
+    meta["state"] = "running"
+    meta["pid"] = proc.pid
+    meta["started_at"] = datetime.now(timezone.utc).isoformat()
+    _write_run_meta(run_id, meta)
+    _watch_run_for_autosync(run_id, proc, topic)
+    return proc
+
+
+def _schedule_runs() -> None:
+    """Start queued runs (FIFO) while respecting max concurrency and one active run per topic."""
+    with _RUN_SCHED_LOCK:
+        conn = _runs_db()
+        try:
+            running = conn.execute("SELECT topic FROM run_queue WHERE state = 'running'").fetchall()
+            busy_topics = {str(r[0]) for r in running if r[0]}
+            slots = RUN_MAX_CONCURRENCY - len(running)
+            if slots <= 0:
+                return
+            queued = conn.execute(
+                "SELECT run_id, topic, command_json FROM run_queue WHERE state = 'queued' ORDER BY enqueued_at, run_id"
+            ).fetchall()
+            for run_id, topic, command_json in queued:
+                if slots <= 0:
+                    break
+                if topic and topic in busy_topics:
+                    continue
+                now = datetime.now(timezone.utc).isoformat()
+                # Claim the row before starting the process: a run that exits quickly finishes it from its watcher.
+                claimed = conn.execute(
+                    "UPDATE run_queue SET state = 'running', started_at = ? WHERE run_id = ? AND state = 'queued'",
+                    (now, run_id),
+                )
+                conn.commit()
+                if claimed.rowcount != 1:
+                    continue
+                try:
+                    proc = _launch_run(run_id, json.loads(command_json), topic)
+                except Exception as exc:
+                    conn.execute(
+                        "UPDATE run_queue SET state = 'failed', finished_at = ? WHERE run_id = ?",
+                        (now, run_id),
+                    )
+                    conn.commit()
+                    meta = _read_run_meta(run_id) or {"run_id": run_id}
+                    meta.update({"state": "failed", "finished_at": now, "error": f"launch failed: {exc}"[:2000]})
+                    _write_run_meta(run_id, meta)
+                    continue
+                conn.execute(
+                    "UPDATE run_queue SET pid = ? WHERE run_id = ? AND state = 'running'",
+                    (proc.pid, run_id),
+                )
+                conn.commit()
+                slots -= 1
+                if topic:
+                    busy_topics.add(str(topic))
+        finally:
+            conn.close()
+
+
+def _watch_recovered_run(run_id: str, pid: int, topic: str | None) -> None:
+    def _worker() -> None:
+        while _is_run_process(pid):
+            time.sleep(RUN_RECOVERY_POLL_SECONDS)
+        # Not our child after a restart: the exit status is only known if we can still reap it.
+        _finish_run(run_id, _reap_if_zombie(pid), topic)
 
     t = threading.Thread(target=_worker, daemon=True)
     t.start()
 
 
+def _recover_run_queue() -> None:
+    conn = _runs_db()
+    try:
+        rows = conn.execute("SELECT run_id, pid, topic FROM run_queue WHERE state = 'running'").fetchall()
+        for run_id, pid, topic in rows:
+            try:
+                if isinstance(pid, int) and _is_run_process(pid):
+                    _watch_recovered_run(run_id, pid, topic)
+                    continue
+                # Process died with the previous server instance: re-queue at its original position.
+                conn.execute(
+                    "UPDATE run_queue SET state = 'queued', pid = NULL, started_at = NULL WHERE run_id = ?", (run_id,)
+                )
+                conn.commit()
+                meta = _read_run_meta(run_id) or {"run_id": run_id}
+                meta.update({"state": "queued", "pid": None, "exit_code": None, "finished_at": None})
+                _write_run_meta(run_id, meta)
+                _append_run_log(run_id, "run interrupted by restart; re-queued", tag="run-queue")
+            except Exception as exc:
+                meta = _read_run_meta(run_id) or {"run_id": run_id}
+                meta["error"] = f"run queue recovery failed: {exc}"[:2000]
+                _write_run_meta(run_id, meta)
+                _append_run_log(run_id, f"recovery failed: {exc}", tag="run-queue")
+    finally:
+        conn.close()
+    _schedule_runs()
+
+
 def _fetch_with_retries(transcript_obj: Any, retries: int) -> list[dict[str, Any]]:
     last_exc: Exception | None = None
     for attempt in range(retries + 1):
@@ -1874,6 +2229,101 @@ def _fetch_with_retries(transcript_obj: Any, retries: int) -> list[dict[str, Any
     raise last_exc
 
 
+# Read-through cache for transcript.fetch: rendered (untruncated) text keyed by (video_id, ordered preferred
+# languages, timestamps), so a hit is always the track the same preference list selected.
+_TRANSCRIPT_CACHE_LOCK = threading.Lock()
+_TRANSCRIPT_CACHE: "OrderedDict[tuple[str, tuple[str, ...], bool], tuple[float, dict[str, Any]]]" = OrderedDict()
+
+
+def _transcript_cache_get(video_id: str, languages: list[str], include_timestamps: bool) -> dict[str, Any] | None:
+    if FETCH_CACHE_SIZE <= 0:
+        return None
+    key = (video_id, tuple(languages), include_timestamps)
+    with _TRANSCRIPT_CACHE_LOCK:
+        hit = _TRANSCRIPT_CACHE.get(key)
+        if hit is None:
+            return None
+        if FETCH_CACHE_TTL_SECONDS and time.time() - hit[0] > FETCH_CACHE_TTL_SECONDS:
+            _TRANSCRIPT_CACHE.pop(key, None)
+            return None
+        _TRANSCRIPT_CACHE.move_to_end(key)
+        return hit[1]
+
+
+def _transcript_cache_put(video_id: str, languages: list[str], include_timestamps: bool, entry: dict[str, Any]) -> None:
+    if FETCH_CACHE_SIZE <= 0:
+        return
+    key = (video_id, tuple(languages), include_timestamps)
+    with _TRANSCRIPT_CACHE_LOCK:
+        _TRANSCRIPT_CACHE[key] = (time.time(), entry)
+        _TRANSCRIPT_CACHE.move_to_end(key)
+        while len(_TRANSCRIPT_CACHE) > FETCH_CACHE_SIZE:
+            _TRANSCRIPT_CACHE.popitem(last=False)
+
+
+def _transcript_from_local_store(video_id: str, languages: list[str] | None) -> dict[str, Any] | None:
+    """Return a transcript the miner already saved (plain text, no timestamps), if usable."""
+    try:
+        vid = _safe_id(video_id, label="video_id")
+    except ValueError:
+        return None
+    base = os.path.join(OUTPUT_DIR, "data", "transcripts", "by_video_id")
+    text_path = os.path.join(base, f"{vid}.txt")
+    if not os.path.isfile(text_path):
+        return None
+    meta: dict[str, Any] = {}
+    meta_path = os.path.join(base, f"{vid}.meta.json")
+    if os.path.isfile(meta_path):
+        try:
+            loaded = json.loads(Path(meta_path).read_text(encoding="utf-8"))
+            meta = loaded if isinstance(loaded, dict) else {}
+        except Exception:
+            return None
+    status = meta.get("transcript_status")
+    if isinstance(status, str) and status != "success":
+        return None
+    language = meta.get("language")
+    # Saved transcripts don't always record their language. For explicit requests only the first preferred
+    # language is served: whether a more preferred track exists is unknown without asking YouTube.
+    if languages is not None and (not languages or language != languages[0]):
+        return None
+    try:
+        text = Path(text_path).read_text(encoding="utf-8").strip()
+    except Exception:
+        return None
+    if not text:
+        return None
+    return {"text": text, "language": language, "is_generated": meta.get("is_generated")}
+
+
+def _transcript_success(entry: dict[str, Any], *, max_chars: int, source: str) -> dict[str, Any]:
+    text = str(entry["text"])
+    truncated = False
+    if max_chars and len(text) > max_chars:
+        text = text[:max_chars].rstrip() + "\n\n[...truncated...]\n"
+        truncated = True
+
+    sha256 = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return {
+        "status": "success",
+        "text": text,
+        "meta": {
+            "language": entry.get("language"),
+            "is_generated": entry.get("is_generated"),
+            "sha256": sha256,
+            "truncated": truncated,
+            "max_chars": max_chars,
+            "source": source,
+        },
+    }
+
+
+@app.on_event("startup")
+def _startup_recover_runs() -> None:
+    _init_runs_db()
+    _recover_run_queue()
+
+
 @app.get("/healthz", include_in_schema=False)
 def healthz() -> dict[str, str]:
     return {"status": "ok"}
@@ -1941,6 +2391,9 @@ def _mcp_call_tool(name: str, args: dict[str, Any]) -> Any:
     if name == "runs.status":
         req = RunStatusMcpRequest.model_validate(args)
         return get_run(req.run_id).model_dump()
+    if name == "runs.cancel":
+        req = RunStatusMcpRequest.model_validate(args)
+        return cancel_run(req.run_id).model_dump()
     if name == "sync.topic":
         req = SyncTopicMcpRequest.model_validate(args)
         return sync_topic(req.topic, req).model_dump()
@@ -1953,9 +2406,125 @@ def _mcp_call_tool(name: str, args: dict[str, Any]) -> Any:
     raise ValueError(f"Unknown tool: {name}")
 
 
+# Tool calls run on dedicated pools so blocking HTTP/sleep-polling never stalls the event loop. Request dispatch and
+# async jobs use separate pools, and a job over its tool limit waits in _MCP_TOOL_PENDING instead of parking a
+# worker thread, so a busy tool never blocks `jobs.status` or other requests.
+_MCP_EXECUTOR = ThreadPoolExecutor(max_workers=MCP_WORKERS, thread_name_prefix="mcp-tool")
+_MCP_JOB_EXECUTOR = ThreadPoolExecutor(max_workers=MCP_WORKERS, thread_name_prefix="mcp-job")
+_MCP_TOOL_LIMITS = parse_tool_limits(MCP_TOOL_LIMITS_RAW)
+_MCP_TOOL_SLOTS = threading.Condition()  # guards _MCP_TOOL_ACTIVE/_MCP_TOOL_PENDING
+_MCP_TOOL_ACTIVE: dict[str, int] = {}
+_MCP_TOOL_PENDING: dict[str, deque[tuple[str, str, dict[str, Any]]]] = {}
+_MCP_JOBS_LOCK = threading.Lock()
+_MCP_JOBS: dict[str, dict[str, Any]] = {}
+
+
+def _mcp_call_tool_limited(name: str, args: dict[str, Any]) -> Any:
+    limit = _MCP_TOOL_LIMITS.get(name)
+    if limit is None:
+        return _mcp_call_tool(name, args)
+    with _MCP_TOOL_SLOTS:
+        while _MCP_TOOL_ACTIVE.get(name, 0) >= limit:
+            _MCP_TOOL_SLOTS.wait()
+        _MCP_TOOL_ACTIVE[name] = _MCP_TOOL_ACTIVE.get(name, 0) + 1
+    try:
+        return _mcp_call_tool(name, args)
+    finally:
+        _mcp_tool_release(name)
+
+
+def _mcp_tool_release(name: str) -> None:
+    with _MCP_TOOL_SLOTS:
+        queue = _MCP_TOOL_PENDING.get(name)
+        # A queued job takes over the slot; otherwise free it for waiting synchronous calls.
+        nxt = queue.popleft() if queue else None
+        if nxt is None:
+            _MCP_TOOL_ACTIVE[name] -= 1
+        _MCP_TOOL_SLOTS.notify_all()
+    if nxt is not None:
+        _MCP_JOB_EXECUTOR.submit(_mcp_job_run, *nxt)
+
+
+def _mcp_jobs_prune(now: float) -> None:
+    # Caller holds _MCP_JOBS_LOCK.
+    expired = [
+        job_id
+        for job_id, job in _MCP_JOBS.items()
+        if job.get("finished_ts") is not None and now - float(job["finished_ts"]) > MCP_JOB_TTL_SECONDS
+    ]
+    for job_id in expired:
+        _MCP_JOBS.pop(job_id, None)
+
+
+def _mcp_job_run(job_id: str, name: str, args: dict[str, Any]) -> None:
+    with _MCP_JOBS_LOCK:
+        _MCP_JOBS[job_id]["state"] = "running"
+        _MCP_JOBS[job_id]["started_at"] = datetime.now(timezone.utc).isoformat()
+    try:
+        result = _mcp_call_tool(name, args)
+        update: dict[str, Any] = {"state": "finished", "result": result}
+    except Exception as e:
+        update = {"state": "failed", "error": str(e)}
+    finally:
+        if name in _MCP_TOOL_LIMITS:
+            _mcp_tool_release(name)
+    update["finished_at"] = datetime.now(timezone.utc).isoformat()
+    update["finished_ts"] = time.time()
+    with _MCP_JOBS_LOCK:
+        _MCP_JOBS[job_id].update(update)
+
+
+def _mcp_job_submit(name: str, args: dict[str, Any]) -> dict[str, Any]:
+    job_id = uuid.uuid4().hex
+    with _MCP_JOBS_LOCK:
+        _mcp_jobs_prune(time.time())
+        _MCP_JOBS[job_id] = {
+            "job_id": job_id,
+            "tool": name,
+            "state": "queued",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+    queued = {"job_id": job_id, "tool": name, "state": "queued", "summary": f"Job gestartet. Status via `jobs.status` mit job_id={job_id}."}
+    limit = _MCP_TOOL_LIMITS.get(name)
+    if limit is not None:
+        with _MCP_TOOL_SLOTS:
+            if _MCP_TOOL_ACTIVE.get(name, 0) >= limit:
+                # Started by _mcp_tool_release once a slot frees up.
+                _MCP_TOOL_PENDING.setdefault(name, deque()).append((job_id, name, args))
+                return queued
+            _MCP_TOOL_ACTIVE[name] = _MCP_TOOL_ACTIVE.get(name, 0) + 1
+    _MCP_JOB_EXECUTOR.submit(_mcp_job_run, job_id, name, args)
+    return queued
+
+
+def _mcp_job_status(job_id: str) -> dict[str, Any]:
+    with _MCP_JOBS_LOCK:
+        _mcp_jobs_prune(time.time())
+        job = _MCP_JOBS.get(job_id)
+        if job is None:
+            return {"job_id": job_id, "state": "unknown", "error": "job not found (expired or server restarted)"}
+        return {k: v for k, v in job.items() if k != "finished_ts"}
+
+
+def _mcp_dispatch(name: str, args: dict[str, Any]) -> Any:
+    if name == "jobs.status":
+        job_id = str((args or {}).get("job_id") or "").strip()
+        if not job_id:
+            raise ValueError("job_id required")
+        return _mcp_job_status(job_id)
+    args = dict(args or {})
+    if parse_async_flag(args):
+        return _mcp_job_submit(name, args)
+    return _mcp_call_tool_limited(name, args)
+
+
 @app.post("/mcp", include_in_schema=False)
 async def mcp(payload: dict[str, Any]) -> JSONResponse:
-    res = handle_mcp_request(payload=payload, tools=_MCP_TOOLS, call_tool=_mcp_call_tool)
+    loop = asyncio.get_running_loop()
+    res = await loop.run_in_executor(
+        _MCP_EXECUTOR,
+        partial(handle_mcp_request, payload=payload, tools=_MCP_TOOLS, call_tool=_mcp_dispatch),
+    )
     return JSONResponse(res)
 
 @app.get("/capabilities", summary="Describe tool capabilities", operation_id="capabilities")
@@ -2051,7 +2620,7 @@ def write_config(config_id: str, req: ConfigWriteRequest) -> ConfigWriteResponse
     )
 
 
-@app.post("/runs/start", summary="Start TranscriptMiner run (async)", operation_id="runs_start")
+@app.post("/runs/start", summary="Queue TranscriptMiner run (async)", operation_id="runs_start")
 def start_run(req: RunStartRequest) -> RunStartResponse:
     resolved = _resolve_config_id(req.config_id)
     if not resolved:
@@ -2077,7 +2646,9 @@ def start_run(req: RunStartRequest) -> RunStartResponse:
 
     rewritten, topic = _rewrite_config_for_container(config_text or "")
     run_id = uuid.uuid4().hex
-    tmp_cfg = f"/tmp/{run_id}.yaml"
+    # Keep the rewritten config next to the run meta so queued runs survive a container restart.
+    os.makedirs(RUNS_DIR, exist_ok=True)
+    tmp_cfg = os.path.join(RUNS_DIR, f"{run_id}.yaml")
     _atomic_write(tmp_cfg, rewritten)
 
     cmd: list[str] = ["python", "-m", "transcript_miner", "--config", tmp_cfg]
@@ -2094,22 +2665,13 @@ def start_run(req: RunStartRequest) -> RunStartResponse:
     if req.report_lang:
         cmd.extend(["--report-lang", req.report_lang])
 
-    os.makedirs(RUNS_DIR, exist_ok=True)
     log_path = _run_log_path(run_id)
-    log_fh = open(log_path, "ab", buffering=0)
-    proc = subprocess.Popen(
-        cmd,
-        cwd="/",
-        stdout=log_fh,
-        stderr=subprocess.STDOUT,
-        env=os.environ.copy(),
-    )
-    RUN_PROCS[run_id] = proc
     meta = {
         "run_id": run_id,
-        "state": "running",
-        "pid": proc.pid,
-        "started_at": datetime.now(timezone.utc).isoformat(),
+        "state": "queued",
+        "pid": None,
+        "queued_at": datetime.now(timezone.utc).isoformat(),
+        "started_at": None,
         "finished_at": None,
         "exit_code": None,
         "config_id": config_filename,
@@ -2119,16 +2681,36 @@ def start_run(req: RunStartRequest) -> RunStartResponse:
         "tmp_config_path": tmp_cfg,
     }
     _write_run_meta(run_id, meta)
-    _watch_run_for_autosync(run_id, proc, topic)
-    summary = f"Run gestartet. ID: {run_id}. Config: {config_filename}."
+    conn = _runs_db()
+    try:
+        conn.execute(
+            """
+            INSERT INTO run_queue(run_id, state, topic, config_id, command_json, enqueued_at)
+            VALUES(?, 'queued', ?, ?, ?, ?)
+            """,
+            (run_id, topic, config_filename, json.dumps(cmd), time.time()),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    _schedule_runs()
+
+    position = _run_queue_position(run_id)
+    if position is None:
+        status = "started"
+        summary = f"Run gestartet. ID: {run_id}. Config: {config_filename}."
+    else:
+        status = "queued"
+        summary = f"Run eingereiht. ID: {run_id}. Config: {config_filename}. Position: {position}."
     return RunStartResponse(
-        status="started",
+        status=status,
         run_id=run_id,
         topic=topic,
         command=cmd,
         log_path=log_path,
         summary=summary,
         auto_sync=AUTO_SYNC_AFTER_RUN,
+        queue_position=position,
     )
 
 
@@ -2155,7 +2737,7 @@ def get_run(run_id: str) -> RunStatusResponse:
                 RUN_PROCS.pop(run_id, None)
                 meta["exit_code"] = int(polled)
                 meta["finished_at"] = meta.get("finished_at") or datetime.now(timezone.utc).isoformat()
-                meta["state"] = "finished"
+                meta["state"] = "cancelled" if meta.get("cancel_requested") else "finished"
         else:
             reaped = _reap_if_zombie(pid)
             if reaped is not None:
@@ -2172,7 +2754,20 @@ def get_run(run_id: str) -> RunStatusResponse:
                     meta["finished_at"] = meta.get("finished_at") or datetime.now(timezone.utc).isoformat()
                     meta["state"] = "finished"
 
+    if meta.get("state") == "finished" and meta.get("cancel_requested"):
+        meta["state"] = "cancelled"
+    if meta.get("state") == "cancelled" and state == "running":
+        _write_run_meta(run_id, meta)
+        _run_queue_finish(run_id, "cancelled")
+        _schedule_runs()
+        state = "cancelled"
+        finished_at = meta.get("finished_at")
+        exit_code = meta.get("exit_code")
+
     if meta.get("state") == "finished":
+        if state == "running":
+            _run_queue_finish(run_id, "finished")
+            _schedule_runs()
         _write_run_meta(run_id, meta)
         state = meta["state"]
         finished_at = meta.get("finished_at")
@@ -2188,6 +2783,7 @@ def get_run(run_id: str) -> RunStatusResponse:
             _queue_auto_sync(run_id, str(meta.get("topic")))
 
     log_tail = _tail_file(_run_log_path(run_id))
+    queue_position: int | None = None
     block_alert = None
     if log_tail:
         if "YouTube IP Block detected" in log_tail or "YouTube blocked the request" in log_tail:
@@ -2200,7 +2796,12 @@ def get_run(run_id: str) -> RunStatusResponse:
     elif state == "running":
         summary = f"Run läuft. ID: {run_id}."
     elif state == "queued":
-        summary = f"Run queued. ID: {run_id}."
+        queue_position = _run_queue_position(run_id)
+        summary = f"Run queued. ID: {run_id}. Position: {queue_position}."
+    elif state == "cancelled":
+        summary = f"Run abgebrochen. ID: {run_id}."
+    elif state == "failed":
+        summary = f"Run fehlgeschlagen. ID: {run_id}. {meta.get('error') or ''}".strip()
     return RunStatusResponse(
         status="success",
         run_id=run_id,
@@ -2211,6 +2812,7 @@ def get_run(run_id: str) -> RunStatusResponse:
         exit_code=exit_code if isinstance(exit_code, int) else None,
         config_id=meta.get("config_id"),
         topic=meta.get("topic"),
+        queue_position=queue_position,
         log_tail=log_tail,
         error=block_alert or meta.get("error"),
         summary=summary,
@@ -2223,6 +2825,119 @@ def get_run(run_id: str) -> RunStatusResponse:
     )
 
 
+@app.post("/runs/{run_id}/cancel", summary="Cancel a queued or running run", operation_id="runs_cancel")
+def cancel_run(run_id: str) -> RunStatusResponse:
+    with _RUN_SCHED_LOCK:
+        conn = _runs_db()
+        try:
+            row = conn.execute("SELECT state, pid FROM run_queue WHERE run_id = ?", (run_id,)).fetchone()
+            if row and row[0] == "queued":
+                now = datetime.now(timezone.utc).isoformat()
+                conn.execute("UPDATE run_queue SET state = 'cancelled', finished_at = ? WHERE run_id = ?", (now, run_id))
+                conn.commit()
+                meta = _read_run_meta(run_id) or {"run_id": run_id}
+                meta.update({"state": "cancelled", "finished_at": now, "cancel_requested": True})
+                _write_run_meta(run_id, meta)
+            elif row and row[0] == "running":
+                meta = _read_run_meta(run_id) or {"run_id": run_id}
+                meta["cancel_requested"] = True
+                _write_run_meta(run_id, meta)
+                proc = RUN_PROCS.get(run_id)
+                if proc is not None:
+                    proc.terminate()
+                elif isinstance(row[1], int) and _is_run_process(row[1]):
+                    os.kill(row[1], signal.SIGTERM)
+                _append_run_log(run_id, "cancel requested", tag="run-queue")
+        finally:
+            conn.close()
+    return get_run(run_id)
+
+
+def _sse(event: str, data: dict[str, Any], *, event_id: int | None = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False))
+    return "\n".join(lines) + "\n\n"
+
+
+def _run_event_stream(run_id: str, offset: int):
+    log_path = _run_log_path(run_id)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    seq = _run_state_seq(run_id)
+    meta = _read_run_meta(run_id) or {}
+    last_state: tuple[Any, ...] | None = None
+    last_send = time.time()
+    while True:
+        state = meta.get("state") or "unknown"
+        current = (state, meta.get("exit_code"), meta.get("auto_sync_state"))
+        if current != last_state:
+            last_state = current
+            last_send = time.time()
+            yield _sse(
+                "state",
+                {
+                    "run_id": run_id,
+                    "state": state,
+                    "exit_code": meta.get("exit_code"),
+                    "queue_position": _run_queue_position(run_id) if state == "queued" else None,
+                    "auto_sync_state": meta.get("auto_sync_state"),
+                },
+            )
+
+        try:
+            size = os.path.getsize(log_path)
+        except OSError:
+            size = 0
+        if offset > size:
+            offset = size
+        while offset < size:
+            with open(log_path, "rb") as fh:
+                fh.seek(offset)
+                chunk = fh.read(min(size - offset, RUN_EVENTS_CHUNK_BYTES))
+            if not chunk:
+                break
+            offset += len(chunk)
+            last_send = time.time()
+            yield _sse("log", {"next_offset": offset, "text": decoder.decode(chunk)}, event_id=offset)
+
+        auto_sync_pending = meta.get("auto_sync_state") in {"queued", "running"}
+        if state in _RUN_TERMINAL_STATES and not auto_sync_pending:
+            yield _sse("end", {"run_id": run_id, "state": state, "exit_code": meta.get("exit_code"), "next_offset": offset})
+            return
+        if time.time() - last_send >= 15:
+            last_send = time.time()
+            yield ": keepalive\n\n"
+
+        # Wake immediately on state changes; otherwise re-check the log file for growth.
+        new_seq = _wait_run_state_change(run_id, seq, RUN_EVENTS_POLL_SECONDS)
+        if new_seq != seq:
+            seq = new_seq
+            meta = _read_run_meta(run_id) or meta
+
+
+@app.get("/runs/{run_id}/events", summary="Follow run log + state (server-sent events)", operation_id="runs_events")
+def run_events(
+    run_id: str,
+    offset: int = Query(default=0, ge=0, description="Log byte offset to start from"),
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+):
+    try:
+        rid = _safe_id(run_id, label="run_id")
+    except ValueError:
+        return JSONResponse({"status": "error", "error": "invalid run_id"}, status_code=400)
+    if _read_run_meta(rid) is None:
+        return JSONResponse({"status": "not_found", "run_id": rid}, status_code=404)
+    if last_event_id and last_event_id.isdigit():
+        offset = int(last_event_id)
+    return StreamingResponse(
+        _run_event_stream(rid, offset),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 def _sync_topic_impl(safe_topic: str, req: SyncTopicRequest) -> SyncTopicResponse:
     cfg = _load_owui_collections_config()
     # Guard: lifecycle expects base topics, not already-suffixed derived targets.
@@ -2476,6 +3191,7 @@ def list_topic_videos(
 def get_output_transcript(
     video_id: str,
     max_chars: int = Query(default=20_000, ge=0, le=500_000),
+    offset: int = Query(default=0, ge=0, description="Byte offset (use `next_offset` from the previous page)"),
 ) -> OutputTextResponse:
     try:
         vid = _safe_id(video_id, label="video_id")
@@ -2486,7 +3202,7 @@ def get_output_transcript(
     if not os.path.isfile(transcript_path):
         return OutputTextResponse(status="not_found", video_id=vid, path=transcript_path, truncated=False, text="", meta=None)
 
-    truncated, text = _read_text_file(transcript_path, max_chars=max_chars)
+    truncated, text, next_offset = _read_text_file(transcript_path, max_chars=max_chars, offset=offset)
     meta_path = os.path.join(OUTPUT_DIR, "data", "transcripts", "by_video_id", f"{vid}.meta.json")
     meta: dict[str, Any] | None = None
     if os.path.isfile(meta_path):
@@ -2504,6 +3220,9 @@ def get_output_transcript(
         truncated=truncated,
         text=text,
         meta=meta,
+        offset=offset,
+        next_offset=next_offset,
+        total_bytes=os.path.getsize(transcript_path),
     )
 
 
@@ -2511,6 +3230,7 @@ def get_output_transcript(
 def get_output_summary(
     video_id: str,
     max_chars: int = Query(default=30_000, ge=0, le=500_000),
+    offset: int = Query(default=0, ge=0, description="Byte offset (use `next_offset` from the previous page)"),
 ) -> OutputTextResponse:
     try:
         vid = _safe_id(video_id, label="video_id")
@@ -2521,7 +3241,7 @@ def get_output_summary(
     if not os.path.isfile(summary_path):
         return OutputTextResponse(status="not_found", video_id=vid, path=summary_path, truncated=False, text="", meta=None)
 
-    truncated, text = _read_text_file(summary_path, max_chars=max_chars)
+    truncated, text, next_offset = _read_text_file(summary_path, max_chars=max_chars, offset=offset)
     return OutputTextResponse(
         status="success",
         video_id=vid,
@@ -2529,33 +3249,46 @@ def get_output_summary(
         truncated=truncated,
         text=text,
         meta=None,
+        offset=offset,
+        next_offset=next_offset,
+        total_bytes=os.path.getsize(summary_path),
     )
 
 
 @app.post("/transcript")
 def transcript(req: TranscriptRequest) -> dict[str, Any]:
     preferred = req.preferred_languages or DEFAULT_LANGUAGES
+    if FETCH_USE_LOCAL_STORE and not req.include_timestamps:
+        local = _transcript_from_local_store(req.video_id, req.preferred_languages)
+        if local is not None:
+            return _transcript_success(local, max_chars=req.max_chars, source="local_store")
+    cached = _transcript_cache_get(req.video_id, preferred, req.include_timestamps)
+    if cached is not None:
+        return _transcript_success(cached, max_chars=req.max_chars, source="cache")
     try:
         transcripts = YouTubeTranscriptApi.list_transcripts(req.video_id)
 
         items: list[dict[str, Any]] | None = None
         last_exc: Exception | None = None
 
-        for lang in preferred:
-            for finder in ("manual", "generated"):
-                try:
-                    if finder == "manual":
-                        chosen = transcripts.find_manually_created_transcript([lang])
-                    else:
-                        chosen = transcripts.find_generated_transcript([lang])
-                    items = _fetch_with_retries(chosen, retries=FETCH_RETRIES)
-                    if items:
-                        break
-                except Exception as e:
-                    last_exc = e
-                    items = None
-            if items:
-                break
+        # Preference order (language first, manual before generated), limited to the tracks the listing offers.
+        available = {(t.language_code, "generated" if t.is_generated else "manual") for t in transcripts}
+        candidates = [
+            (lang, finder) for lang in preferred for finder in ("manual", "generated") if (lang, finder) in available
+        ]
+
+        for lang, finder in candidates:
+            try:
+                if finder == "manual":
+                    chosen = transcripts.find_manually_created_transcript([lang])
+                else:
+                    chosen = transcripts.find_generated_transcript([lang])
+                items = _fetch_with_retries(chosen, retries=FETCH_RETRIES)
+                if items:
+                    break
+            except Exception as e:
+                last_exc = e
+                items = None
 
         if not items:
             try:
@@ -2585,23 +3318,13 @@ def transcript(req: TranscriptRequest) -> dict[str, Any]:
         if not text:
             return {"status": "no_transcript", "reason": "empty_transcript"}
 
-        truncated = False
-        if req.max_chars and len(text) > req.max_chars:
-            text = text[: req.max_chars].rstrip() + "\n\n[...truncated...]\n"
-            truncated = True
-
-        sha256 = hashlib.sha256(text.encode("utf-8")).hexdigest()
-        return {
-            "status": "success",
+        entry = {
             "text": text,
-            "meta": {
-                "language": getattr(chosen, "language_code", None),  # type: ignore[name-defined]
-                "is_generated": getattr(chosen, "is_generated", None),  # type: ignore[name-defined]
-                "sha256": sha256,
-                "truncated": truncated,
-                "max_chars": req.max_chars,
-            },
+            "language": getattr(chosen, "language_code", None),  # type: ignore[name-defined]
+            "is_generated": getattr(chosen, "is_generated", None),  # type: ignore[name-defined]
         }
+        _transcript_cache_put(req.video_id, preferred, req.include_timestamps, entry)
+        return _transcript_success(entry, max_chars=req.max_chars, source="youtube")
     except (NoTranscriptFound, TranscriptsDisabled):
         return {"status": "no_transcript", "reason": "no_transcript_found"}
     except VideoUnavailable:
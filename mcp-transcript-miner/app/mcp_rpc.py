@@ -25,6 +25,43 @@ def _simple_schema(*, props: dict[str, Any], required: list[str] | None = None)
     return schema
 
 
+class InvalidParamsError(ValueError):
+    """Malformed tool arguments; answered with JSON-RPC `-32602`."""
+
+
+def parse_async_flag(args: dict[str, Any]) -> bool:
+    """Pop the `async` tool argument: a JSON bool, or "true"/"false"/"1"/"0" from clients that send strings."""
+    value = args.pop("async", None)
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    flag = str(value).strip().lower() if isinstance(value, str) else None
+    if flag in ("true", "1"):
+        return True
+    if flag in ("false", "0"):
+        return False
+    raise InvalidParamsError(f"`async` must be a boolean, got {value!r}")
+
+
+def parse_tool_limits(raw: str) -> dict[str, int]:
+    """Per-tool concurrency limits from `name=n,name=n` (invalid entries are ignored, limits are at least 1)."""
+    limits: dict[str, int] = {}
+    for part in (raw or "").split(","):
+        name, sep, value = part.partition("=")
+        if not sep or not name.strip():
+            continue
+        try:
+            limits[name.strip()] = max(1, int(value.strip()))
+        except ValueError:
+            continue
+    return limits
+
+
+_ASYNC_PROP = {
+    "type": "boolean",
+    "description": "Run as background job; returns job_id immediately (poll via jobs.status). Default: false",
+}
+
+
 def make_tools(*, models: dict[str, type[BaseModel]]) -> list[ToolDef]:
     return [
         ToolDef(
@@ -69,7 +106,7 @@ def make_tools(*, models: dict[str, type[BaseModel]]) -> list[ToolDef]:
         ),
         ToolDef(
             name="runs.start",
-            description="Start a TranscriptMiner run (async) for a config_id. Use configs.list first to pick the correct config_id. Prefer the `summary` field for user-facing replies; avoid `log_path` unless explicitly asked.",
+            description="Queue a TranscriptMiner run (async) for a config_id; returns `queue_position` if it has to wait. Use configs.list first to pick the correct config_id. Prefer the `summary` field for user-facing replies; avoid `log_path` unless explicitly asked.",
             input_schema=_simple_schema(
                 props={
                     "config_id": {"type": "string"},
@@ -84,14 +121,24 @@ def make_tools(*, models: dict[str, type[BaseModel]]) -> list[ToolDef]:
         ),
         ToolDef(
             name="runs.status",
-            description="Get run status + log tail by run_id. Prefer the `summary` field for user-facing replies; avoid `log_tail` unless explicitly asked.",
+            description="Get run status + log tail by run_id (queued runs include `queue_position`). Prefer the `summary` field for user-facing replies; avoid `log_tail` unless explicitly asked.",
+            input_schema=_simple_schema(props={"run_id": {"type": "string"}}, required=["run_id"]),
+        ),
+        ToolDef(
+            name="runs.cancel",
+            description="Cancel a queued or running TranscriptMiner run by run_id",
             input_schema=_simple_schema(props={"run_id": {"type": "string"}}, required=["run_id"]),
         ),
         ToolDef(
             name="sync.topic",
             description="Index summaries for a topic into Open WebUI Knowledge",
             input_schema=_simple_schema(
-                props={"topic": {"type": "string"}, "max_videos": {"type": "integer"}, "dry_run": {"type": "boolean"}},
+                props={
+                    "topic": {"type": "string"},
+                    "max_videos": {"type": "integer"},
+                    "dry_run": {"type": "boolean"},
+                    "async": _ASYNC_PROP,
+                },
                 required=["topic"],
             ),
         ),
@@ -109,6 +156,7 @@ def make_tools(*, models: dict[str, type[BaseModel]]) -> list[ToolDef]:
                     "fetched_at": {"type": "string"},
                     "language": {"type": "string"},
                     "knowledge_id": {"type": "string"},
+                    "async": _ASYNC_PROP,
                 },
                 required=["source_id", "text"],
             ),
@@ -122,10 +170,16 @@ def make_tools(*, models: dict[str, type[BaseModel]]) -> list[ToolDef]:
                     "preferred_languages": {"type": "array", "items": {"type": "string"}},
                     "include_timestamps": {"type": "boolean"},
                     "max_chars": {"type": "integer"},
+                    "async": _ASYNC_PROP,
                 },
                 required=["video_id"],
             ),
         ),
+        ToolDef(
+            name="jobs.status",
+            description="Get state/result of a background tool job started with `async: true`",
+            input_schema=_simple_schema(props={"job_id": {"type": "string"}}, required=["job_id"]),
+        ),
     ]
 
 
@@ -177,5 +231,7 @@ def handle_mcp_request(
             return ok({"content": [{"type": "text", "text": text}]})
 
         return err(-32601, f"unknown method: {method}")
+    except InvalidParamsError as e:
+        return err(-32602, "invalid params", {"message": str(e)})
     except Exception as e:
         return err(-32000, "tool execution error", {"message": str(e)})
@@ -15,6 +15,15 @@ import urllib.request
 from dataclasses import dataclass
 from pathlib import Path
 
+REPO_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_DIR / "fourier-cycles" / "src"))
+
+from market_data_store import MarketDataStore  # noqa: E402
+
+DEFAULT_CACHE_DB = REPO_DIR / "fourier-cycles" / "output" / "_market_data" / "market_data.sqlite3"
+# FRED has no range parameter like Yahoo; an unbounded request means "full history".
+FRED_HISTORY_START = dt.date(1900, 1, 1)
+
 
 @dataclass(frozen=True)
 class TimePoint:
@@ -50,16 +59,23 @@ def fetch_yahoo_series(
     range_value: str,
     interval: str,
     timeout_seconds: int,
+    start_date: dt.date | None = None,
+    end_date: dt.date | None = None,
+    allow_empty: bool = False,
 ) -> tuple[list[TimePoint], str]:
+    """Fetch `range_value` (e.g. 5y), or the explicit `start_date..end_date` window when given."""
     symbol_encoded = urllib.parse.quote(symbol)
-    query = urllib.parse.urlencode(
-        {
-            "range": range_value,
-            "interval": interval,
-            "includePrePost": "false",
-            "events": "div,splits",
-        }
-    )
+    params = {
+        "interval": interval,
+        "includePrePost": "false",
+        "events": "div,splits",
+    }
+    if start_date is not None and end_date is not None:
+        params["period1"] = str(_utc_timestamp(start_date))
+        params["period2"] = str(_utc_timestamp(end_date + dt.timedelta(days=1)))
+    else:
+        params["range"] = range_value
+    query = urllib.parse.urlencode(params)
     url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol_encoded}?{query}"
     payload = _http_get(url, timeout_seconds=timeout_seconds)
     data = json.loads(payload)
@@ -74,6 +90,8 @@ def fetch_yahoo_series(
     quote = (((series.get("indicators") or {}).get("quote")) or [{}])[0]
     closes = quote.get("close") or []
     if not timestamps or not closes:
+        if allow_empty:
+            return [], url
         raise RuntimeError("Yahoo response has no timestamp/close data")
 
     points: list[TimePoint] = []
@@ -91,12 +109,25 @@ def fetch_yahoo_series(
         points.append(TimePoint(date=date_value, value=close_value))
 
     if not points:
+        if allow_empty:
+            return [], url
         raise RuntimeError("Yahoo parsing produced no valid datapoints")
     return points, url
 
 
-def fetch_fred_series(series_id: str, timeout_seconds: int) -> tuple[list[TimePoint], str]:
-    query = urllib.parse.urlencode({"id": series_id})
+def fetch_fred_series(
+    series_id: str,
+    timeout_seconds: int,
+    start_date: dt.date | None = None,
+    end_date: dt.date | None = None,
+    allow_empty: bool = False,
+) -> tuple[list[TimePoint], str]:
+    params = {"id": series_id}
+    if start_date is not None:
+        params["cosd"] = start_date.isoformat()
+    if end_date is not None:
+        params["coed"] = end_date.isoformat()
+    query = urllib.parse.urlencode(params)
     url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?{query}"
     payload = _http_get(url, timeout_seconds=timeout_seconds)
     reader = csv.DictReader(payload.splitlines())
@@ -121,10 +152,97 @@ def fetch_fred_series(series_id: str, timeout_seconds: int) -> tuple[list[TimePo
         points.append(TimePoint(date=date_value, value=numeric_value))
 
     if not points:
+        if allow_empty:
+            return [], url
         raise RuntimeError("FRED parsing produced no valid datapoints")
     return points, url
 
 
+def _utc_timestamp(value: dt.date) -> int:
+    return int(dt.datetime(value.year, value.month, value.day, tzinfo=dt.timezone.utc).timestamp())
+
+
+def yahoo_range_start(range_value: str, end_date: dt.date) -> dt.date:
+    """Translate a Yahoo chart range (1mo, 6mo, 5y, ytd, max) into an explicit start date."""
+    value = range_value.strip().lower()
+    if value == "max":
+        return dt.date(1970, 1, 1)
+    if value == "ytd":
+        return dt.date(end_date.year, 1, 1)
+    units = (("mo", 31), ("y", 366), ("wk", 7), ("d", 1))
+    for suffix, days in units:
+        if value.endswith(suffix) and value[: -len(suffix)].isdigit():
+            return end_date - dt.timedelta(days=int(value[: -len(suffix)]) * days)
+    raise ValueError(f"unsupported --yahoo-range '{range_value}'")
+
+
+def fetch_points(args: argparse.Namespace) -> tuple[list[TimePoint], str, str]:
+    """Return (points, fetch_url, series_name), served from the shared market-data store when enabled.
+
+    The store holds daily observations only, so Yahoo intervals other than 1d always fetch directly.
+    """
+    if args.source == "yahoo":
+        series_name = args.symbol
+        cacheable = args.yahoo_interval == "1d"
+    else:
+        series_name = args.series_id
+        cacheable = True
+    if args.no_cache or not cacheable:
+        if args.offline:
+            raise RuntimeError("--offline needs the market-data store (daily data, without --no-cache)")
+        if args.source == "yahoo":
+            points, fetch_url = fetch_yahoo_series(
+                symbol=args.symbol,
+                range_value=args.yahoo_range,
+                interval=args.yahoo_interval,
+                timeout_seconds=args.timeout_seconds,
+            )
+        else:
+            points, fetch_url = fetch_fred_series(series_id=args.series_id, timeout_seconds=args.timeout_seconds)
+        return points, fetch_url, series_name
+
+    end_date = args.end_date or dt.datetime.now(dt.timezone.utc).date()
+    if args.start_date is not None:
+        start_date = args.start_date
+    elif args.source == "yahoo":
+        start_date = yahoo_range_start(args.yahoo_range, end_date)
+    else:
+        start_date = FRED_HISTORY_START
+    fetch_urls: list[str] = []
+
+    def fetch_range(range_start: dt.date, range_end: dt.date) -> list[tuple[dt.date, float]]:
+        if args.source == "yahoo":
+            points, fetch_url = fetch_yahoo_series(
+                symbol=args.symbol,
+                range_value=args.yahoo_range,
+                interval=args.yahoo_interval,
+                timeout_seconds=args.timeout_seconds,
+                start_date=range_start,
+                end_date=range_end,
+                allow_empty=True,
+            )
+        else:
+            points, fetch_url = fetch_fred_series(
+                series_id=args.series_id,
+                timeout_seconds=args.timeout_seconds,
+                start_date=range_start,
+                end_date=range_end,
+                allow_empty=True,
+            )
+        fetch_urls.append(fetch_url)
+        # one value per day, the last one wins (same as the pipeline)
+        return list({point.date: point.value for point in points}.items())
+
+    store = MarketDataStore(Path(args.cache_db))
+    stored, warnings = store.sync(
+        args.source, series_name, start_date, end_date, fetch_range, offline=args.offline, full_refresh=args.refresh_all
+    )
+    for warning in warnings:
+        print(f"WARN: {warning}", file=sys.stderr)
+    points = [TimePoint(date=date_value, value=value) for date_value, value in stored]
+    return points, fetch_urls[-1] if fetch_urls else f"cache://{args.source}/{series_name}", series_name
+
+
 def parse_iso_date(value: str | None) -> dt.date | None:
     if not value:
         return None
@@ -346,25 +464,23 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--no-demean", action="store_true")
     parser.add_argument("--timeout-seconds", type=int, default=20)
     parser.add_argument("--output-dir", default="output/finance-fourier")
+    parser.add_argument(
+        "--cache-db",
+        default=str(DEFAULT_CACHE_DB),
+        help="Market-data SQLite store shared with fourier-cycles (only missing ranges are fetched)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always fetch the full series, bypass the store")
+    parser.add_argument("--offline", action="store_true", help="Never fetch, use stored observations only")
+    parser.add_argument(
+        "--refresh-all", action="store_true", help="Re-fetch the full range and replace the stored history"
+    )
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
 
-    if args.source == "yahoo":
-        points, fetch_url = fetch_yahoo_series(
-            symbol=args.symbol,
-            range_value=args.yahoo_range,
-            interval=args.yahoo_interval,
-            timeout_seconds=args.timeout_seconds,
-        )
-        series_name = args.symbol
-    else:
-        points, fetch_url = fetch_fred_series(
-            series_id=args.series_id, timeout_seconds=args.timeout_seconds
-        )
-        series_name = args.series_id
+    points, fetch_url, series_name = fetch_points(args)
 
     points = sorted(points, key=lambda p: p.date)
     points = filter_points_by_date(points, start_date=args.start_date, end_date=args.end_date)